@@ -21,6 +21,11 @@ setup(
     url='http://github.com/mrkalePythonApp/oac',
     license='MIT',
     install_requires=['click', 'pyyaml', 'tabulate'],
+    extras_require={
+        'msgpack': ['msgpack'],
+        'cbor': ['cbor2'],
+        'zstd': ['zstandard'],
+    },
     packages=find_namespace_packages(),
     include_package_data=True,
     entry_points={
@@ -31,6 +36,18 @@ setup(
             'oac_paths = src.oac:oac_paths',
             'oac_prune = src.oac:oac_prune',
             'oac_convert = src.oac:oac_convert',
+            'oac_refstats = src.oac:oac_refstats',
+            'oac_security = src.oac:oac_security',
+            'oac_split = src.oac:oac_split',
+            'oac_merge = src.oac:oac_merge',
+            'oac_diff = src.oac:oac_diff',
+            'oac_breaking = src.oac:oac_breaking',
+            'oac_validate = src.oac:oac_validate',
+            'oac_refs = src.oac:oac_refs',
+            'oac_extract = src.oac:oac_extract',
+            'oac_run = src.oac:oac_run',
+            'oac_index = src.oac:oac_index',
+            'oac_query = src.oac:oac_query',
         ],
     },
     zip_safe=False
@@ -0,0 +1,407 @@
+# -*- coding: utf-8 -*-
+"""Module for detecting breaking changes between OpenAPI files."""
+__version__ = '0.1.1'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from typing import Any, Dict, List, Set, Tuple
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+import src.utils.reference as ref
+from src.utils.compare import compare
+from src.utils.digest import digest
+from src.utils.graph import collect_refs
+from src.utils.parallel import map_jobs
+from src.utils.output import print_table as table, output_preamble as preamble
+from src.utils.output import dump_json
+
+# Directions of data flow of schemas between a client and a server
+REQUEST = 'request'
+RESPONSE = 'response'
+
+
+def breaking(pairs: List[Tuple[str, str]], color: bool = False,
+             jsonout: bool = False, jobs: int = 1) -> int:
+    """Print an output table with breaking changes of pairs of OpenAPI files.
+
+    Arguments
+    ---------
+    pairs
+        List of tuples with paths of old and new OpenAPI files.
+    color
+        Flag about suppressing colorization of an output.
+    jsonout
+        Flag about printing breaking changes in JSON format instead of
+        a table.
+    jobs
+        Number of worker processes for checking pairs of files.
+
+    Returns
+    -------
+    Number of detected breaking changes.
+
+    Notes
+    -----
+    - Each pair of files is bundled and compared structurally at first and
+      only changed operations, path items, and components are classified.
+    - Pairs of files are checked independently in worker processes.
+    - The column with new files is output only for several pairs of files.
+
+    """
+    results = map_jobs(check_pair, pairs, jobs)
+    rows = [[new_file] + rec
+            for (_, new_file), recs in zip(pairs, results) for rec in recs]
+    # Output
+    if jsonout:
+        keys = ['file', 'kind', 'name', 'reason']
+        dump_json([dict(zip(keys, rec)) for rec in rows])
+        return len(rows)
+    headers = ['No', 'New file', 'Kind', 'Name', 'Breaking change']
+    if len(pairs) == 1:
+        rows = [rec[1:] for rec in rows]
+        headers.pop(1)
+    preamble('Breaking changes of OpenAPI files',
+             ', '.join(f'{old} -> {new}' for old, new in pairs), color)
+    if rows:
+        click.echo()
+        data = [[idx + 1] + rec for idx, rec in enumerate(rows)]
+        table(data, headers)
+    else:
+        msg = cfg.Parameter.NONE.value
+        log = msg if color else click.style(msg, fg='green')
+        click.echo(log)
+    return len(rows)
+
+
+def check_pair(pair: Tuple[str, str]) -> List[List[str]]:
+    """Detect breaking changes between old and new OpenAPI file.
+
+    Arguments
+    ---------
+    pair
+        Tuple with paths of old and new OpenAPI files.
+
+    Returns
+    -------
+    List of breaking changes with kind and name of a changed object and
+    the reason.
+
+    Notes
+    -----
+    - Breaking changes are:
+      - removed operations and components,
+      - new required parameters, required request bodies, and required
+        properties of request schemas,
+      - removed responses, media types, and properties of response schemas,
+      - changed types and references of schemas, narrowed enumerations of
+        request schemas, and widened enumerations of response schemas.
+    - Changed schema components are checked for directions, in which
+      operations use them directly or through other components. Schemas
+      not used by any operation are not checked.
+
+    """
+    _, old = ref.bundle_file(pair[0])
+    _, new = ref.bundle_file(pair[1])
+    usage = schema_directions(old)
+    for node, directions in schema_directions(new).items():
+        usage.setdefault(node, set()).update(directions)
+    rows = []
+    for change in compare(old, new):
+        if change.change == 'added':
+            continue
+        if change.change == 'removed':
+            reasons = [f'{change.kind.capitalize()} removed']
+        elif change.kind == 'operation':
+            reasons = check_operation(change.old, change.new, old, new)
+        elif change.kind == 'path':
+            reasons = check_parameters(change.old.get('parameters'),
+                                       change.new.get('parameters'),
+                                       old, new)
+        elif change.kind == 'schemas':
+            node = ref.concat(['components', change.kind, change.name])
+            reasons = list(dict.fromkeys(
+                reason for direction in sorted(usage.get(node, ()))
+                for reason in check_schema(change.old, change.new,
+                                           direction)))
+        elif change.kind == 'parameters':
+            reasons = check_parameters([change.old], [change.new], old, new)
+        else:
+            reasons = []
+        rows.extend([change.kind, change.name, reason] for reason in reasons)
+    return rows
+
+
+def resolve(value: Any, content: Dict) -> Any:
+    """Resolve internal reference of a value in the content.
+
+    Arguments
+    ---------
+    value
+        OpenAPI object, which might be a reference object.
+    content
+        OpenAPI content with the reference target.
+
+    Returns
+    -------
+    Target object of the reference or the value itself. Unresolvable
+    reference is returned as it is.
+
+    """
+    if not isinstance(value, dict) or not isinstance(value.get('$ref'), str):
+        return value
+    ref_file, fragments = ref.parse(value['$ref'])
+    if ref_file:
+        return value
+    target = content
+    for fragment in fragments:
+        if not isinstance(target, dict):
+            return value
+        target = target.get(ref.json_pointer(fragment))
+    return value if target is None else target
+
+
+def schema_directions(content: Dict) -> Dict[str, Set[str]]:
+    """Determine directions of data flow, in which components are used.
+
+    Arguments
+    ---------
+    content
+        Bundled OpenAPI content.
+
+    Returns
+    -------
+    Sets of directions indexed by component nodes.
+
+    Notes
+    -----
+    - Parameters and request bodies of operations are requests, while their
+      responses are responses. Components referenced from components used
+      in a direction are used in the same direction.
+
+    """
+    roots = {REQUEST: [], RESPONSE: []}
+    for path_item in (content.get('paths') or {}).values():
+        if not isinstance(path_item, dict):
+            continue
+        roots[REQUEST].append(path_item.get('parameters'))
+        for method_key, operation in path_item.items():
+            if method_key.upper() not in cfg.Parameter.HTTP_METHODS.value \
+                    or not isinstance(operation, dict):
+                continue
+            roots[REQUEST].append(operation.get('parameters'))
+            roots[REQUEST].append(operation.get('requestBody'))
+            roots[RESPONSE].append(operation.get('responses'))
+    usage = {}
+    for direction, values in roots.items():
+        pending = list(collect_refs(values))
+        used = set()
+        while pending:
+            node = pending.pop()
+            if node in used:
+                continue
+            used.add(node)
+            usage.setdefault(node, set()).add(direction)
+            pending.extend(collect_refs(resolve({'$ref': node}, content)))
+    return usage
+
+
+def check_operation(old_op: Dict, new_op: Dict,
+                    old: Dict, new: Dict) -> List[str]:
+    """Detect breaking changes of an operation.
+
+    Arguments
+    ---------
+    old_op
+        Old operation object.
+    new_op
+        New operation object.
+    old
+        Old OpenAPI content for resolving references.
+    new
+        New OpenAPI content for resolving references.
+
+    Returns
+    -------
+    List of reasons of breaking changes.
+
+    """
+    if not isinstance(old_op, dict) or not isinstance(new_op, dict):
+        return ['Operation replaced']
+    reasons = check_parameters(old_op.get('parameters'),
+                               new_op.get('parameters'), old, new)
+    old_body = resolve(old_op.get('requestBody'), old) or {}
+    new_body = resolve(new_op.get('requestBody'), new) or {}
+    if new_body.get('required') and not old_body.get('required'):
+        reasons.append('Request body required')
+    reasons += check_content(old_body.get('content'),
+                             new_body.get('content'), 'Request', REQUEST)
+    old_responses = old_op.get('responses') or {}
+    new_responses = new_op.get('responses') or {}
+    for code, old_response in old_responses.items():
+        if code not in new_responses:
+            reasons.append(f'Response {code} removed')
+            continue
+        old_response = resolve(old_response, old) or {}
+        new_response = resolve(new_responses[code], new) or {}
+        reasons += check_content(old_response.get('content'),
+                                 new_response.get('content'),
+                                 f'Response {code}', RESPONSE)
+    return reasons
+
+
+def check_parameters(old_params: List, new_params: List,
+                     old: Dict, new: Dict) -> List[str]:
+    """Detect new required parameters and changed types of parameters.
+
+    Arguments
+    ---------
+    old_params
+        List of old parameter objects or None.
+    new_params
+        List of new parameter objects or None.
+    old
+        Old OpenAPI content for resolving references.
+    new
+        New OpenAPI content for resolving references.
+
+    Returns
+    -------
+    List of reasons of breaking changes.
+
+    """
+    def index(params: List, content: Dict) -> Dict[Tuple[str, str], Dict]:
+        params = [resolve(param, content) for param in params or []]
+        return {(param.get('in'), param.get('name')): param
+                for param in params if isinstance(param, dict)}
+
+    old_index = index(old_params, old)
+    new_index = index(new_params, new)
+    reasons = []
+    for (place, name), param in new_index.items():
+        old_param = old_index.get((place, name))
+        if param.get('required') \
+            and not (old_param and old_param.get('required')):
+            reasons.append(f'Required {place} parameter "{name}" added')
+        if old_param:
+            reasons += [f'Parameter "{name}": {reason}' for reason in
+                        check_schema(old_param.get('schema'),
+                                     param.get('schema'), REQUEST)]
+    return reasons
+
+
+def check_content(old_content: Dict, new_content: Dict,
+                  label: str, direction: str) -> List[str]:
+    """Detect removed media types and breaking changes of their schemas.
+
+    Arguments
+    ---------
+    old_content
+        Old content object with media types or None.
+    new_content
+        New content object with media types or None.
+    label
+        Label of the content owner for reasons.
+    direction
+        Direction of data flow of the content, i.e., request or response.
+
+    Returns
+    -------
+    List of reasons of breaking changes.
+
+    """
+    reasons = []
+    new_content = new_content if isinstance(new_content, dict) else {}
+    for media, old_media in (old_content or {}).items():
+        new_media = new_content.get(media)
+        if not isinstance(new_media, dict):
+            reasons.append(f'{label} media type {media} removed')
+            continue
+        if not isinstance(old_media, dict):
+            continue
+        reasons += [f'{label} {media}: {reason}' for reason in
+                    check_schema(old_media.get('schema'),
+                                 new_media.get('schema'), direction)]
+    return reasons
+
+
+def check_schema(old: Any, new: Any, direction: str, location: str = '',
+                 memo: Dict[int, str] = None) -> List[str]:
+    """Detect breaking changes of a schema.
+
+    Arguments
+    ---------
+    old
+        Old schema object.
+    new
+        New schema object.
+    direction
+        Direction of data flow of the schema, i.e., request or response.
+    location
+        Location of the schema in properties and items of the root schema.
+    memo
+        Dictionary of structural hashes of already compared subschemas.
+
+    Returns
+    -------
+    List of reasons of breaking changes.
+
+    Notes
+    -----
+    - Referenced schemas are not followed, since they are compared as
+      components, only changed references are reported.
+    - Unchanged subschemas are skipped by their structural hashes.
+    - Clients sending requests break on new required properties and
+      narrowed enumerations, while clients reading responses break on
+      removed properties and widened enumerations.
+
+    """
+    if memo is None:
+        memo = {}
+    if not isinstance(old, dict) or not isinstance(new, dict) \
+        or digest(old, memo) == digest(new, memo):
+        return []
+    prefix = f'{location}: ' if location else ''
+    if old.get('$ref') != new.get('$ref'):
+        return [f'{prefix}Reference changed']
+    reasons = []
+    if old.get('type') != new.get('type'):
+        reasons.append(f'{prefix}Type changed from {old.get("type")}'
+                       f' to {new.get("type")}')
+    if direction == REQUEST and isinstance(new.get('enum'), list):
+        removed = [value for value in old.get('enum') or []
+                   if value not in new['enum']]
+        if removed or not isinstance(old.get('enum'), list):
+            reasons.append(f'{prefix}Enumeration narrowed')
+    if direction == RESPONSE and isinstance(old.get('enum'), list):
+        added = [value for value in new.get('enum') or []
+                 if value not in old['enum']]
+        if added or not isinstance(new.get('enum'), list):
+            reasons.append(f'{prefix}Enumeration widened')
+    if direction == REQUEST:
+        added = set(new.get('required') or []) \
+            - set(old.get('required') or [])
+        reasons += [f'{prefix}Required property "{name}" added'
+                    for name in sorted(added)]
+    old_props = old.get('properties') or {}
+    new_props = new.get('properties') or {}
+    for name, old_prop in old_props.items():
+        if name not in new_props:
+            if direction == RESPONSE:
+                reasons.append(f'{prefix}Property "{name}" removed')
+            continue
+        reasons += check_schema(old_prop, new_props[name], direction,
+                                f'{location}.{name}' if location else name,
+                                memo)
+    reasons += check_schema(old.get('items'), new.get('items'), direction,
+                            f'{location}[]', memo)
+    return reasons
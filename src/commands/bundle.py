@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for bundling OpenAPI files."""
-__version__ = '0.3.0'
+__version__ = '0.8.1'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -10,18 +10,29 @@ __maintainer__ = __author__
 __email__ = 'libor.gabaj@gmail.com'
 
 # Standard library modules
-from typing import NoReturn
+import os
+import re
+from typing import Dict, NoReturn, Set, Tuple
 
 # Third party modules
+import click
 
 # Internal modules
 import src.config as cfg
-from src.utils.reference import dereference
+from src.utils.reference import dereference_paths, count_nodes
 import src.utils.cleanup as clean
-from src.utils.output import output_content as out
+from src.utils.output import output_content as out, output_unresolved
+from src.utils.output import write_content
+from src.utils.output import print_table as table, output_preamble as preamble
+from src.commands.extract import extract_content
+from src.utils.parallel import map_jobs
 
 
-def bundle(record: cfg.OpenAPI, outformat: cfg.Format = None) -> NoReturn:
+def bundle(record: cfg.OpenAPI, outformat: cfg.Format = None,
+           budget: int = None, warn: bool = False,
+           dedupe: bool = False, jobs: int = 1,
+           compression: cfg.Compression = None,
+           minify: bool = False, aliases: bool = False) -> NoReturn:
     """Dereference and print content of the provided OpenAPI file record.
 
     Arguments
@@ -32,12 +43,242 @@ def bundle(record: cfg.OpenAPI, outformat: cfg.Format = None) -> NoReturn:
     outformat
         Enumeration member of an requested OpenAPI content format for output
         to the system console.
+    budget
+        Maximal number of nodes of the serialized content. Zero or None
+        means no limit.
+    warn
+        Flag about just warning instead of refusing the output, if the budget
+        is exceeded.
+    dedupe
+        Flag about merging structurally identical components.
+    jobs
+        Number of worker processes for dereferencing path items.
+    compression
+        Enumeration member of a compression of the output or None.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+    aliases
+        Flag about writing repeated subtrees of YAML output just once with
+        anchors and aliases.
+
+    Raises
+    ------
+    click.ClickException
+        Serialized content would exceed the budget of nodes.
+
+    Notes
+    -----
+    - Unresolvable references are kept in the content and listed as
+      a warning to the error output.
+    - Deep dereference shares subtrees of repeatedly referenced targets
+      in memory, but the serialization expands them, so that the number of
+      nodes is checked before serialization. Subtrees written with aliases
+      are not expanded, so that just unique nodes are checked then.
+
+    """
+    outformat = outformat or record.oastype
+    aliases = aliases and outformat is cfg.Format.YAML
+    content = bundle_content(record, budget, warn, dedupe, jobs, aliases)
+    # Output
+    output_unresolved(cfg.CACHE.unresolved)
+    out(content, outformat, compression, minify, aliases)
+
+
+def bundle_content(record: cfg.OpenAPI, budget: int = None,
+                   warn: bool = False, dedupe: bool = False,
+                   jobs: int = 1, aliases: bool = False) -> Dict:
+    """Dereference and cleanup content of the provided OpenAPI file record.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which content should be bundled.
+        It has to be the first record in the cache with activated import
+        of referenced content.
+    budget
+        Maximal number of nodes of the serialized content. Zero or None
+        means no limit.
+    warn
+        Flag about just warning instead of refusing the output, if the budget
+        is exceeded.
+    dedupe
+        Flag about merging structurally identical components.
+    jobs
+        Number of worker processes for dereferencing path items.
+    aliases
+        Flag about serializing shared subtrees just once, so that just
+        unique nodes count to the budget.
+
+    Returns
+    -------
+    Bundled OpenAPI content.
+
+    Raises
+    ------
+    click.ClickException
+        Serialized content would exceed the budget of nodes.
 
     """
     # Cleanup
-    content = dereference(record.oas, record.oasfile)
+    content = dereference_paths(record.oas, record.oasfile, jobs)
+    if dedupe:
+        content, _ = clean.dedupe_components(content)
     content, _, _ = clean.remove_unused_components(content)
     content = clean.remove_empty_objects(content)
     content = clean.reorder_components(content)
+    # Check size
+    if budget:
+        expanded, unique = count_nodes(content)
+        if (unique if aliases else expanded) > budget:
+            errmsg = \
+                f'Serialized content with {expanded} nodes ({unique} unique)' \
+                f' exceeds the budget of {budget} nodes!'
+            if not warn:
+                raise click.ClickException(errmsg)
+            click.echo(click.style(errmsg, fg='yellow'), err=True)
+    return content
+
+
+def bundle_shards(record: cfg.OpenAPI, output_dir: str, shard: cfg.Shard,
+                  outformat: cfg.Format = None, budget: int = None,
+                  warn: bool = False, dedupe: bool = False, jobs: int = 1,
+                  compression: cfg.Compression = None, minify: bool = False,
+                  aliases: bool = False, color: bool = False) -> NoReturn:
+    """Bundle the provided OpenAPI file record to shards written to files.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which should be bundled. It has to be the first
+        record in the cache with activated import of referenced content.
+    output_dir
+        Folder for shard files. It is created, if it does not exist.
+    shard
+        Enumeration member of a criterion of sharding operations.
+    outformat
+        Enumeration member of an requested OpenAPI content format of files.
+    budget
+        Maximal number of nodes of the serialized entire content. Zero or
+        None means no limit.
+    warn
+        Flag about just warning instead of refusing the output, if the budget
+        is exceeded.
+    dedupe
+        Flag about merging structurally identical components.
+    jobs
+        Number of worker processes for dereferencing path items and for
+        writing shard files.
+    compression
+        Enumeration member of a compression of shard files or None.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+    aliases
+        Flag about writing repeated subtrees of YAML files just once with
+        anchors and aliases.
+    color
+        Flag about suppressing colorization of an output.
+
+    Notes
+    -----
+    - The entire content is bundled just once. Each shard is composed
+      from the bundled content with its operations and only components
+      reachable from them.
+    - Shard files are serialized and written in worker processes, since
+      serialization is bound by the interpreter and would not run
+      concurrently in threads.
+
+    """
+    outformat = outformat or record.oastype
+    aliases = aliases and outformat is cfg.Format.YAML
+    record.oas = bundle_content(record, budget, warn, dedupe, jobs, aliases)
+    suffix = f'.{outformat.value}' \
+        + (f'.{compression.value}' if compression else '')
+    documents = []
+    for name, operations in plan_shards(record.oas, shard).items():
+        content = extract_content(
+            record, lambda path_key, method_key, _, ops=operations:
+            (path_key, method_key) in ops)
+        shard_file = os.path.join(os.path.abspath(output_dir),
+                                  name + suffix)
+        documents.append((content, shard_file, len(operations)))
+    # Write files
+    map_jobs(write_shard,
+             [(content, outformat, shard_file, minify, aliases)
+              for content, shard_file, _ in documents], jobs)
     # Output
-    out(content, outformat or record.oastype)
+    output_unresolved(cfg.CACHE.unresolved)
+    preamble('Bundle OpenAPI file to shards in folder', output_dir, color)
+    click.echo()
+    table([[idx + 1, os.path.basename(shard_file), count]
+           for idx, (_, shard_file, count) in enumerate(documents)],
+          ['No', 'Shard', 'Operations'])
+
+
+def write_shard(shard: Tuple[Dict, cfg.Format, str, bool, bool]) \
+        -> NoReturn:
+    """Write content of a shard to its file.
+
+    Arguments
+    ---------
+    shard
+        Tuple with content, enumeration member of an output format, path of
+        the shard file, flag about minified JSON, and flag about YAML aliases.
+
+    Notes
+    -----
+    - The function is module level one, so that it can be applied in worker
+      processes.
+
+    """
+    write_content(*shard)
+
+
+def plan_shards(content: Dict, shard: cfg.Shard) \
+        -> Dict[str, Set[Tuple[str, str]]]:
+    """Assign operations to shards.
+
+    Arguments
+    ---------
+    content
+        Bundled OpenAPI content.
+    shard
+        Enumeration member of a criterion of sharding operations.
+
+    Returns
+    -------
+    Operations identified by path and HTTP method indexed by names of shards
+    usable as file names.
+
+    Notes
+    -----
+    - An operation with several tags is assigned to the shard of each tag,
+      operations without tags to the shard 'untagged'.
+    - Path prefix is the first segment of a path, the path '/' is assigned
+      to the shard 'root'.
+    - Characters unsafe for file names are replaced by underscore. Names
+      colliding afterwards are distinguished by numeric suffix.
+
+    """
+    shards = {}
+    for path_key, path_item in (content.get('paths') or {}).items():
+        if not isinstance(path_item, dict):
+            continue
+        for method_key, operation in path_item.items():
+            if method_key.upper() not in cfg.Parameter.HTTP_METHODS.value \
+                    or not isinstance(operation, dict):
+                continue
+            if shard is cfg.Shard.TAG:
+                keys = operation.get('tags') or ['untagged']
+            else:
+                keys = [path_key.strip('/').split('/')[0] or 'root']
+            for key in keys:
+                shards.setdefault(str(key), set()).add((path_key, method_key))
+    names = {}
+    for key, operations in shards.items():
+        name = re.sub(r'[^\w.-]', '_', key).strip('.') or '_'
+        base, count = name, 1
+        while name.lower() in names:
+            count += 1
+            name = f'{base}_{count}'
+        names[name.lower()] = (name, operations)
+    return dict(names.values())
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for converting format of an OpenAPI file."""
-__version__ = '0.2.0'
+__version__ = '0.5.0'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -10,16 +10,25 @@ __maintainer__ = __author__
 __email__ = 'libor.gabaj@gmail.com'
 
 # Standard library modules
-from typing import NoReturn
+import io
+import lzma
+from typing import Any, Iterator, NoReturn
 
 # Third party modules
+import click
 
 # Internal modules
 import src.config as cfg
+import src.utils.compression as compress
+import src.utils.filesystem as fs
+import src.utils.streaming as streaming
+from src.utils.streaming import Node
 from src.utils.output import output_content as out
 
 
-def convert(record: cfg.OpenAPI, outformat: cfg.Format = None) -> NoReturn:
+def convert(record: cfg.OpenAPI, outformat: cfg.Format = None,
+            compression: cfg.Compression = None,
+            minify: bool = False) -> NoReturn:
     """Print OpenAPI content of the provided OpenAPI file record.
 
     Arguments
@@ -30,10 +39,137 @@ def convert(record: cfg.OpenAPI, outformat: cfg.Format = None) -> NoReturn:
     outformat
         Enumeration member of an requested OpenAPI content format for output
         to the system console.
+    compression
+        Enumeration member of a compression of the output or None.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
 
     """
     content = record.oas
     # Output
-    out(content, outformat \
-        or cfg.Format.JSON if record.oastype == cfg.Format.YAML \
-        else cfg.Format.YAML)
+    out(content, outformat
+        or (cfg.Format.JSON if record.oastype == cfg.Format.YAML
+            else cfg.Format.YAML),
+        compression, minify)
+
+
+def stream(openapi_file: str, outformat: cfg.Format = None,
+           compression: cfg.Compression = None,
+           minify: bool = False) -> NoReturn:
+    """Convert OpenAPI file between YAML and JSON without loading its content.
+
+    Arguments
+    ---------
+    openapi_file
+        Path of an OpenAPI file in YAML or JSON format.
+    outformat
+        Enumeration member of an requested OpenAPI content format for output
+        to the system console.
+    compression
+        Enumeration member of a compression of the output or None.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+
+    Raises
+    ------
+    ValueError
+        Conversion is not between YAML and JSON or content cannot be streamed.
+    EOFError
+        OpenAPI file is empty.
+    SyntaxError
+        OpenAPI file is not the expected OpenAPI Specification, version 3.0.x,
+        or it cannot be decompressed.
+
+    Notes
+    -----
+    - Parser events of the input are translated directly to the output
+      ones, so that the content is neither loaded nor kept in memory
+      and files of any size are converted in constant memory.
+    - The output is the same as at converting the loaded content.
+    - The OpenAPI version is checked when its key is passed, so that
+      the output can be written partially for an invalid file.
+
+    """
+    oastype, incompression = fs.detect_format(openapi_file)
+    outformat = outformat or (cfg.Format.JSON if oastype is cfg.Format.YAML
+                              else cfg.Format.YAML)
+    if {oastype, outformat} != {cfg.Format.YAML, cfg.Format.JSON}:
+        errmsg = 'Streaming conversion is provided just between YAML and JSON!'
+        raise ValueError(errmsg)
+    stdout = click.get_binary_stream('stdout')
+    try:
+        with open(openapi_file, 'rb') as input_file:
+            source = io.TextIOWrapper(
+                compress.open_stream(input_file, incompression),
+                encoding='utf-8')
+            output = compress.open_stream(stdout, compression, 'wb') \
+                if compression else stdout
+            text = io.TextIOWrapper(output, encoding='utf-8', newline='\n')
+            events = checked(streaming.read_events(source, oastype),
+                             openapi_file)
+            streaming.write_events(events, text, outformat, minify)
+            # Console output of YAML is terminated by an empty line
+            if not compression and outformat is cfg.Format.YAML:
+                text.write('\n')
+            text.flush()
+            text.detach()
+            if compression:
+                output.close()
+    except (OSError, lzma.LZMAError) as err:
+        errmsg = f'OpenAPI file "{openapi_file}" cannot be decompressed!'
+        raise SyntaxError(errmsg) from err
+    stdout.flush()
+
+
+def checked(events: Iterator[Any], openapi_file: str) -> Iterator[Any]:
+    """Pass events of an OpenAPI content, while checking its version.
+
+    Arguments
+    ---------
+    events
+        Iterator of structural events and scalar values.
+    openapi_file
+        Path of the OpenAPI file of the content.
+
+    Returns
+    -------
+    Iterator of the same events.
+
+    Raises
+    ------
+    EOFError
+        OpenAPI file is empty.
+    SyntaxError
+        OpenAPI file is not the expected OpenAPI Specification, version 3.0.x.
+
+    """
+    oas_key = cfg.Parameter.OAS_MARK3.value
+    errmsg = f'OpenAPI file "{openapi_file} is not marked as "' \
+        f'OpenAPI 3 Specification!'
+    started = marked = False
+    depth = 0
+    # Key of the root mapping waiting for its value
+    key = None
+    expect_key = True
+    for event in events:
+        if depth == 0 and event is not Node.MAP:
+            raise SyntaxError(errmsg)
+        started = True
+        if depth == 1 and event is not Node.END:
+            if expect_key:
+                key = event
+            elif key == oas_key:
+                if not isinstance(event, str) or not fs.check_openapi3(
+                        cfg.OpenAPI(oas={oas_key: event})):
+                    raise SyntaxError(errmsg)
+                marked = True
+            expect_key = not expect_key
+        if event is Node.MAP or event is Node.SEQ:
+            depth += 1
+        elif event is Node.END:
+            depth -= 1
+        yield event
+    if not started:
+        raise EOFError(f'OpenAPI file "{openapi_file}" is empty!')
+    if not marked:
+        raise SyntaxError(errmsg)
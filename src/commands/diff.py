@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""Module for listing differences of two OpenAPI files."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from typing import NoReturn
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+from src.utils.reference import bundle_file
+from src.utils.compare import compare
+from src.utils.output import print_table as table, output_preamble as preamble
+from src.utils.output import dump_json
+
+
+def diff(old_file: str, new_file: str, color: bool = False,
+         jsonout: bool = False) -> NoReturn:
+    """Print an output table with differences of two OpenAPI files.
+
+    Arguments
+    ---------
+    old_file
+        Path of the old OpenAPI file.
+    new_file
+        Path of the new OpenAPI file.
+    color
+        Flag about suppressing colorization of an output.
+    jsonout
+        Flag about printing differences in JSON format instead of a table.
+
+    Notes
+    -----
+    - Both files are bundled at first, so that differences in referenced
+      files are detected as well.
+    - Added, removed, and changed operations, path items, and components are
+      listed in order of their appearance in files.
+
+    """
+    _, old = bundle_file(old_file)
+    _, new = bundle_file(new_file)
+    changes = [change.list for change in compare(old, new)]
+    # Output
+    if jsonout:
+        keys = ['change', 'kind', 'name']
+        dump_json([dict(zip(keys, rec)) for rec in changes])
+        return
+    preamble('Differences of OpenAPI files',
+             f'{old_file} -> {new_file}', color)
+    if changes:
+        click.echo()
+        data = [[idx + 1] + rec for idx, rec in enumerate(changes)]
+        table(data, cfg.Change.headers)
+    else:
+        msg = cfg.Parameter.NONE.value
+        log = msg if color else click.style(msg, fg='red')
+        click.echo(log)
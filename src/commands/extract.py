@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""Module for extracting a subset of operations from an OpenAPI file."""
+__version__ = '0.2.1'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from typing import Any, Callable, Dict, List, Tuple, NoReturn
+
+# Third party modules
+
+# Internal modules
+import src.config as cfg
+import src.utils.reference as ref
+import src.utils.filesystem as fs
+import src.utils.graph as graph
+import src.utils.cleanup as clean
+from src.utils.output import output_content as out, output_unresolved
+
+
+def extract(record: cfg.OpenAPI, tags: List[str] = None,
+            paths: List[str] = None, operation_ids: List[str] = None,
+            outformat: cfg.Format = None,
+            compression: cfg.Compression = None,
+            minify: bool = False) -> NoReturn:
+    """Print minimal OpenAPI content with selected operations.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, from which operations should be extracted.
+        The record with valid OpenAPI document is assumed.
+    tags
+        List of tags of selected operations.
+    paths
+        List of paths of selected operations.
+    operation_ids
+        List of identifiers of selected operations.
+    outformat
+        Enumeration member of an requested OpenAPI content format for output
+        to the system console.
+    compression
+        Enumeration member of a compression of the output or None.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+
+    Notes
+    -----
+    - An operation is selected, if it matches any of selectors.
+
+    """
+    content = extract_content(record, selector(tags, paths, operation_ids))
+    output_unresolved(cfg.CACHE.unresolved)
+    out(content, outformat or record.oastype, compression, minify)
+
+
+def selector(tags: List[str] = None, paths: List[str] = None,
+             operation_ids: List[str] = None) \
+        -> Callable[[str, str, Dict], bool]:
+    """Create a function selecting operations matching any of selectors.
+
+    Arguments
+    ---------
+    tags
+        List of tags of selected operations.
+    paths
+        List of paths of selected operations.
+    operation_ids
+        List of identifiers of selected operations.
+
+    Returns
+    -------
+    Function deciding about selection of an operation by its path,
+    HTTP method, and the operation object.
+
+    """
+    tags = set(tags or [])
+    paths = set(paths or [])
+    operation_ids = set(operation_ids or [])
+
+    def select(path_key: str, _: str, operation: Dict) -> bool:
+        return path_key in paths \
+            or operation.get('operationId') in operation_ids \
+            or bool(tags.intersection(operation.get('tags') or []))
+
+    return select
+
+
+def extract_content(record: cfg.OpenAPI,
+                    select: Callable[[str, str, Dict], bool]) -> Dict:
+    """Compose minimal OpenAPI content with selected operations.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, from which operations should be extracted.
+        It has to be the first record in the cache with activated import
+        of referenced content.
+    select
+        Function deciding about selection of an operation by its path,
+        HTTP method, and the operation object.
+
+    Returns
+    -------
+    OpenAPI content with root properties, selected operations, and
+    components and security schemes reachable from them.
+
+    Raises
+    ------
+    ValueError
+        No operation has been selected.
+
+    Notes
+    -----
+    - Path items are resolved just shallowly for selection, while only
+      selected operations are dereferenced, so that only their external
+      targets are imported.
+    - Components are collected by a reachability walk from the selected
+      operations, so that the work is proportional to the size of
+      the extracted content rather than to the entire document.
+    - Tags are limited to those of selected operations.
+    - The record content is modified by dereferencing, but repeated
+      extractions from the same record are consistent.
+
+    """
+    path_items = {}
+    for path_key, path_item in (record.oas.get('paths') or {}).items():
+        path_item, source_file = resolve_path_item(path_item, record.oasfile)
+        if not isinstance(path_item, dict):
+            continue
+        methods = [key for key, value in path_item.items()
+                   if key.upper() in cfg.Parameter.HTTP_METHODS.value
+                   and isinstance(value, dict) and select(path_key, key, value)]
+        if not methods:
+            continue
+        path_items[path_key] = {
+            key: ref.dereference(value, source_file)
+            for key, value in path_item.items()
+            if key in methods
+            or key.upper() not in cfg.Parameter.HTTP_METHODS.value}
+    if not path_items:
+        raise ValueError('No operations selected!')
+    # Reachability walk of components
+    components = record.oas.get('components') or {}
+    extracted = {}
+    stack = list(graph.collect_refs(path_items))
+    reached = set()
+    while stack:
+        node = stack.pop()
+        if node in reached:
+            continue
+        reached.add(node)
+        _, (_, comps_prop, name) = ref.parse(node)
+        target = components.get(comps_prop, {}).get(name)
+        if target is None:
+            continue
+        target = ref.dereference(target, record.oasfile)
+        extracted.setdefault(comps_prop, {})[name] = target
+        stack.extend(graph.collect_refs(target))
+    # Security schemes
+    schemes = components.get('securitySchemes') or {}
+    index = ref.index_security({'security': record.oas.get('security'),
+                                'paths': path_items,
+                                'components': extracted})
+    for scheme in sorted(index.schemes):
+        if scheme in schemes:
+            extracted.setdefault('securitySchemes', {})[scheme] = \
+                ref.dereference(schemes[scheme], record.oasfile)
+    # Tags
+    used = {tag for path_item in path_items.values()
+            for key, operation in path_item.items()
+            if key.upper() in cfg.Parameter.HTTP_METHODS.value
+            and isinstance(operation, dict)
+            for tag in operation.get('tags') or []}
+    tags = [tag for tag in record.oas.get('tags') or []
+            if isinstance(tag, dict) and tag.get('name') in used]
+    # Compose content preserving order of root properties
+    parts = {'paths': path_items, 'components': extracted, 'tags': tags}
+    content = {key: parts.get(key, value)
+               for key, value in record.oas.items()}
+    content.setdefault('paths', path_items)
+    content.setdefault('components', extracted)
+    content = clean.remove_empty_objects(content)
+    return clean.reorder_components(content)
+
+
+def resolve_path_item(path_item: Any, source_file: str) -> Tuple[Any, str]:
+    """Resolve reference of a path item shallowly.
+
+    Arguments
+    ---------
+    path_item
+        Path item object, which might be a reference object.
+    source_file
+        OpenAPI file with the path item.
+
+    Returns
+    -------
+    Tuple with the target path item without dereferenced content and
+    the OpenAPI file containing it.
+
+    """
+    while isinstance(path_item, dict) \
+        and isinstance(path_item.get('$ref'), str):
+        target_file, fragments = ref.parse(path_item['$ref'])
+        source_file = fs.resolve_filepath(target_file or source_file,
+                                          source_file)
+        record = cfg.CACHE.get_record_by_file(source_file) \
+            or ref.load_record(source_file)
+        path_item = record.oas
+        for fragment in fragments:
+            path_item = path_item.get(ref.json_pointer(fragment)) \
+                if isinstance(path_item, dict) else None
+    return path_item, source_file
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Module for indexing OpenAPI files to an SQLite database."""
+__version__ = '0.1.1'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import os
+from typing import Dict, List
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+import src.utils.reference as ref
+import src.utils.database as db
+from src.utils.graph import collect_refs
+from src.utils.filesystem import hash_file
+from src.utils.remote import is_url
+from src.utils.parallel import map_jobs
+from src.utils.output import print_table as table, output_preamble as preamble
+from src.commands.security import format_requirements
+
+
+def index(db_file: str, openapi_files: List[str], jobs: int = 1,
+          color: bool = False) -> int:
+    """Index OpenAPI files to a database and print an output table of them.
+
+    Arguments
+    ---------
+    db_file
+        Path of a database file, which is created, if it does not exist.
+    openapi_files
+        List of paths of OpenAPI files to be indexed.
+    jobs
+        Number of worker processes for indexing files.
+    color
+        Flag about suppressing colorization of an output.
+
+    Returns
+    -------
+    Number of files, which failed to be indexed.
+
+    Notes
+    -----
+    - Files are indexed incrementally. A file is indexed again just if its
+      content or content of any of its referenced files has changed,
+      so that unchanged files are not parsed at all. Files referenced by
+      URLs are revalidated by conditional requests.
+    - Indexed files, which do not exist anymore, are removed from the index.
+    - Changed files are bundled and indexed independently in worker
+      processes, while the database is updated in one transaction.
+
+    """
+    inputs = {}
+    for openapi_file in openapi_files:
+        inputs.setdefault(os.path.abspath(openapi_file), openapi_file)
+    conn = db.connect(db_file)
+    status = dict.fromkeys(inputs)
+    stale = []
+    for openapi_file in inputs:
+        stored = db.spec_files(conn, openapi_file)
+        try:
+            unchanged = stored and all(
+                (is_url(file) or os.path.isfile(file))
+                and hash_file(file) == hashed
+                for file, hashed in stored.items())
+        except FileNotFoundError:
+            unchanged = False
+        if unchanged:
+            status[openapi_file] = 'unchanged'
+        else:
+            stale.append(openapi_file)
+    results = map_jobs(index_file, stale, jobs)
+    failures = 0
+    with conn:
+        for data in results:
+            if 'error' in data:
+                status[data['file']] = f'failed: {data["error"]}'
+                failures += 1
+                continue
+            db.store_spec(conn, data)
+            status[data['file']] = \
+                f'indexed {len(data["operations"])} operations,' \
+                f' {len(data["components"])} components'
+        for openapi_file in db.indexed_specs(conn):
+            if not os.path.isfile(openapi_file):
+                db.remove_spec(conn, openapi_file)
+                status[openapi_file] = 'removed'
+    conn.close()
+    # Output
+    preamble('Index of OpenAPI files', db_file, color)
+    click.echo()
+    data = [[idx + 1, inputs.get(openapi_file, openapi_file), msg]
+            for idx, (openapi_file, msg) in enumerate(status.items())]
+    table(data, ['No', 'File', 'Status'])
+    return failures
+
+
+def index_file(openapi_file: str) -> Dict:
+    """Bundle an OpenAPI file and compose rows of its index.
+
+    Arguments
+    ---------
+    openapi_file
+        Absolute path of an OpenAPI file.
+
+    Returns
+    -------
+    Indexed data of the file for storing to the database or the file with
+    an error message, if it cannot be loaded.
+
+    Notes
+    -----
+    - Nodes are JSON pointers of operations and components. References of
+      path items are attributed to each their operation and security schemes
+      of effective security requirements are considered referenced by
+      operations.
+    - An operation is secured, if it has security requirements and none of
+      them is empty, i.e., anonymous access.
+
+    """
+    try:
+        with cfg.use_cache(cfg.FileCache(dereference_import=True)) as cache:
+            record = ref.load_record(openapi_file)
+            content = ref.dereference(record.oas, record.oasfile)
+            files = [(rec.oasfile, hash_file(rec.oasfile))
+                     for rec in cache.records]
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        return {'file': openapi_file, 'error': str(err)}
+    except RecursionError:
+        return {'file': openapi_file,
+                'error': 'Circular references cannot be bundled!'}
+    info = content.get('info') or {}
+    data = {'file': openapi_file, 'title': info.get('title'),
+            'version': info.get('version'), 'files': files,
+            'operations': [], 'tags': [], 'components': [], 'refs': []}
+    security = ref.index_security(content)
+    for path_key, path_item in (content.get('paths') or {}).items():
+        if not isinstance(path_item, dict):
+            continue
+        common = {key: value for key, value in path_item.items()
+                  if key.upper() not in cfg.Parameter.HTTP_METHODS.value}
+        for method_key, operation in path_item.items():
+            if method_key.upper() not in cfg.Parameter.HTTP_METHODS.value \
+                    or not isinstance(operation, dict):
+                continue
+            node = ref.concat(['paths', ref.escape_pointer(path_key),
+                               method_key])
+            requirements = security.effective(path_key, method_key)
+            secured = bool(requirements) and all(requirements)
+            data['operations'].append(
+                (node, method_key.upper(), path_key,
+                 operation.get('operationId'),
+                 format_requirements(requirements), secured))
+            data['tags'].extend((node, tag)
+                                for tag in operation.get('tags') or [])
+            targets = collect_refs(operation, collect_refs(common))
+            targets.update(
+                ref.concat(['components', 'securitySchemes', scheme])
+                for requirement in requirements
+                if isinstance(requirement, dict) for scheme in requirement)
+            data['refs'].extend((node, target) for target in sorted(targets))
+    for kind, objects in (content.get('components') or {}).items():
+        if not isinstance(objects, dict):
+            continue
+        for name, value in objects.items():
+            node = ref.concat(['components', kind, name])
+            data['components'].append((node, kind, name))
+            data['refs'].extend((node, target)
+                                for target in sorted(collect_refs(value)))
+    return data
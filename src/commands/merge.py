@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""Module for merging OpenAPI files."""
+__version__ = '0.2.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from typing import Dict, List, NoReturn
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+from src.utils.reference import bundle_file
+from src.utils.digest import digest
+import src.utils.cleanup as clean
+from src.utils.output import output_content as out, output_unresolved
+
+
+def merge(openapi_files: List[str], outformat: cfg.Format = None,
+          keep_first: bool = False, compression: cfg.Compression = None,
+          minify: bool = False) -> NoReturn:
+    """Merge provided OpenAPI files and print the merged content.
+
+    Arguments
+    ---------
+    openapi_files
+        List of paths of OpenAPI files to be merged.
+    outformat
+        Enumeration member of an requested OpenAPI content format for output
+        to the system console. Format of the first file is used by default.
+    keep_first
+        Flag about just warning about conflicts and keeping the first
+        definitions instead of refusing the output.
+    compression
+        Enumeration member of a compression of the output or None.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+
+    Raises
+    ------
+    click.ClickException
+        Different definitions of the same path or component.
+
+    Notes
+    -----
+    - Each file is bundled at first in its own file cache, so that contents
+      imported from its referenced files land in its own document. Files
+      referenced from several merged files are parsed for each of them.
+    - Root properties are taken from the first file, tags are merged by their
+      names. Root security requirements of the other files differing from
+      the merged ones are moved to their operations without own ones.
+    - Paths and components are indexed by their names with structural hashes
+      of definitions, so that each definition is compared just once and
+      the merging is linear in the number and size of files.
+    - Colliding definitions with the same structure are merged silently.
+
+    """
+    merged = {}
+    index = {}
+    conflicts = []
+    for openapi_file in openapi_files:
+        record, content = bundle_file(openapi_file)
+        outformat = outformat or record.oastype
+        memo = {}
+        if not merged:
+            merged = {key: value for key, value in content.items()
+                      if key not in ('paths', 'components')}
+            merged['paths'] = {}
+            merged['components'] = {}
+        else:
+            move_security(content, merged, memo)
+            merge_tags(content, merged)
+        for fragments, value in iter_definitions(content):
+            hashed = digest(value, memo)
+            key = tuple(fragments)
+            if key not in index:
+                index[key] = (hashed, record.oasinput)
+                target = merged
+                for fragment in fragments[:-1]:
+                    target = target.setdefault(fragment, {})
+                target[fragments[-1]] = value
+            elif index[key][0] != hashed:
+                conflicts.append(['/'.join(fragments), index[key][1],
+                                  record.oasinput])
+    if conflicts:
+        errmsg = 'Conflicting definitions:\n' + '\n'.join(
+            f'{name} in "{first}" and "{other}"'
+            for name, first, other in conflicts)
+        if not keep_first:
+            raise click.ClickException(errmsg)
+        click.echo(click.style(errmsg, fg='yellow'), err=True)
+    # Cleanup
+    content = clean.remove_empty_objects(merged)
+    content = clean.reorder_components(content)
+    # Output
+    output_unresolved(cfg.CACHE.unresolved)
+    out(content, outformat, compression, minify)
+
+
+def iter_definitions(content: Dict):
+    """Iterate over path items and components of the content.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content.
+
+    Yields
+    ------
+    Tuple with location fragments of a definition and the definition itself.
+
+    """
+    path_items = content.get('paths')
+    if isinstance(path_items, dict):
+        for path_key, value in path_items.items():
+            yield ['paths', path_key], value
+    components = content.get('components')
+    if isinstance(components, dict):
+        for comps_prop, target in components.items():
+            if not isinstance(target, dict):
+                continue
+            for name, value in target.items():
+                yield ['components', comps_prop, name], value
+
+
+def move_security(content: Dict, merged: Dict,
+                  memo: Dict[int, str]) -> NoReturn:
+    """Move root security requirements to operations without own ones,
+    if they differ from the merged ones.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content to be merged.
+    merged
+        Already merged OpenAPI content.
+    memo
+        Dictionary of structural hashes of the content.
+
+    """
+    security = content.get('security', [])
+    if digest(security, memo) == digest(merged.get('security', [])):
+        return
+    path_items = content.get('paths')
+    if not isinstance(path_items, dict):
+        return
+    for path_value in path_items.values():
+        if not isinstance(path_value, dict):
+            continue
+        for method_key, method_value in path_value.items():
+            if method_key.upper() in cfg.Parameter.HTTP_METHODS.value \
+                and isinstance(method_value, dict):
+                method_value.setdefault('security', security)
+
+
+def merge_tags(content: Dict, merged: Dict) -> NoReturn:
+    """Append tags of the content not defined in merged content yet.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content to be merged.
+    merged
+        Already merged OpenAPI content.
+
+    """
+    tags = content.get('tags')
+    if not isinstance(tags, list):
+        return
+    merged_tags = merged.setdefault('tags', [])
+    names = {tag.get('name') for tag in merged_tags if isinstance(tag, dict)}
+    for tag in tags:
+        if isinstance(tag, dict) and tag.get('name') not in names:
+            names.add(tag.get('name'))
+            merged_tags.append(tag)
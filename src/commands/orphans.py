@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for listing unreferenced componensts of an OpenAPI file."""
-__version__ = '0.1.0'
+__version__ = '0.3.0'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -19,10 +19,14 @@ from src.utils.output import print_table as table
 # Internal modules
 import src.config as cfg
 from src.utils.cleanup import remove_unused_components
+from src.utils.filesystem import hash_file
+import src.utils.graph as graph
 from src.utils.output import output_preamble as preamble
 
 
-def orphans(record: cfg.OpenAPI, color: bool = False) -> NoReturn:
+def orphans(record: cfg.OpenAPI, color: bool = False,
+            state_file: str = None,
+            tablefmt: cfg.TableFormat = cfg.TableFormat.TABLE) -> NoReturn:
     """Print an output table with list of OpenAPI unreferenced components.
 
     Arguments
@@ -32,20 +36,36 @@ def orphans(record: cfg.OpenAPI, color: bool = False) -> NoReturn:
         valid and dereference OpenAPI document is assumed.
     color
         Flag about suppressing colorization of an output.
+    state_file
+        File with reference graph of the previous run to be reused and
+        updated by the current run.
+    tablefmt
+        Enumeration member of a tabular output format.
 
     Notes
     -----
     Final table is sorted ascendng alphabetically.
+    Streaming table formats are output without preamble.
 
     """
-    _, components, schemes = remove_unused_components(record.oas)
+    state, files = None, None
+    if state_file:
+        state = graph.load_state(state_file)
+        files = {record.oasfile: hash_file(record.oasfile)}
+    _, components, schemes = remove_unused_components(record.oas,
+                                                      state, files)
+    if state_file:
+        graph.save_state(state_file, state)
+    references = components + schemes
+    headers = ['No', 'Reference to component']
+    if tablefmt.streaming:
+        table(enumerate(references, 1), headers, tablefmt=tablefmt)
+        return
     preamble('Unreferenced components from OpenAPI file',
              record.oasinput, color)
-    references = components + schemes
     if references:
         click.echo()
-        data = [[idx + 1, ref] for idx, ref in enumerate(references)]
-        table(data, ['No', 'Reference to component'])
+        table(enumerate(references, 1), headers, tablefmt=tablefmt)
     else:
         msg = cfg.Parameter.NONE.value
         log = click.style(msg, fg='red') if color else msg
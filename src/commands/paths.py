@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for listing HTTP methods of an OpenAPI file."""
-__version__ = '0.2.0'
+__version__ = '0.4.1'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -10,7 +10,7 @@ __maintainer__ = __author__
 __email__ = 'libor.gabaj@gmail.com'
 
 # Standard library modules
-from typing import NoReturn
+from typing import Tuple, List, Dict, NoReturn
 
 # Third party modules
 import click
@@ -20,9 +20,12 @@ import src.config as cfg
 from src.utils.reference import dereference, parse
 from src.utils.filesystem import get_relpath, resolve_filepath
 from src.utils.output import print_table as table, output_preamble as preamble
+from src.utils.output import Rows
+from src.utils.parallel import map_jobs
 
 
-def paths(record: cfg.OpenAPI, color: bool = False) -> NoReturn:
+def paths(record: cfg.OpenAPI, color: bool = False, jobs: int = 1,
+          tablefmt: cfg.TableFormat = cfg.TableFormat.TABLE) -> NoReturn:
     """Print an output table with list of OpenAPI paths and methods.
 
     Arguments
@@ -32,65 +35,103 @@ def paths(record: cfg.OpenAPI, color: bool = False) -> NoReturn:
         valid OpenAPI document is assumed.
     color
         Flag about suppressing colorization of an output.
+    jobs
+        Number of worker processes for dereferencing path items.
+    tablefmt
+        Enumeration member of a tabular output format.
 
     Notes
     -----
     Final table is sorted by Path and then by Method ascending alphabetically.
+    Streaming table formats are output without preamble.
 
     """
     # Separate paths section and list them
     paths_list = []
+    oasfiles = {record.oasfile}
     paths_key = 'paths'
     if paths_key in record.oas.keys() and record.oas[paths_key]:
         # List all endpoints
-        for path_key, path_value in record.oas[paths_key].items():
-            # Detect definition file
-            oasfile = record.oasfile
-            ref_key = '$ref'
-            path_ref = path_value.get(ref_key)
-            if path_ref:
-                oasfile, _ = parse(path_value[ref_key])
-                oasfile = resolve_filepath(oasfile, record.oasfile)
-            oasfile = get_relpath(oasfile, record.oasfile)
-            # Dereference a path specification
-            path_value = dereference(path_value, record.oasfile)
-            if not path_value:
-                continue
-            # List only HTTP methods
-            for method_key, method_value in path_value.items():
-                method_name = method_key.upper()
-                # Exclude fixed fields not being HTTP methods
-                if method_name not in cfg.Parameter.HTTP_METHODS.value:
-                    continue
-                # No method specification present
-                if not isinstance(method_value, dict):
-                    continue
-                method_id = method_value.get('operationId',
-                                             cfg.Parameter.NONE.value)
-                paths_list.append(cfg.Method(
-                    name=method_name,
-                    operid=method_id,
-                    path=path_key,
-                    oasfile=oasfile,
-                    ).list)
+        items = [(path_key, path_value, record.oasfile)
+                 for path_key, path_value in record.oas[paths_key].items()]
+        for methods, files in map_jobs(list_methods, items, jobs):
+            paths_list.extend(methods)
+            oasfiles.update(files)
+    # Sort data table by path and method
+    paths_list.sort(key=lambda rec: (rec.path, rec.name))
+    headers = cfg.Method.headers
+    # Omit last column from data table
+    if len(oasfiles) == 1:
+        headers = headers[:-1]
+        rows = Rows(lambda: ((idx, name, path, operid)
+                             for idx, (name, path, operid, _)
+                             in enumerate(paths_list, 1)))
+    else:
+        rows = Rows(lambda: ((idx, *rec)
+                             for idx, rec in enumerate(paths_list, 1)))
+    if tablefmt.streaming:
+        table(rows, headers, tablefmt=tablefmt)
+        return
     # Preamble
     preamble('HTTP methods from OpenAPI file',
              record.oasinput, color)
-    # Sort data table
-    paths_list.sort(key=lambda rec: rec[0])  # Sort by method
-    paths_list.sort(key=lambda rec: rec[1])  # Sort by path
     # Output
     if paths_list:
         click.echo()
-        headers = cfg.Method.headers
-        _ = [rec.insert(0, idx + 1) for idx, rec in enumerate(paths_list)]
-        # Remove last column from data table
-        if cfg.CACHE.files == 1:
-            headers = headers[:-1]
-            paths_list = [rec[:-1] for rec in paths_list]
-        table(paths_list, headers)
-        paths_list.append(cfg.Method(oasfile=record.oasfile).list)
+        table(rows, headers, tablefmt=tablefmt)
     else:
         msg = cfg.Parameter.NONE.value
         log = click.style(msg, fg='red') if color else msg
         click.echo(log)
+
+
+def list_methods(item: Tuple[str, Dict, str]) -> Tuple[List[cfg.Method],
+                                                       List[str]]:
+    """List HTTP methods of a path item.
+
+    Arguments
+    ---------
+    item
+        Tuple with path of an endpoint, path item, and OpenAPI file
+        containing it.
+
+    Returns
+    -------
+    Tuple with list of HTTP method declarations and list of OpenAPI files
+    loaded to the cache while processing the path item.
+
+    """
+    path_key, path_value, source_file = item
+    methods = []
+    loaded = cfg.CACHE.files
+    # Detect definition file
+    oasfile = source_file
+    ref_key = '$ref'
+    path_ref = path_value.get(ref_key)
+    if path_ref:
+        oasfile, _ = parse(path_value[ref_key])
+        oasfile = resolve_filepath(oasfile, source_file)
+    oasfile = get_relpath(oasfile, source_file)
+    # Dereference a path specification
+    path_value = dereference(path_value, source_file)
+    files = [rec.oasfile for rec in cfg.CACHE.records[loaded:]]
+    if not path_value:
+        return methods, files
+    # List only HTTP methods
+    for method_key, method_value in path_value.items():
+        method_name = method_key.upper()
+        # Exclude fixed fields not being HTTP methods
+        if method_name not in cfg.Parameter.HTTP_METHODS.value:
+            continue
+        # No method specification present
+        if not isinstance(method_value, dict):
+            continue
+        method_id = method_value.get('operationId',
+                                     cfg.Parameter.NONE.value)
+        methods.append(cfg.Method(
+            name=method_name,
+            operid=method_id,
+            path=path_key,
+            oasfile=oasfile,
+            ))
+    return methods, files
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for removing useless objects from an OpenAPI file."""
-__version__ = '0.2.0'
+__version__ = '0.4.1'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -10,17 +10,21 @@ __maintainer__ = __author__
 __email__ = 'libor.gabaj@gmail.com'
 
 # Standard library modules
-from typing import NoReturn
+from typing import Dict, NoReturn
 
 # Third party modules
 
 # Internal modules
 import src.config as cfg
 import src.utils.cleanup as clean
+import src.utils.graph as graph
+from src.utils.filesystem import hash_file
 from src.utils.output import output_content as out
 
 
-def prune(record: cfg.OpenAPI, outformat: cfg.Format = None) -> NoReturn:
+def prune(record: cfg.OpenAPI, outformat: cfg.Format = None,
+          state_file: str = None, compression: cfg.Compression = None,
+          minify: bool = False) -> NoReturn:
     """Cleanup and print OpenAPI content of the provided OpenAPI file record.
 
     Arguments
@@ -31,11 +35,44 @@ def prune(record: cfg.OpenAPI, outformat: cfg.Format = None) -> NoReturn:
     outformat
         Enumeration member of an requested OpenAPI content format for output
         to the system console.
+    state_file
+        File with reference graph of the previous run to be reused and
+        updated by the current run.
+    compression
+        Enumeration member of a compression of the output or None.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+
+    """
+    content = prune_content(record, state_file)
+    # Output
+    out(content, outformat or record.oastype, compression, minify)
+
+
+def prune_content(record: cfg.OpenAPI, state_file: str = None) -> Dict:
+    """Remove unused components and empty objects from record content.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which should be pruned.
+    state_file
+        File with reference graph of the previous run to be reused and
+        updated by the current run. The record content has to be the one
+        of its file then.
+
+    Returns
+    -------
+    Pruned OpenAPI content.
 
     """
     content = record.oas
     # Cleanup
-    content, _, _ = clean.remove_unused_components(content)
-    content = clean.remove_empty_objects(content)
-    # Output
-    out(content, outformat or record.oastype)
+    state, files = None, None
+    if state_file:
+        state = graph.load_state(state_file)
+        files = {record.oasfile: hash_file(record.oasfile)}
+    content, _, _ = clean.remove_unused_components(content, state, files)
+    if state_file:
+        graph.save_state(state_file, state)
+    return clean.remove_empty_objects(content)
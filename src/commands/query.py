@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Module for answering questions from the index of OpenAPI files."""
+__version__ = '0.1.1'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from typing import Dict, NoReturn
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+import src.utils.database as db
+from src.utils.reference import concat
+from src.utils.output import print_table as table, output_preamble as preamble
+from src.utils.output import Rows
+
+
+def query(db_file: str, question: str = None, value: str = None,
+          sql: str = None, color: bool = False,
+          tablefmt: cfg.TableFormat = cfg.TableFormat.TABLE) -> NoReturn:
+    """Print an output table with an answer from the index database.
+
+    Arguments
+    ---------
+    db_file
+        Path of an existing database file.
+    question
+        Name of a predefined question from the database module.
+    value
+        Parameter of the question, i.e., component for 'uses' in the form
+        'schemas/Pet' and tag name for 'tag'.
+    sql
+        SQL statement used instead of a predefined question.
+    color
+        Flag about suppressing colorization of an output.
+    tablefmt
+        Enumeration member of a tabular output format.
+
+    Notes
+    -----
+    - The database is opened just for reading, so that SQL statements
+      cannot modify the index.
+    - Operations using a component are found by a recursive query over
+      references, so that components used indirectly are considered too.
+    - Streaming table formats are output without preamble.
+
+    """
+    if sql is None:
+        sql, headers = db.QUERIES[question]
+        params = parameters(question, value)
+    else:
+        headers, params = None, None
+    conn = db.connect(db_file, readonly=True)
+    try:
+        columns, rows = db.query(conn, sql, params)
+    finally:
+        conn.close()
+    headers = ['No'] + (headers or columns)
+    data = Rows(lambda: ([idx + 1] + list(row)
+                         for idx, row in enumerate(rows)))
+    if tablefmt.streaming:
+        table(data, headers, tablefmt=tablefmt)
+        return
+    preamble('Query of OpenAPI index', db_file, color)
+    if rows:
+        click.echo()
+        table(data, headers, tablefmt=tablefmt)
+    else:
+        msg = cfg.Parameter.NONE.value
+        log = msg if color else click.style(msg, fg='red')
+        click.echo(log)
+
+
+def parameters(question: str, value: str) -> Dict:
+    """Compose named parameters of a predefined question.
+
+    Arguments
+    ---------
+    question
+        Name of a predefined question.
+    value
+        Parameter of the question provided by user.
+
+    Returns
+    -------
+    Named parameters of the SQL statement of the question.
+
+    Notes
+    -----
+    'uses', 'schemas/Pet' => {'node': '#/components/schemas/Pet'}
+
+    """
+    if question == 'uses':
+        if value.startswith(cfg.Parameter.REF_DELIM.value):
+            return {'node': value}
+        return {'node': concat(['components'] + value.split('/', 1))}
+    if question == 'tag':
+        return {'tag': value}
+    return {}
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Module for listing and checking references of an OpenAPI file."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from time import perf_counter
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+import src.utils.graph as graph
+from src.utils.reference import parse
+from src.utils.filesystem import get_relpath
+from src.utils.output import print_table as table, output_preamble as preamble
+
+
+def refs(record: cfg.OpenAPI, color: bool = False,
+         check: bool = False) -> int:
+    """Print an output table with references of an OpenAPI file.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which references should be listed. The record
+        with valid OpenAPI document is assumed.
+    color
+        Flag about suppressing colorization of an output.
+    check
+        Flag about listing only dangling, cross-file, and circular references
+        with timings of checking phases instead of all references.
+
+    Returns
+    -------
+    Number of dangling and circular references.
+
+    Notes
+    -----
+    - References of the file and all referenced files are indexed in one
+      pass over each file. Afterwards all targets are resolved in batch,
+      each just once, and cycles are detected in the graph of targets,
+      so that the check is linear in the size of all files.
+    - Locations are JSON pointers prefixed with paths of files relative
+      to the input one.
+
+    """
+    timings = []
+    start = perf_counter()
+    references, failed = graph.index_references(record)
+    timings.append(['Indexing', perf_counter() - start])
+    start = perf_counter()
+    results = graph.resolve_references(references, failed)
+    timings.append(['Resolution', perf_counter() - start])
+    start = perf_counter()
+    circular = graph.circular_references(references)
+    timings.append(['Cycle detection', perf_counter() - start])
+
+    def relative(location: str) -> str:
+        location_file, _ = parse(location)
+        return get_relpath(location_file, record.oasfile) \
+            + location[len(location_file):]
+
+    rows = []
+    issues = 0
+    for idx, (location, value, target) in enumerate(references):
+        kinds = []
+        if results[target]:
+            kinds.append('dangling')
+        if idx in circular:
+            kinds.append('circular')
+        issues += bool(kinds)
+        if parse(location)[0] != parse(target)[0]:
+            kinds.append('cross-file')
+        if check and not kinds:
+            continue
+        rows.append([', '.join(kinds) or cfg.Parameter.NONE.value,
+                     relative(location), value,
+                     results[target] or cfg.Parameter.NONE.value])
+    rows.sort(key=lambda rec: rec[1])
+    # Preamble
+    preamble('References of OpenAPI file', record.oasinput, color)
+    # Output
+    if rows:
+        click.echo()
+        data = [[idx + 1] + rec for idx, rec in enumerate(rows)]
+        table(data, ['No', 'Issue', 'Location', 'Reference', 'Error'])
+    else:
+        msg = cfg.Parameter.NONE.value
+        log = msg if color else click.style(msg, fg='green')
+        click.echo(log)
+    if check:
+        click.echo()
+        data = [[idx + 1] + [phase, round(seconds * 1000, 3)]
+                for idx, (phase, seconds) in enumerate(timings)]
+        table(data, ['No', 'Phase', 'Time [ms]'])
+        click.echo()
+        click.echo(f'{len(references)} references in {cfg.CACHE.files}'
+                   f' files, {issues} dangling or circular')
+    return issues
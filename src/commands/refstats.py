@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""Module for reporting statistics of reference resolution."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from typing import NoReturn
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+from src.utils.reference import dereference, parse, concat
+from src.utils.filesystem import get_relpath
+from src.utils.output import print_table as table, output_preamble as preamble
+from src.utils.output import dump_json
+
+
+def refstats(record: cfg.OpenAPI, color: bool = False,
+             jsonout: bool = False) -> NoReturn:
+    """Resolve references and print statistics of their resolution.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which references should be resolved. The record
+        with valid OpenAPI document is assumed.
+    color
+        Flag about suppressing colorization of an output.
+    jsonout
+        Flag about printing statistics in JSON format instead of tables.
+
+    Notes
+    -----
+    - The instrumentation of the reference resolution is expected to be
+      activated in the cache before loading the record.
+    - Reference targets are sorted by count and time descending.
+    - Files are sorted by parsing time descending.
+
+    """
+    stats = cfg.CACHE.ref_stats or cfg.RefStats()
+    cfg.CACHE.ref_stats = stats
+    dereference(record.oas, record.oasfile)
+    # Compose data tables
+    targets = []
+    for stat in sorted(stats.targets.values(),
+                       key=lambda rec: (rec.count, rec.time), reverse=True):
+        target_file, target_fragments = parse(stat.target)
+        target = concat(target_fragments,
+                        get_relpath(target_file, record.oasfile))
+        targets.append(cfg.RefStat(target=target, count=stat.count,
+                                   time=stat.time, depth=stat.depth).list)
+    files = [[get_relpath(oasfile, record.oasfile), round(seconds * 1000, 3)]
+             for oasfile, seconds in sorted(stats.files.items(),
+                                            key=lambda rec: rec[1],
+                                            reverse=True)]
+    # Output
+    if jsonout:
+        keys = ['target', 'count', 'time_ms', 'depth']
+        dump_json({
+            'targets': [dict(zip(keys, rec)) for rec in targets],
+            'files': [dict(zip(['file', 'time_ms'], rec)) for rec in files],
+        })
+        return
+    preamble('Reference resolution statistics from OpenAPI file',
+             record.oasinput, color)
+    if targets:
+        click.echo()
+        data = [[idx + 1] + rec for idx, rec in enumerate(targets)]
+        table(data, cfg.RefStat.headers)
+    else:
+        msg = cfg.Parameter.NONE.value
+        log = msg if color else click.style(msg, fg='red')
+        click.echo(log)
+    click.echo()
+    data = [[idx + 1] + rec for idx, rec in enumerate(files)]
+    table(data, ['No', 'Definition file', 'Parse time [ms]'])
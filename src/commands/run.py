@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""Module for running a chain of commands on one in-memory OpenAPI record."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from typing import Callable, List, NoReturn
+
+# Third party modules
+
+# Internal modules
+import src.config as cfg
+import src.commands.bundle as bundle
+import src.commands.prune as prune
+import src.commands.extract as extract
+from src.utils.output import output_content as out, output_unresolved
+
+# Step of a chain modifying the record in place
+Step = Callable[[cfg.OpenAPI], NoReturn]
+
+
+def run(record: cfg.OpenAPI, steps: List[Step],
+        compression: cfg.Compression = None,
+        minify: bool = False) -> NoReturn:
+    """Run steps in order on the record and print its final content.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which should be processed. The record with
+        valid OpenAPI document is assumed.
+    steps
+        List of steps, each replacing the content of the record by its
+        result for the next step.
+    compression
+        Enumeration member of a compression of the output or None.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+
+    Notes
+    -----
+    - The file is parsed just once and only the final content is
+      serialized, instead of serializing and parsing it between utilities
+      chained by pipes.
+    - The output is in the format of the record, which the convert step
+      changes.
+
+    """
+    for step in steps:
+        step(record)
+    # Output
+    output_unresolved(cfg.CACHE.unresolved)
+    out(record.oas, record.oastype, compression, minify)
+
+
+def bundle_step(deref: bool = False, budget: int = None, warn: bool = False,
+                dedupe: bool = False, jobs: int = 1) -> Step:
+    """Create a step bundling the record with its referenced files.
+
+    Arguments
+    ---------
+    deref
+        Flag about deep dereference.
+    budget
+        Maximal number of nodes of the serialized content. Zero or None
+        means no limit.
+    warn
+        Flag about just warning instead of refusing the output, if the budget
+        is exceeded.
+    dedupe
+        Flag about merging structurally identical components.
+    jobs
+        Number of worker processes for dereferencing path items.
+
+    Returns
+    -------
+    Step of a chain.
+
+    """
+    def step(record: cfg.OpenAPI) -> NoReturn:
+        cfg.CACHE.dereference_import = True
+        cfg.CACHE.dereference_deep = deref
+        record.oas = bundle.bundle_content(record, budget, warn, dedupe, jobs)
+    return step
+
+
+def prune_step() -> Step:
+    """Create a step removing unused components from the record."""
+    def step(record: cfg.OpenAPI) -> NoReturn:
+        record.oas = prune.prune_content(record)
+    return step
+
+
+def extract_step(tags: List[str] = None, paths: List[str] = None,
+                 operation_ids: List[str] = None) -> Step:
+    """Create a step extracting selected operations from the record.
+
+    Arguments
+    ---------
+    tags
+        List of tags of selected operations.
+    paths
+        List of paths of selected operations.
+    operation_ids
+        List of identifiers of selected operations.
+
+    Returns
+    -------
+    Step of a chain.
+
+    """
+    select = extract.selector(tags, paths, operation_ids)
+
+    def step(record: cfg.OpenAPI) -> NoReturn:
+        cfg.CACHE.dereference_import = True
+        record.oas = extract.extract_content(record, select)
+    return step
+
+
+def convert_step(outformat: cfg.Format = None) -> Step:
+    """Create a step changing the format of the record.
+
+    Arguments
+    ---------
+    outformat
+        Enumeration member of an requested OpenAPI content format. The opposite
+        one between YAML and JSON is used by default.
+
+    Returns
+    -------
+    Step of a chain.
+
+    """
+    def step(record: cfg.OpenAPI) -> NoReturn:
+        record.oastype = outformat \
+            or (cfg.Format.JSON if record.oastype == cfg.Format.YAML
+                else cfg.Format.YAML)
+    return step
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Module for listing security requirements of an OpenAPI file."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from typing import List, Dict, NoReturn
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+from src.utils.reference import dereference, index_security
+from src.utils.output import print_table as table, output_preamble as preamble
+
+
+def security(record: cfg.OpenAPI, color: bool = False) -> NoReturn:
+    """Print an output table with security requirements of OpenAPI operations.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which operations should be printed. The record
+        with valid OpenAPI document is assumed.
+    color
+        Flag about suppressing colorization of an output.
+
+    Notes
+    -----
+    - Security requirements declared by an operation override the root ones.
+    - Alternative security requirements are separated by vertical bar,
+      schemes required together are joined by plus sign with scopes in
+      brackets.
+    - Final table is sorted by Path and then by Method ascending
+      alphabetically.
+
+    """
+    # Dereference path items
+    paths_key = 'paths'
+    if isinstance(record.oas.get(paths_key), dict):
+        for path_key, path_value in record.oas[paths_key].items():
+            record.oas[paths_key][path_key] = \
+                dereference(path_value, record.oasfile)
+    index = index_security(record.oas)
+    security_list = []
+    for path_key, method_key in index.operations:
+        operation = record.oas[paths_key][path_key][method_key]
+        security_list.append([
+            method_key.upper(),
+            path_key,
+            operation.get('operationId', cfg.Parameter.NONE.value),
+            format_requirements(index.effective(path_key, method_key)),
+            ])
+    # Preamble
+    preamble('Security requirements of operations from OpenAPI file',
+             record.oasinput, color)
+    # Sort data table
+    security_list.sort(key=lambda rec: (rec[1], rec[0]))
+    # Output
+    if security_list:
+        click.echo()
+        data = [[idx + 1] + rec for idx, rec in enumerate(security_list)]
+        table(data, ['No', 'Method', 'Path', 'OperationId', 'Security'])
+    else:
+        msg = cfg.Parameter.NONE.value
+        log = msg if color else click.style(msg, fg='red')
+        click.echo(log)
+
+
+def format_requirements(requirements: List[Dict]) -> str:
+    """Compose text representation of security requirements.
+
+    Arguments
+    ---------
+    requirements
+        List of security requirement objects.
+
+    Returns
+    -------
+    Text with security requirements.
+
+    Notes
+    -----
+    [{'apiKey': []}, {'oauth': ['read', 'write']}, {}]
+    => 'apiKey | oauth[read,write] | anonymous'
+
+    """
+    if not requirements:
+        return cfg.Parameter.NONE.value
+    alternatives = []
+    for requirement in requirements:
+        if not isinstance(requirement, dict):
+            continue
+        schemes = [scheme + (f'[{",".join(scopes)}]' if scopes else '')
+                   for scheme, scopes in requirement.items()]
+        alternatives.append(' + '.join(schemes) or 'anonymous')
+    return ' | '.join(alternatives)
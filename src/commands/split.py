@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""Module for splitting an OpenAPI file to separate files."""
+__version__ = '0.1.2'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import os
+from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, NoReturn
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+import src.utils.reference as ref
+from src.utils.filesystem import get_relpath
+from src.utils.compression import detect
+from src.utils.output import print_table as table, output_preamble as preamble
+from src.utils.output import write_content, output_unresolved
+
+
+def split(record: cfg.OpenAPI, output_dir: str,
+          outformat: cfg.Format = None, jobs: int = None,
+          color: bool = False) -> NoReturn:
+    """Split OpenAPI file to separate files of components and path items.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which should be split. The record with valid
+        OpenAPI document is assumed.
+    output_dir
+        Folder for split OpenAPI files.
+    outformat
+        Enumeration member of an requested OpenAPI format of split files.
+    jobs
+        Number of threads writing files.
+    color
+        Flag about suppressing colorization of an output.
+
+    Notes
+    -----
+    - External references are resolved and imported at first, so that the
+      input file is split as bundled one.
+    - Each component except security schemes is written to the file
+      "components/<kind>/<name>.<ext>" and each path item to the file
+      "paths/<path>.<ext>" in the output folder.
+    - Each split file is a standalone OpenAPI document with the component or
+      path item at the same location as in the input file, so that its
+      references are the same except the file part.
+    - The root file with the same name as the input file refers to path
+      items. Components are referenced only by path items and other
+      components, while security schemes stay in the root file.
+    - Bundling the root file gives the same result as bundling the input
+      file.
+
+    """
+    outformat = outformat or record.oastype
+    content = ref.dereference(record.oas, record.oasfile)
+    _, base_file = detect(record.oasfile)
+    root_name = os.path.splitext(os.path.basename(base_file))[0]
+    root_file = os.path.join(os.path.abspath(output_dir),
+                             f'{root_name}.{outformat.value}')
+    files, targets = plan_files(content, root_file, outformat)
+    # Compose documents with relative references
+    header = {key: content[key] for key in ('openapi', 'info')
+              if key in content}
+    documents = []
+    mappings = {}
+    for (fragments, value), split_file in zip(targets, files):
+        folder = os.path.dirname(split_file)
+        if folder not in mappings:
+            mappings[folder] = compose_mapping(targets, files, split_file)
+        document = dict(header)
+        target = document
+        for fragment in fragments[:-1]:
+            target = target.setdefault(fragment, {})
+        # Subtrees shared in memory get references relative to each file
+        target[fragments[-1]] = deepcopy(value)
+        if fragments[0] == 'components':
+            document.setdefault('paths', {})
+        documents.append((ref.replace(document, mappings[folder]),
+                          split_file))
+    # Compose root document
+    mapping = compose_mapping(targets, files, root_file)
+    root = {}
+    for key, value in content.items():
+        if key == 'paths' and isinstance(value, dict):
+            value = {path_key: {'$ref': mapping[ref.concat(
+                [key, ref.escape_pointer(path_key)])]}
+                     for path_key in value}
+        elif key == 'components' and isinstance(value, dict):
+            value = {comps_prop: target
+                     for comps_prop, target in value.items()
+                     if comps_prop == 'securitySchemes'}
+            if not value:
+                continue
+        root[key] = ref.replace(deepcopy(value), mapping)
+    documents.append((root, root_file))
+    # Write files
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        list(executor.map(lambda doc: write_content(doc[0], outformat, doc[1]),
+                          documents))
+    # Output
+    output_unresolved(cfg.CACHE.unresolved)
+    preamble('Split OpenAPI file to folder', output_dir, color)
+    click.echo()
+    counts = {}
+    for fragments, _ in targets:
+        kind = cfg.Parameter.REF_SEPAR.value.join(fragments[:-1])
+        counts[kind] = counts.get(kind, 0) + 1
+    counts['root'] = 1
+    table([[idx + 1, kind, count]
+           for idx, (kind, count) in enumerate(counts.items())],
+          ['No', 'Part', 'Files'])
+
+
+def plan_files(content: Dict, root_file: str, outformat: cfg.Format) \
+    -> Tuple[List[str], List[Tuple[List[str], Dict]]]:
+    """Determine split files for components and path items.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content to be split.
+    root_file
+        Absolute path of the root split file.
+    outformat
+        Enumeration member of an requested OpenAPI format of split files.
+
+    Returns
+    -------
+    Tuple with list of absolute paths of split files and list of tuples
+    with location fragments of split content and the content itself.
+
+    Notes
+    -----
+    - File names are derived from names of components and paths with path
+      separators replaced by underscores. Colliding names are numbered.
+
+    """
+    root_dir = os.path.dirname(root_file)
+    files = []
+    targets = []
+    used = set()
+
+    def add(folder: str, name: str, fragments: List[str], value: Dict):
+        name = name.strip(os.sep).replace(os.sep, '_') \
+            .replace(cfg.Parameter.REF_SEPAR.value, '_') or 'root'
+        split_file = os.path.join(folder, f'{name}.{outformat.value}')
+        count = 1
+        while split_file in used:
+            count += 1
+            split_file = os.path.join(folder,
+                                      f'{name}_{count}.{outformat.value}')
+        used.add(split_file)
+        files.append(split_file)
+        targets.append((fragments, value))
+
+    components = content.get('components')
+    if isinstance(components, dict):
+        for comps_prop, target in components.items():
+            if comps_prop == 'securitySchemes' \
+                or not isinstance(target, dict):
+                continue
+            folder = os.path.join(root_dir, 'components', comps_prop)
+            for name, value in target.items():
+                add(folder, str(name), ['components', comps_prop, name], value)
+    path_items = content.get('paths')
+    if isinstance(path_items, dict):
+        folder = os.path.join(root_dir, 'paths')
+        for path_key, value in path_items.items():
+            add(folder, path_key, ['paths', path_key], value)
+    return files, targets
+
+
+def compose_mapping(targets: List[Tuple[List[str], Dict]], files: List[str],
+                    split_file: str) -> Dict[str, str]:
+    """Compose mapping of internal references to references relative
+    to a split file.
+
+    Arguments
+    ---------
+    targets
+        List of tuples with location fragments of split content and
+        the content itself.
+    files
+        List of absolute paths of split files for targets.
+    split_file
+        Absolute path of a split file, which references should be relative
+        to.
+
+    Returns
+    -------
+    Mapping of internal references to references into split files.
+
+    """
+    mapping = {}
+    for (fragments, _), target_file in zip(targets, files):
+        reference = ref.concat([ref.escape_pointer(fragment)
+                                for fragment in fragments])
+        rel_file = get_relpath(target_file, split_file)
+        mapping[reference] = rel_file.replace(os.sep, '/') + reference
+    return mapping
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Module for validating structure of an OpenAPI file."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+
+# Third party modules
+import click
+
+# Internal modules
+import src.config as cfg
+from src.utils.validation import validate as validate_record
+from src.utils.output import print_table as table, output_preamble as preamble
+
+
+def validate(record: cfg.OpenAPI, color: bool = False) -> int:
+    """Print an output table with structural errors of an OpenAPI file.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which should be validated.
+    color
+        Flag about suppressing colorization of an output.
+
+    Returns
+    -------
+    Number of detected errors.
+
+    Notes
+    -----
+    - Locations of errors are JSON pointers prefixed with paths of files
+      relative to the validated one.
+    - Final table is sorted by location ascending alphabetically.
+
+    """
+    errors = validate_record(record)
+    # Preamble
+    preamble('Structural errors of OpenAPI file', record.oasinput, color)
+    # Output
+    if errors:
+        click.echo()
+        data = [[idx + 1] + list(rec) for idx, rec in enumerate(errors)]
+        table(data, ['No', 'Location', 'Error'])
+    else:
+        msg = cfg.Parameter.NONE.value
+        log = msg if color else click.style(msg, fg='green')
+        click.echo(log)
+    return len(errors)
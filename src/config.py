@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for configuration parameters and intermodule data exchange."""
-__version__ = '0.3.0'
+__version__ = '0.6.0'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -12,10 +12,15 @@ __email__ = 'libor.gabaj@gmail.com'
 
 # Standard library modules
 from enum import Enum
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
-from typing import List, Dict, ClassVar, NoReturn, Optional
-from os import path
+from threading import Lock
+from typing import Any, List, Dict, ClassVar, Iterator, NamedTuple, \
+    NoReturn, Optional, Set, Tuple
+from os import path, stat
 from copy import deepcopy
+from time import perf_counter
 
 
 # Third party modules
@@ -25,6 +30,9 @@ class Parameter(Enum):
     """Enumeration of global static parameters."""
     EXT_YAML = ['yaml', 'yml']
     EXT_JSON = ['json']
+    EXT_MSGPACK = ['msgpack', 'mpk']
+    EXT_CBOR = ['cbor']
+    EXT_PICKLE = ['pickle', 'pkl']
     OAS_MARK3 = 'openapi'
     OAS_MARK2 = 'swagger'
     REF_DELIM = '#/'
@@ -32,28 +40,86 @@ class Parameter(Enum):
     NONE = 'N/A'
     HTTP_METHODS = ['GET', 'PUT', 'POST', 'DELETE',
                     'OPTIONS', 'HEAD', 'PATCH', 'TRACE']
+    NODE_BUDGET = 10000000
+    URL_SCHEMES = ['http://', 'https://']
+    HTTP_TIMEOUT = 30
+    HTTP_WORKERS = 8
+    HTTP_CACHE_ENV = 'OAC_CACHE_DIR'
+
+
+def absolute(openapi_file: str) -> str:
+    """Compose absolute path of an OpenAPI file, while URLs are kept."""
+    if openapi_file.startswith(tuple(Parameter.URL_SCHEMES.value)):
+        return openapi_file
+    return path.abspath(openapi_file)
+
 
 class Format(Enum):
     """Enumeration of OpenAPI document format."""
     YAML = 'yaml'
     JSON = 'json'
+    MSGPACK = 'msgpack'
+    CBOR = 'cbor'
+    PICKLE = 'pickle'
+
+    @property
+    def binary(self) -> bool:
+        """Flag about binary serialization of the format."""
+        return self not in (Format.YAML, Format.JSON)
+
+
+class Compression(Enum):
+    """Enumeration of compression of OpenAPI files by their extensions."""
+    GZIP = 'gz'
+    XZ = 'xz'
+    ZSTD = 'zst'
+
+
+class Shard(Enum):
+    """Enumeration of criteria of sharding bundled OpenAPI content."""
+    TAG = 'tag'
+    PATH_PREFIX = 'path-prefix'
+
+
+class TableFormat(Enum):
+    """Enumeration of tabular output format."""
+    TABLE = 'table'
+    FIXED = 'fixed'
+    TSV = 'tsv'
+    CSV = 'csv'
+    NDJSON = 'ndjson'
+
+    @property
+    def streaming(self) -> bool:
+        """Flag about writing rows as they are produced."""
+        return self in (TableFormat.TSV, TableFormat.CSV, TableFormat.NDJSON)
 
 
-@dataclass
 class OpenAPI:
     """OpenAPI specification from an OpenAPI file"""
-    # Originally provided OpenAPI file
-    oasinput: str = None
-    # Full file path of an OpenAPI document
-    oasfile: str = None
-    # Format of an OpenAPI document
-    oastype: Format = None
-    # Specification version of an OpenAPI document
-    oasversion: str = None
-    # OpenAPI document content
-    oas: Dict = field(default_factory=dict)
-    # Sequence order number of loading - index in cache list
-    idx: int = None
+
+    __slots__ = ('oasinput', 'oasfile', 'oastype', 'oasversion', 'oas', 'idx')
+
+    def __init__(self, oasinput: str = None, oasfile: str = None,
+                 oastype: Format = None, oasversion: str = None,
+                 oas: Dict = None, idx: int = None):
+        # Originally provided OpenAPI file
+        self.oasinput = oasinput
+        # Full file path of an OpenAPI document
+        self.oasfile = oasfile
+        # Format of an OpenAPI document
+        self.oastype = oastype
+        # Specification version of an OpenAPI document
+        self.oasversion = oasversion
+        # OpenAPI document content
+        self.oas = {} if oas is None else oas
+        # Sequence order number of loading - index in cache list
+        self.idx = idx
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}(oasfile={self.oasfile!r}, ' \
+            f'oastype={self.oastype}, oasversion={self.oasversion!r}, ' \
+            f'idx={self.idx})'
 
     def reset(self) -> NoReturn:
         """Set default values to all fields."""
@@ -65,8 +131,7 @@ class OpenAPI:
         self.idx = None
 
 
-@dataclass
-class Method:
+class Method(NamedTuple):
     """HTTP method declaration"""
 
     # HTTP method name in uppercase
@@ -78,21 +143,239 @@ class Method:
     # OpenAPI file with the method
     oasfile: str = Parameter.NONE.value
     # Headers for list of fields
-    headers: ClassVar = ['No', 'Method', 'Path', 'OperationId',
-                         'Definition file']
+    headers = ['No', 'Method', 'Path', 'OperationId', 'Definition file']
+
+
+class Change(NamedTuple):
+    """Difference of aligned objects of two OpenAPI documents"""
+
+    # Kind of a change, i.e., added, removed, or changed
+    change: str
+    # Kind of an object, i.e., operation, path, or kind of components
+    kind: str
+    # Name of an object, i.e., HTTP method with path or component name
+    name: str
+    # Object in the old document, None for added one
+    old: Any = None
+    # Object in the new document, None for removed one
+    new: Any = None
+    # Headers for list of fields
+    headers = ['No', 'Change', 'Kind', 'Name']
+
+    @property
+    def list(self) -> List:
+        """Create list from fields for output."""
+        return [self.change, self.kind, self.name]
+
+
+@dataclass
+class SecurityIndex:
+    """Index of security requirements of an OpenAPI document"""
+
+    # Security requirements at root level
+    root: List[Dict] = field(default_factory=list)
+    # Security requirements of operations indexed by path and HTTP method,
+    # None if an operation does not declare them
+    operations: Dict[Tuple[str, str], Optional[List[Dict]]] = \
+        field(default_factory=dict)
+    # Security requirements of callback operations
+    callbacks: List[Dict] = field(default_factory=list)
+
+    @property
+    def schemes(self) -> Set[str]:
+        """Set of security schemes used in all security requirements."""
+        requirements = self.root + self.callbacks
+        for operation in self.operations.values():
+            requirements += operation or []
+        return {scheme for requirement in requirements
+                if isinstance(requirement, dict) for scheme in requirement}
+
+    def effective(self, path_key: str, method_key: str) -> List[Dict]:
+        """Security requirements applied to an operation.
+
+        Arguments
+        ---------
+        path_key
+            Path of an endpoint.
+        method_key
+            HTTP method name of the operation as in the document.
+
+        Returns
+        -------
+        Security requirements of the operation, if it declares them,
+        otherwise root ones.
+
+        """
+        requirements = self.operations.get((path_key, method_key))
+        return self.root if requirements is None else requirements
+
+
+@dataclass
+class RefStat:
+    """Resolution statistics of a reference target"""
+
+    # Reference target with absolute file path
+    target: str = Parameter.NONE.value
+    # Number of resolutions of the target
+    count: int = 0
+    # Cumulative resolution time in seconds including nested references
+    time: float = 0.0
+    # Maximal depth of reference chain, at which the target was resolved
+    depth: int = 0
+    # Headers for list of fields
+    headers: ClassVar = ['No', 'Reference target', 'Count', 'Time [ms]',
+                         'Max depth']
 
     @property
     def list(self) -> List:
         """Create list from fields."""
-        return [self.name, self.path, self.operid, self.oasfile]
+        return [self.target, self.count, round(self.time * 1000, 3),
+                self.depth]
+
+
+@dataclass
+class RefStats:
+    """Instrumentation of reference resolution."""
+    # Statistics of reference targets
+    targets: Dict[str, RefStat] = field(default_factory=dict)
+    # Parsing time of OpenAPI files in seconds
+    files: Dict[str, float] = field(default_factory=dict)
+    # Current depth of reference chain
+    depth: int = 0
+
+    def start(self) -> float:
+        """Mark start of a reference resolution.
+
+        Returns
+        -------
+        Start time of the resolution.
+
+        """
+        self.depth += 1
+        return perf_counter()
+
+    def stop(self, target: str, start: float) -> NoReturn:
+        """Mark end of a reference resolution and register its statistics.
+
+        Arguments
+        ---------
+        target
+            Resolved reference target with absolute file path.
+        start
+            Start time of the resolution returned by the method `start`.
+
+        """
+        stat = self.targets.setdefault(target, RefStat(target=target))
+        stat.count += 1
+        stat.time += perf_counter() - start
+        stat.depth = max(stat.depth, self.depth)
+        self.depth -= 1
+
+    def reg_file(self, openapi_file: str, seconds: float) -> NoReturn:
+        """Register parsing time of an OpenAPI file."""
+        self.files[absolute(openapi_file)] = seconds
+
+
+class ParsedCache:
+    """Parsed contents of OpenAPI files shared across file caches.
+
+    Notes
+    -----
+    - Contents are stored just for reading. Each file cache gets its own
+      copy of a content, so that dereferencing in one cache does not
+      influence the others, while the file is not parsed again.
+    - Contents are identified by the absolute file path and invalidated by
+      modification time and size of the file. Contents of URLs are not
+      stored, since they are revalidated by HTTP instead.
+    - Access is guarded by a lock, so that the cache can be shared by file
+      caches used in various threads.
+
+    """
+
+    def __init__(self):
+        self._contents: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = Lock()
+
+    def __getstate__(self) -> Dict:
+        with self._lock:
+            return {'_contents': dict(self._contents)}
+
+    def __setstate__(self, state: Dict) -> NoReturn:
+        self._contents = state['_contents']
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    @staticmethod
+    def stamp(openapi_file: str) -> Tuple[int, int]:
+        """Compose modification stamp of a file from its time and size."""
+        info = stat(openapi_file)
+        return info.st_mtime_ns, info.st_size
+
+    def get(self, openapi_file: str) -> Optional[Any]:
+        """Retrieve a copy of parsed content of a file.
+
+        Arguments
+        ---------
+        openapi_file
+            Absolute OpenAPI file path.
+
+        Returns
+        -------
+        Copy of parsed content of the file or None, if the file has not been
+        stored, it has been modified since, or it does not exist anymore.
+
+        """
+        with self._lock:
+            item = self._contents.get(openapi_file)
+        try:
+            if item is None or item[0] != self.stamp(openapi_file):
+                return None
+        except OSError:
+            return None
+        return deepcopy(item[1])
+
+    def put(self, openapi_file: str, content: Any) -> NoReturn:
+        """Store a copy of parsed content of a file.
+
+        Arguments
+        ---------
+        openapi_file
+            Absolute OpenAPI file path.
+        content
+            Parsed content of the file.
+
+        """
+        try:
+            item = (self.stamp(openapi_file), deepcopy(content))
+        except OSError:
+            return
+        with self._lock:
+            self._contents[openapi_file] = item
+
 
 @dataclass
 class FileCache:
     """Class with OpenAPI files data shared across modules."""
     records: List[OpenAPI] = field(default_factory=list)
+    # Registered records indexed by absolute file path
+    index: Dict[str, OpenAPI] = field(default_factory=dict, repr=False)
     # Processing mode flags
     dereference_deep: bool = False
     dereference_import: bool = False
+    # Optional instrumentation of reference resolution
+    ref_stats: Optional[RefStats] = None
+    # Resolved reference targets shared across referencing objects
+    resolved: Dict[str, Any] = field(default_factory=dict)
+    # Optional record of contents imported to the root OpenAPI document
+    imports: Optional[List[Tuple[List[str], Any]]] = None
+    # Unresolvable reference targets with files containing them
+    unresolved: Dict[str, str] = field(default_factory=dict)
+    # Optional parsed contents shared with other file caches
+    parsed: Optional[ParsedCache] = field(default=None, repr=False)
+    # Prefetched contents of URLs waiting for loading
+    fetched: Dict[str, bytes] = field(default_factory=dict, repr=False)
 
     @property
     def files(self):
@@ -113,6 +396,7 @@ class FileCache:
           rejected.
         - If file is already registered, the registered record is updated by
           provided record, however, only for defined fields.
+        - Updating the content of a record invalidates resolved references.
         """
         if file_record.oasfile is None:
             return
@@ -123,12 +407,14 @@ class FileCache:
                 record.oastype = file_record.oastype
             if file_record.oas:
                 record.oas = deepcopy(file_record.oas)
+                self.resolved.clear()
         # Create record
         else:
             record = file_record
-            record.oasfile = path.abspath(record.oasfile)
+            record.oasfile = absolute(record.oasfile)
             record.idx = self.files
             self.records.append(record)
+            self.index[record.oasfile] = record
 
     def get_record_by_file(self, openapi_file: str) -> Optional[OpenAPI]:
         """Retrieve OpenAPI file record by file path.
@@ -144,12 +430,8 @@ class FileCache:
 
         """
         # Make absolute file path for sure
-        openapi_file = path.abspath(openapi_file)
-        # Find file and retrieve its record
-        for record in self.records:
-            if record.oasfile == openapi_file:
-                return record
-        return None
+        openapi_file = absolute(openapi_file)
+        return self.index.get(openapi_file)
 
     def get_record_by_index(self, index: int) -> Optional[OpenAPI]:
         """Retrieve OpenAPI file record by index.
@@ -166,10 +448,9 @@ class FileCache:
         """
         # Sanitize index
         index = abs(int(index))
-        # Find file and retrieve its record
-        for record in self.records:
-            if record.idx == index:
-                return record
+        # Records are indexed by their position in cache list
+        if index < self.files:
+            return self.records[index]
         return None
 
     def get_record_first(self) -> Optional[OpenAPI]:
@@ -194,5 +475,40 @@ class FileCache:
         """
         return self.get_record_by_index(len(self.records) - 1)
 
-# Instance of a file cache
-CACHE = FileCache()
+# File cache of the current context, the default one is shared by the process
+_CACHE: ContextVar = ContextVar('CACHE', default=FileCache())
+
+
+def __getattr__(name: str) -> Any:
+    """Provide the file cache of the current context as module attribute."""
+    if name == 'CACHE':
+        return _CACHE.get()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def set_cache(cache: FileCache) -> NoReturn:
+    """Set the file cache of the current context."""
+    _CACHE.set(cache)
+
+
+@contextmanager
+def use_cache(cache: FileCache) -> Iterator[FileCache]:
+    """Activate a file cache in the current context temporarily.
+
+    Arguments
+    ---------
+    cache
+        File cache to be used as the module attribute `CACHE`.
+
+    Notes
+    -----
+    - Each thread has its own context, so that file caches activated
+      in various threads do not influence each other. Threads not activating
+      any file cache share the default one.
+
+    """
+    token = _CACHE.set(cache)
+    try:
+        yield cache
+    finally:
+        _CACHE.reset(token)
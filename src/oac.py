@@ -17,19 +17,27 @@ import click
 
 # Internal modules
 from src.utils.filesystem import load_openapi_file
+from src.utils.reference import load_record
 import src.config as cfg
 import src.commands.paths as paths
 import src.commands.bundle as bundle
 import src.commands.prune as prune
 import src.commands.orphans as orphans
 import src.commands.convert as convert
+import src.commands.refstats as refstats
+import src.commands.security as security
+import src.commands.split as split
+import src.commands.merge as merge
+import src.commands.diff as diff
+import src.commands.breaking as breaking
+import src.commands.validate as validate
+import src.commands.refs as refs
+import src.commands.extract as extract
+import src.commands.run as run
+import src.commands.index as index
+import src.commands.query as query
 
 
-# def get_file(ctx, param, value):
-#     """Callback for piping CLI commands."""
-#     if value or click.get_text_stream('stdin').isatty():
-#         return value
-#     return click.get_text_stream('stdin').read().strip()
 
 @click.group()
 @click.version_option(__version__, prog_name='OpenAPI CLI')
@@ -49,23 +57,70 @@ def oac():
               is_flag=True, default=False,
               help='Deep dereference.')
 @click.option('-f', '--format', 'outformat',
-              type=click.Choice(['yaml', 'json']), required=False,
+              type=click.Choice([fmt.value for fmt in cfg.Format]),
+              required=False,
               help='Forced output format.')
+@click.option('-z', '--compress', 'compression',
+              type=click.Choice([comp.value for comp in cfg.Compression]),
+              required=False,
+              help='Compression of output.')
+@click.option('-m', '--minify', 'minify',
+              is_flag=True, default=False,
+              help='Compact JSON output without whitespace.')
+@click.option('-a', '--aliases', 'aliases',
+              is_flag=True, default=False,
+              help='Repeated subtrees of YAML output once with aliases.')
+@click.option('-b', '--node-budget', 'budget',
+              type=click.IntRange(min=0),
+              default=cfg.Parameter.NODE_BUDGET.value, show_default=True,
+              help='Maximal number of output nodes, 0 for no limit.')
+@click.option('-w', '--warn-budget', 'warn',
+              is_flag=True, default=False,
+              help='Just warn on exceeded node budget.')
+@click.option('--dedupe', 'dedupe',
+              is_flag=True, default=False,
+              help='Merge structurally identical components.')
+@click.option('-p', '--jobs', 'jobs',
+              type=click.IntRange(min=1), default=1,
+              help='Number of worker processes.')
+@click.option('-s', '--shard-by', 'shard',
+              type=click.Choice([shard.value for shard in cfg.Shard]),
+              required=False,
+              help='Write shards of operations to output folder.')
+@click.option('-o', '--output-dir', 'output_dir',
+              type=click.Path(file_okay=False), required=False,
+              help='Output folder for shards.')
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
 @click.version_option(bundle.__version__, prog_name='OpenAPI Bundling')
-def oac_bundle(openapi_file: str, deref: bool, outformat: str) -> NoReturn:
+def oac_bundle(openapi_file: str, deref: bool, outformat: str,
+               compression: str, minify: bool, aliases: bool, budget: int,
+               warn: bool, dedupe: bool, jobs: int, shard: str,
+               output_dir: str, color: bool) -> NoReturn:
     """Bundle OpenAPI file with its referenced ones.
        Output result in input or forced format.
        At deep dereference all internal references are dereferenced too.
+       The output is refused, if it exceeds the node budget.
+       With sharding each shard is written to a file of the output folder.
     """
+    if bool(shard) != bool(output_dir):
+        raise click.UsageError('Sharding requires an output folder!')
     try:
         record = load_openapi_file(openapi_file)
         cfg.CACHE.reg_record(record)
         cfg.CACHE.dereference_import = True
         cfg.CACHE.dereference_deep = deref
         if outformat:
-            outformat = cfg.Format.JSON if outformat == 'json' \
-                else cfg.Format.YAML
-        bundle.bundle(record, outformat)
+            outformat = cfg.Format(outformat)
+        compression = cfg.Compression(compression) if compression else None
+        if shard:
+            bundle.bundle_shards(record, output_dir, cfg.Shard(shard),
+                                 outformat, budget, warn, dedupe, jobs,
+                                 compression, minify, aliases, color)
+        else:
+            bundle.bundle(record, outformat, budget, warn, dedupe, jobs,
+                          compression, minify, aliases)
     except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
         raise click.BadParameter(err)
 
@@ -77,13 +132,25 @@ def oac_bundle(openapi_file: str, deref: bool, outformat: str) -> NoReturn:
 @click.option('-c', 'color',
               is_flag=True, default=False,
               help='Suppress colorized output.')
+@click.option('-s', '--state', 'state_file',
+              type=click.Path(dir_okay=False), required=False,
+              help='State file with reference graph.')
+@click.option('-o', '--output', 'tablefmt',
+              type=click.Choice([fmt.value for fmt in cfg.TableFormat]),
+              default=cfg.TableFormat.TABLE.value, show_default=True,
+              help='Tabular output format.')
 @click.version_option(orphans.__version__, prog_name='OpenAPI Orphans')
-def oac_orphans(openapi_file: str, color: bool) -> NoReturn:
-    """List unreferenced components in OpenAPI file."""
+def oac_orphans(openapi_file: str, color: bool, state_file: str,
+                tablefmt: str) -> NoReturn:
+    """List unreferenced components in OpenAPI file.
+       Reference graph from the state file of the previous run is reused
+       for unchanged parts of the file.
+    """
     try:
         record = load_openapi_file(openapi_file)
         cfg.CACHE.reg_record(record)
-        orphans.orphans(record, color)
+        orphans.orphans(record, color, state_file,
+                        cfg.TableFormat(tablefmt))
     except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
         raise click.BadParameter(err)
 
@@ -95,8 +162,16 @@ def oac_orphans(openapi_file: str, color: bool) -> NoReturn:
 @click.option('-c', 'color',
               is_flag=True, default=False,
               help='Suppress colorized output.')
+@click.option('-p', '--jobs', 'jobs',
+              type=click.IntRange(min=1), default=1,
+              help='Number of worker processes.')
+@click.option('-o', '--output', 'tablefmt',
+              type=click.Choice([fmt.value for fmt in cfg.TableFormat]),
+              default=cfg.TableFormat.TABLE.value, show_default=True,
+              help='Tabular output format.')
 @click.version_option(paths.__version__, prog_name='OpenAPI Paths')
-def oac_paths(openapi_file: str, color: bool) -> NoReturn:
+def oac_paths(openapi_file: str, color: bool, jobs: int,
+              tablefmt: str) -> NoReturn:
     """List HTTP methods from OpenAPI file.
        If there are no referenced files, the definition files are omitted
        in the output.
@@ -104,7 +179,7 @@ def oac_paths(openapi_file: str, color: bool) -> NoReturn:
     try:
         record = load_openapi_file(openapi_file)
         cfg.CACHE.reg_record(record)
-        paths.paths(record, color)
+        paths.paths(record, color, jobs, cfg.TableFormat(tablefmt))
     except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
         raise click.BadParameter(err)
 
@@ -114,23 +189,37 @@ def oac_paths(openapi_file: str, color: bool) -> NoReturn:
                 type=click.Path(exists=True),
                 )
 @click.option('-f', '--format', 'outformat',
-              type=click.Choice(['yaml', 'json']), required=False,
+              type=click.Choice([fmt.value for fmt in cfg.Format]),
+              required=False,
               help='Forced output format.')
+@click.option('-z', '--compress', 'compression',
+              type=click.Choice([comp.value for comp in cfg.Compression]),
+              required=False,
+              help='Compression of output.')
+@click.option('-m', '--minify', 'minify',
+              is_flag=True, default=False,
+              help='Compact JSON output without whitespace.')
+@click.option('-s', '--state', 'state_file',
+              type=click.Path(dir_okay=False), required=False,
+              help='State file with reference graph.')
 @click.version_option(prune.__version__, prog_name='OpenAPI Pruning')
-def oac_prune(openapi_file: str, outformat: str) -> NoReturn:
+def oac_prune(openapi_file: str, outformat: str, compression: str,
+              minify: bool, state_file: str) -> NoReturn:
     """Cleanup OpenAPI file.
        Output result in original or forced format.
 
        All unreferenced components (in schemas, securitySchemes, parameters,
        headers, requestBodies, responses, ...) are removed from the result.
+       Reference graph from the state file of the previous run is reused
+       for unchanged parts of the file.
     """
     try:
         record = load_openapi_file(openapi_file)
         cfg.CACHE.reg_record(record)
         if outformat:
-            outformat = cfg.Format.JSON if outformat == 'json' \
-                else cfg.Format.YAML
-        prune.prune(record, outformat)
+            outformat = cfg.Format(outformat)
+        compression = cfg.Compression(compression) if compression else None
+        prune.prune(record, outformat, state_file, compression, minify)
     except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
         raise click.BadParameter(err)
 
@@ -140,24 +229,479 @@ def oac_prune(openapi_file: str, outformat: str) -> NoReturn:
                 type=click.Path(exists=True),
                 )
 @click.option('-f', '--format', 'outformat',
-              type=click.Choice(['yaml', 'json']), required=False,
+              type=click.Choice([fmt.value for fmt in cfg.Format]),
+              required=False,
               help='Forced output format.')
+@click.option('-z', '--compress', 'compression',
+              type=click.Choice([comp.value for comp in cfg.Compression]),
+              required=False,
+              help='Compression of output.')
+@click.option('-m', '--minify', 'minify',
+              is_flag=True, default=False,
+              help='Compact JSON output without whitespace.')
+@click.option('-s', '--stream', 'streaming',
+              is_flag=True, default=False,
+              help='Convert between YAML and JSON without loading content.')
 @click.version_option(convert.__version__, prog_name='OpenAPI Convert')
-def oac_convert(openapi_file: str, outformat: str) -> NoReturn:
+def oac_convert(openapi_file: str, outformat: str, compression: str,
+                minify: bool, streaming: bool) -> NoReturn:
     """Convert OpenAPI file.
        Output result is in opposite format between YAML and JSON
        or in forced format.
     """
+    try:
+        if outformat:
+            outformat = cfg.Format(outformat)
+        compression = cfg.Compression(compression) if compression else None
+        if streaming:
+            convert.stream(openapi_file, outformat, compression, minify)
+            return
+        record = load_openapi_file(openapi_file)
+        cfg.CACHE.reg_record(record)
+        convert.convert(record, outformat, compression, minify)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+
+
+@oac.command('refstats')
+@click.argument('openapi_file', required=True,
+                type=click.Path(exists=True),
+                )
+@click.option('-d', '--dereference', 'deref',
+              is_flag=True, default=False,
+              help='Deep dereference.')
+@click.option('-j', '--json', 'jsonout',
+              is_flag=True, default=False,
+              help='Output statistics in JSON format.')
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
+@click.version_option(refstats.__version__,
+                      prog_name='OpenAPI Reference Statistics')
+def oac_refstats(openapi_file: str, deref: bool, jsonout: bool,
+                 color: bool) -> NoReturn:
+    """List reference resolution statistics of OpenAPI file.
+       Resolution counts, times, and chain depths of reference targets
+       and parsing times of definition files are output.
+    """
+    try:
+        cfg.CACHE.ref_stats = cfg.RefStats()
+        record = load_record(openapi_file)
+        cfg.CACHE.dereference_import = True
+        cfg.CACHE.dereference_deep = deref
+        refstats.refstats(record, color, jsonout)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+
+
+@oac.command('security')
+@click.argument('openapi_file', required=True,
+                type=click.Path(exists=True),
+                )
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
+@click.version_option(security.__version__, prog_name='OpenAPI Security')
+def oac_security(openapi_file: str, color: bool) -> NoReturn:
+    """List security requirements of operations from OpenAPI file.
+       Root security requirements are output for operations without
+       their own ones.
+    """
+    try:
+        record = load_openapi_file(openapi_file)
+        cfg.CACHE.reg_record(record)
+        security.security(record, color)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+
+
+@oac.command('split')
+@click.argument('openapi_file', required=True,
+                type=click.Path(exists=True),
+                )
+@click.argument('output_dir', required=True,
+                type=click.Path(file_okay=False),
+                )
+@click.option('-f', '--format', 'outformat',
+              type=click.Choice([fmt.value for fmt in cfg.Format]),
+              required=False,
+              help='Forced output format.')
+@click.option('-p', '--jobs', 'jobs',
+              type=click.IntRange(min=1), required=False,
+              help='Number of writing threads.')
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
+@click.version_option(split.__version__, prog_name='OpenAPI Splitting')
+def oac_split(openapi_file: str, output_dir: str, outformat: str, jobs: int,
+              color: bool) -> NoReturn:
+    """Split OpenAPI file to separate files of components and path items.
+       Split files are written to the output folder in input or forced
+       format.
+    """
+    try:
+        record = load_openapi_file(openapi_file)
+        cfg.CACHE.reg_record(record)
+        cfg.CACHE.dereference_import = True
+        if outformat:
+            outformat = cfg.Format(outformat)
+        split.split(record, output_dir, outformat, jobs, color)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+
+
+@oac.command('merge')
+@click.argument('openapi_files', required=True, nargs=-1,
+                type=click.Path(exists=True),
+                )
+@click.option('-f', '--format', 'outformat',
+              type=click.Choice([fmt.value for fmt in cfg.Format]),
+              required=False,
+              help='Forced output format.')
+@click.option('-z', '--compress', 'compression',
+              type=click.Choice([comp.value for comp in cfg.Compression]),
+              required=False,
+              help='Compression of output.')
+@click.option('-m', '--minify', 'minify',
+              is_flag=True, default=False,
+              help='Compact JSON output without whitespace.')
+@click.option('-k', '--keep-first', 'keep_first',
+              is_flag=True, default=False,
+              help='Just warn on conflicts and keep first definitions.')
+@click.version_option(merge.__version__, prog_name='OpenAPI Merging')
+def oac_merge(openapi_files: str, outformat: str, compression: str,
+              minify: bool, keep_first: bool) -> NoReturn:
+    """Merge OpenAPI files to single one.
+       Output result in format of the first file or forced format.
+       The output is refused, if paths or components are defined differently.
+    """
+    try:
+        if outformat:
+            outformat = cfg.Format(outformat)
+        compression = cfg.Compression(compression) if compression else None
+        merge.merge(openapi_files, outformat, keep_first, compression,
+                    minify)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+
+
+@oac.command('diff')
+@click.argument('old_file', required=True,
+                type=click.Path(exists=True),
+                )
+@click.argument('new_file', required=True,
+                type=click.Path(exists=True),
+                )
+@click.option('-j', '--json', 'jsonout',
+              is_flag=True, default=False,
+              help='Output differences in JSON format.')
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
+@click.version_option(diff.__version__, prog_name='OpenAPI Differences')
+def oac_diff(old_file: str, new_file: str, jsonout: bool,
+             color: bool) -> NoReturn:
+    """List differences of two OpenAPI files.
+       Added, removed, and changed operations, path items, and components
+       are output.
+    """
+    try:
+        diff.diff(old_file, new_file, color, jsonout)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+
+
+@oac.command('breaking')
+@click.argument('openapi_files', required=True, nargs=-1,
+                type=click.Path(exists=True),
+                )
+@click.option('-j', '--json', 'jsonout',
+              is_flag=True, default=False,
+              help='Output breaking changes in JSON format.')
+@click.option('-p', '--jobs', 'jobs',
+              type=click.IntRange(min=1), default=1,
+              help='Number of worker processes.')
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
+@click.version_option(breaking.__version__,
+                      prog_name='OpenAPI Breaking Changes')
+def oac_breaking(openapi_files: str, jsonout: bool, jobs: int,
+                 color: bool) -> NoReturn:
+    """List breaking changes between pairs of old and new OpenAPI files.
+       Files are provided as pairs of old and new file one after another.
+       Exit with status 1, if there are breaking changes.
+    """
+    if len(openapi_files) % 2:
+        raise click.BadParameter('Files have to be provided in pairs!')
+    pairs = list(zip(openapi_files[::2], openapi_files[1::2]))
+    try:
+        count = breaking.breaking(pairs, color, jsonout, jobs)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+    if count:
+        click.get_current_context().exit(1)
+
+
+@oac.command('validate')
+@click.argument('openapi_file', required=True,
+                type=click.Path(exists=True),
+                )
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
+@click.version_option(validate.__version__, prog_name='OpenAPI Validation')
+def oac_validate(openapi_file: str, color: bool) -> NoReturn:
+    """Validate structure of OpenAPI file and its references.
+       Exit with status 1, if there are structural errors.
+    """
+    try:
+        record = load_openapi_file(openapi_file)
+        cfg.CACHE.reg_record(record)
+        count = validate.validate(record, color)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+    if count:
+        click.get_current_context().exit(1)
+
+
+@oac.command('refs')
+@click.argument('openapi_file', required=True,
+                type=click.Path(exists=True),
+                )
+@click.option('--check', 'check',
+              is_flag=True, default=False,
+              help='List only dangling, cross-file, and circular references.')
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
+@click.version_option(refs.__version__, prog_name='OpenAPI References')
+def oac_refs(openapi_file: str, check: bool, color: bool) -> NoReturn:
+    """List references of OpenAPI file and its referenced files.
+       At checking, exit with status 1, if there are dangling or circular
+       references.
+    """
     try:
         record = load_openapi_file(openapi_file)
         cfg.CACHE.reg_record(record)
+        count = refs.refs(record, color, check)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+    if check and count:
+        click.get_current_context().exit(1)
+
+
+@oac.command('extract')
+@click.argument('openapi_file', required=True,
+                type=click.Path(exists=True),
+                )
+@click.option('-t', '--tag', 'tags',
+              multiple=True,
+              help='Tag of selected operations.')
+@click.option('-a', '--path', 'paths',
+              multiple=True,
+              help='Path of selected operations.')
+@click.option('-i', '--operation-id', 'operation_ids',
+              multiple=True,
+              help='Identifier of a selected operation.')
+@click.option('-f', '--format', 'outformat',
+              type=click.Choice([fmt.value for fmt in cfg.Format]),
+              required=False,
+              help='Forced output format.')
+@click.option('-z', '--compress', 'compression',
+              type=click.Choice([comp.value for comp in cfg.Compression]),
+              required=False,
+              help='Compression of output.')
+@click.option('-m', '--minify', 'minify',
+              is_flag=True, default=False,
+              help='Compact JSON output without whitespace.')
+@click.version_option(extract.__version__, prog_name='OpenAPI Extraction')
+def oac_extract(openapi_file: str, tags: str, paths: str,
+                operation_ids: str, outformat: str, compression: str,
+                minify: bool) -> NoReturn:
+    """Extract selected operations from OpenAPI file.
+       Output minimal OpenAPI document with selected operations and
+       components reachable from them in input or forced format.
+       Each option can be repeated, an operation matching any of them
+       is selected.
+    """
+    if not (tags or paths or operation_ids):
+        raise click.UsageError('No selection of operations provided!')
+    try:
+        record = load_openapi_file(openapi_file)
+        cfg.CACHE.reg_record(record)
+        cfg.CACHE.dereference_import = True
         if outformat:
-            outformat = cfg.Format.JSON if outformat == 'json' \
-                else cfg.Format.YAML
-        convert.convert(record, outformat)
+            outformat = cfg.Format(outformat)
+        compression = cfg.Compression(compression) if compression else None
+        extract.extract(record, tags, paths, operation_ids, outformat,
+                        compression, minify)
     except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
         raise click.BadParameter(err)
 
 
+@oac.command('index')
+@click.argument('db_file', required=True,
+                type=click.Path(dir_okay=False),
+                )
+@click.argument('openapi_files', required=True, nargs=-1,
+                type=click.Path(exists=True, dir_okay=False),
+                )
+@click.option('-p', '--jobs', 'jobs',
+              type=click.IntRange(min=1), default=1,
+              help='Number of worker processes.')
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
+@click.version_option(index.__version__, prog_name='OpenAPI Index')
+def oac_index(db_file: str, openapi_files: str, jobs: int,
+              color: bool) -> NoReturn:
+    """Index OpenAPI files to SQLite database.
+       Operations, components, references, and security requirements are
+       stored. Only changed files are indexed again.
+       Exit with status 1, if some files failed to be indexed.
+    """
+    try:
+        count = index.index(db_file, openapi_files, jobs, color)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+    if count:
+        click.get_current_context().exit(1)
+
+
+@oac.command('query')
+@click.argument('db_file', required=True,
+                type=click.Path(exists=True, dir_okay=False),
+                )
+@click.option('-u', '--uses', 'component',
+              help='Operations using component, e.g., schemas/Pet.')
+@click.option('-n', '--unsecured', 'unsecured',
+              is_flag=True, default=False,
+              help='Operations without security.')
+@click.option('-t', '--tag', 'tag',
+              help='Operations with tag.')
+@click.option('--unused', 'unused',
+              is_flag=True, default=False,
+              help='Unreferenced components.')
+@click.option('-q', '--sql', 'sql',
+              help='Read-only SQL query.')
+@click.option('-c', 'color',
+              is_flag=True, default=False,
+              help='Suppress colorized output.')
+@click.option('-o', '--output', 'tablefmt',
+              type=click.Choice([fmt.value for fmt in cfg.TableFormat]),
+              default=cfg.TableFormat.TABLE.value, show_default=True,
+              help='Tabular output format.')
+@click.version_option(query.__version__, prog_name='OpenAPI Query')
+def oac_query(db_file: str, component: str, unsecured: bool, tag: str,
+              unused: bool, sql: str, color: bool, tablefmt: str) -> NoReturn:
+    """Query index of OpenAPI files.
+       Exactly one question has to be provided.
+    """
+    questions = {'uses': component, 'unsecured': unsecured, 'tag': tag,
+                 'unused': unused, 'sql': sql}
+    asked = [question for question, value in questions.items() if value]
+    if len(asked) != 1:
+        raise click.UsageError('Exactly one question has to be provided!')
+    question = asked[0]
+    try:
+        if question == 'sql':
+            query.query(db_file, sql=sql, color=color,
+                        tablefmt=cfg.TableFormat(tablefmt))
+        else:
+            query.query(db_file, question, questions[question], color=color,
+                        tablefmt=cfg.TableFormat(tablefmt))
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+
+
+@oac.group('run', chain=True)
+@click.argument('openapi_file', required=True,
+                type=click.Path(exists=True),
+                )
+@click.option('-z', '--compress', 'compression',
+              type=click.Choice([comp.value for comp in cfg.Compression]),
+              required=False,
+              help='Compression of output.')
+@click.option('-m', '--minify', 'minify',
+              is_flag=True, default=False,
+              help='Compact JSON output without whitespace.')
+@click.version_option(run.__version__, prog_name='OpenAPI Run')
+def oac_run(openapi_file: str, compression: str, minify: bool) -> NoReturn:
+    """Run chain of commands on OpenAPI file.
+       Commands are processed in order on the same parsed document
+       and only the final result is output in input or converted format.
+    """
+
+
+@oac_run.result_callback()
+def run_steps(steps: list, openapi_file: str, compression: str,
+              minify: bool) -> NoReturn:
+    """Process the chain of commands."""
+    try:
+        record = load_openapi_file(openapi_file)
+        cfg.CACHE.reg_record(record)
+        compression = cfg.Compression(compression) if compression else None
+        run.run(record, steps, compression, minify)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        raise click.BadParameter(err)
+
+
+@oac_run.command('bundle')
+@click.option('-d', '--dereference', 'deref',
+              is_flag=True, default=False,
+              help='Deep dereference.')
+@click.option('-b', '--node-budget', 'budget',
+              type=click.IntRange(min=0),
+              default=cfg.Parameter.NODE_BUDGET.value, show_default=True,
+              help='Maximal number of output nodes, 0 for no limit.')
+@click.option('-w', '--warn-budget', 'warn',
+              is_flag=True, default=False,
+              help='Just warn on exceeded node budget.')
+@click.option('--dedupe', 'dedupe',
+              is_flag=True, default=False,
+              help='Merge structurally identical components.')
+@click.option('-p', '--jobs', 'jobs',
+              type=click.IntRange(min=1), default=1,
+              help='Number of worker processes.')
+def run_bundle(deref: bool, budget: int, warn: bool, dedupe: bool,
+               jobs: int) -> run.Step:
+    """Bundle document with its referenced files."""
+    return run.bundle_step(deref, budget, warn, dedupe, jobs)
+
+
+@oac_run.command('prune')
+def run_prune() -> run.Step:
+    """Remove unused components from document."""
+    return run.prune_step()
+
+
+@oac_run.command('extract')
+@click.option('-t', '--tag', 'tags',
+              multiple=True,
+              help='Tag of selected operations.')
+@click.option('-a', '--path', 'paths',
+              multiple=True,
+              help='Path of selected operations.')
+@click.option('-i', '--operation-id', 'operation_ids',
+              multiple=True,
+              help='Identifier of a selected operation.')
+def run_extract(tags: str, paths: str, operation_ids: str) -> run.Step:
+    """Extract selected operations from document."""
+    if not (tags or paths or operation_ids):
+        raise click.UsageError('No selection of operations provided!')
+    return run.extract_step(tags, paths, operation_ids)
+
+
+@oac_run.command('convert')
+@click.option('-f', '--format', 'outformat',
+              type=click.Choice([fmt.value for fmt in cfg.Format]),
+              required=False,
+              help='Forced output format.')
+def run_convert(outformat: str) -> run.Step:
+    """Convert document to opposite or forced format."""
+    return run.convert_step(cfg.Format(outformat) if outformat else None)
+
+
 if __name__ == '__main__':
     oac()
@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+"""Module with library interface for processing OpenAPI files in sessions."""
+__version__ = '0.2.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from contextlib import contextmanager
+from threading import Lock
+from typing import Dict, Iterator, List, Tuple, Union
+
+# Third party modules
+
+# Internal modules
+import src.config as cfg
+import src.utils.graph as graph
+import src.utils.reference as ref
+from src.utils.compare import compare
+from src.utils.validation import validate as validate_record
+from src.utils.output import serialize
+import src.commands.bundle as bundle
+import src.commands.prune as prune
+import src.commands.extract as extract
+import src.commands.breaking as breaking
+
+
+class Session:
+    """Processing of OpenAPI files with own file caches and options.
+
+    Arguments
+    ---------
+    deref
+        Flag about deep dereference at bundling and extraction.
+    jobs
+        Number of worker processes for dereferencing path items.
+    parsed
+        Parsed contents of OpenAPI files shared with other sessions.
+        The session creates its own one by default.
+
+    Notes
+    -----
+    - Each call processes files in a new file cache activated just in
+      the calling thread, so that sessions as well as calls of the same
+      session can run concurrently in threads without influencing each other.
+    - Files are parsed once per session or per all sessions sharing parsed
+      contents, while each call gets its own copy of them for dereferencing.
+    - Methods return results instead of printing them.
+
+    """
+
+    def __init__(self, deref: bool = False, jobs: int = 1,
+                 parsed: cfg.ParsedCache = None):
+        self.deref = deref
+        self.jobs = jobs
+        self.parsed = cfg.ParsedCache() if parsed is None else parsed
+        # Unresolvable reference targets with files containing them
+        self.unresolved: Dict[str, str] = {}
+        self._lock = Lock()
+
+    @contextmanager
+    def activate(self, dereference_import: bool = False) \
+            -> Iterator[cfg.FileCache]:
+        """Activate a new file cache of the session in the current thread.
+
+        Arguments
+        ---------
+        dereference_import
+            Flag about importing referenced contents to the root document.
+
+        Notes
+        -----
+        - Unresolvable references of the cache are collected by the session
+          afterwards.
+
+        """
+        cache = cfg.FileCache(dereference_deep=self.deref,
+                              dereference_import=dereference_import,
+                              parsed=self.parsed)
+        try:
+            with cfg.use_cache(cache):
+                yield cache
+        finally:
+            with self._lock:
+                self.unresolved.update(cache.unresolved)
+
+    @staticmethod
+    def load(openapi_file: str) -> cfg.OpenAPI:
+        """Load OpenAPI file as the root record of the active file cache."""
+        return cfg.CACHE.get_record_by_file(openapi_file) \
+            or ref.load_record(openapi_file)
+
+    def bundle(self, openapi_file: str, dedupe: bool = False,
+               budget: int = None) -> Dict:
+        """Bundle OpenAPI file with its referenced ones.
+
+        Arguments
+        ---------
+        openapi_file
+            Path of an OpenAPI file.
+        dedupe
+            Flag about merging structurally identical components.
+        budget
+            Maximal number of nodes of the serialized content. Zero or None
+            means no limit.
+
+        Returns
+        -------
+        Bundled OpenAPI content.
+
+        Raises
+        ------
+        click.ClickException
+            Serialized content would exceed the budget of nodes.
+
+        """
+        with self.activate(dereference_import=True):
+            record = self.load(openapi_file)
+            return bundle.bundle_content(record, budget, False, dedupe,
+                                         self.jobs)
+
+    def prune(self, openapi_file: str) -> Dict:
+        """Remove unused components from OpenAPI file content.
+
+        Arguments
+        ---------
+        openapi_file
+            Path of an OpenAPI file.
+
+        Returns
+        -------
+        Pruned OpenAPI content.
+
+        """
+        with self.activate():
+            return prune.prune_content(self.load(openapi_file))
+
+    def extract(self, openapi_file: str, tags: List[str] = None,
+                paths: List[str] = None,
+                operation_ids: List[str] = None) -> Dict:
+        """Extract minimal OpenAPI content with selected operations.
+
+        Arguments
+        ---------
+        openapi_file
+            Path of an OpenAPI file.
+        tags
+            List of tags of selected operations.
+        paths
+            List of paths of selected operations.
+        operation_ids
+            List of identifiers of selected operations.
+
+        Returns
+        -------
+        Extracted OpenAPI content.
+
+        Raises
+        ------
+        ValueError
+            No operation has been selected.
+
+        """
+        select = extract.selector(tags, paths, operation_ids)
+        with self.activate(dereference_import=True):
+            return extract.extract_content(self.load(openapi_file), select)
+
+    def validate(self, openapi_file: str) -> List[Tuple[str, str]]:
+        """Validate structure of OpenAPI file and its references.
+
+        Arguments
+        ---------
+        openapi_file
+            Path of an OpenAPI file.
+
+        Returns
+        -------
+        List of errors with their location and message.
+
+        """
+        with self.activate():
+            return validate_record(self.load(openapi_file))
+
+    def references(self, openapi_file: str) \
+            -> List[Tuple[str, str, str, bool]]:
+        """Check references of OpenAPI file and its referenced files.
+
+        Arguments
+        ---------
+        openapi_file
+            Path of an OpenAPI file.
+
+        Returns
+        -------
+        List of references with absolute location, reference value,
+        error message of dangling reference or None, and flag about
+        circular reference.
+
+        """
+        with self.activate():
+            references, failed = \
+                graph.index_references(self.load(openapi_file))
+            results = graph.resolve_references(references, failed)
+            circular = graph.circular_references(references)
+        return [(location, value, results[target], idx in circular)
+                for idx, (location, value, target) in enumerate(references)]
+
+    def diff(self, old_file: str, new_file: str) -> List[cfg.Change]:
+        """List differences of two OpenAPI files.
+
+        Arguments
+        ---------
+        old_file
+            Path of the old OpenAPI file.
+        new_file
+            Path of the new OpenAPI file.
+
+        Returns
+        -------
+        List of added, removed, and changed objects.
+
+        """
+        with self.activate():
+            _, old = ref.bundle_file(old_file)
+            _, new = ref.bundle_file(new_file)
+        return compare(old, new)
+
+    def breaking(self, old_file: str, new_file: str) -> List[List[str]]:
+        """List breaking changes between old and new OpenAPI file.
+
+        Arguments
+        ---------
+        old_file
+            Path of the old OpenAPI file.
+        new_file
+            Path of the new OpenAPI file.
+
+        Returns
+        -------
+        List of breaking changes with kind and name of a changed object and
+        the reason.
+
+        """
+        with self.activate():
+            return breaking.check_pair((old_file, new_file))
+
+    @staticmethod
+    def serialize(content: Dict, outformat: cfg.Format = cfg.Format.YAML,
+                  minify: bool = False,
+                  aliases: bool = False) -> Union[str, bytes]:
+        """Serialize OpenAPI content to required format.
+
+        Arguments
+        ---------
+        content
+            OpenAPI content, e.g., returned by other methods.
+        outformat
+            Enumeration member of an requested OpenAPI content format.
+        minify
+            Flag about compact JSON output without indentation and whitespace.
+        aliases
+            Flag about writing repeated subtrees of YAML output just once with
+            anchors and aliases.
+
+        Returns
+        -------
+        Serialized OpenAPI content, bytes for binary formats.
+
+        """
+        return serialize(content, outformat, minify, aliases)
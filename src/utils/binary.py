@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+"""Module for binary serialization of OpenAPI content."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import io
+import pickle
+from importlib import import_module
+from types import ModuleType
+from typing import Any
+
+# Third party modules
+
+# Internal modules
+from src.config import Format
+
+# Optional packages for binary formats
+PACKAGES = {
+    Format.MSGPACK: ('msgpack', 'msgpack'),
+    Format.CBOR: ('cbor2', 'cbor2'),
+}
+
+
+class SafeUnpickler(pickle.Unpickler):
+    """Unpickler restricted to built-in data types of OpenAPI content."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f'Global "{module}.{name}" is forbidden!')
+
+
+def require(binformat: Format) -> ModuleType:
+    """Import an optional package for a binary format.
+
+    Arguments
+    ---------
+    binformat
+        Enumeration member of a binary format.
+
+    Returns
+    -------
+    Imported package module.
+
+    Raises
+    ------
+    ValueError
+        The package is not installed.
+
+    """
+    module_name, package = PACKAGES[binformat]
+    try:
+        return import_module(module_name)
+    except ImportError:
+        errmsg = f'Format "{binformat.value}" requires the package' \
+            f' "{package}" to be installed!'
+        raise ValueError(errmsg) from None
+
+
+def dumps(content: Any, binformat: Format) -> bytes:
+    """Serialize content to a binary format.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content to be serialized.
+    binformat
+        Enumeration member of a binary format.
+
+    Returns
+    -------
+    Serialized content.
+
+    Notes
+    -----
+    - Pickle keeps subtrees shared in memory, e.g., at deep dereference,
+      shared in the serialized content as well, while the other formats
+      expand them.
+
+    """
+    if binformat is Format.PICKLE:
+        return pickle.dumps(content, protocol=4)
+    if binformat is Format.MSGPACK:
+        return require(binformat).packb(content, use_bin_type=True)
+    return require(binformat).dumps(content)
+
+
+def loads(data: bytes, binformat: Format) -> Any:
+    """Deserialize content from a binary format.
+
+    Arguments
+    ---------
+    data
+        Serialized content.
+    binformat
+        Enumeration member of a binary format.
+
+    Returns
+    -------
+    OpenAPI content.
+
+    Raises
+    ------
+    SyntaxError
+        Data is not valid for the format.
+
+    Notes
+    -----
+    - Pickled data is restricted to built-in data types, so that loading
+      a file cannot execute any code.
+
+    """
+    module = require(binformat) if binformat in PACKAGES else None
+    try:
+        if binformat is Format.PICKLE:
+            return SafeUnpickler(io.BytesIO(data)).load()
+        if binformat is Format.MSGPACK:
+            return module.unpackb(data, raw=False, strict_map_key=False)
+        return module.loads(data)
+    except Exception as err:  # pylint: disable=broad-except
+        errmsg = f'Invalid {binformat.value} data: {err}'
+        raise SyntaxError(errmsg) from None
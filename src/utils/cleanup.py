@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for cleaning OpenAPI content."""
-__version__ = '0.3.0'
+__version__ = '0.4.0'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -10,51 +10,69 @@ __maintainer__ = __author__
 __email__ = 'libor.gabaj@gmail.com'
 
 # Standard library modules
-from typing import Tuple, List, Dict
+from typing import Any, Tuple, List, Dict
 
 # Third party modules
 
 # Internal modules
 from src.config import Parameter
 import src.utils.reference as ref
+from src.utils.digest import digest
+import src.utils.graph as graph
 
 
-def remove_empty_objects(content: Dict) -> Dict:
+def remove_empty_objects(content: Dict, memo: Dict[int, Any] = None) -> Dict:
     """Remove dictionary keys with empty values.
 
     Arguments
     ---------
     content
         OpenAPI document to be cleaned up.
+    memo
+        Dictionary of already cleaned up dictionaries and lists indexed by
+        identity of their originals.
 
     Returns
     -------
     OpenAPI document without empty properties.
 
+    Notes
+    -----
+    - Dictionaries and lists are rebuilt from their cleaned up items in one
+      pass, so that properties becoming empty by the cleanup are removed too.
+    - Empty lists are removed from lists as well.
+    - Subtrees shared by several objects are cleaned up once and remain
+      shared in the result.
+
     """
+    if not isinstance(content, (dict, list)):
+        return content
+    if memo is None:
+        memo = {}
+    if id(content) in memo:
+        return memo[id(content)]
     if isinstance(content, list):
-        for key, value in enumerate(content):
-            ref_content = remove_empty_objects(value)
-            if isinstance(ref_content, list) and not ref_content:
-                del content[key]
-            else:
-                content[key] = ref_content
-    if isinstance(content, dict):
-        for key in list(content.keys()):
-            if isinstance(content[key], dict) and not content[key]:
-                del content[key]
-            elif isinstance(content[key], list) and not content[key]:
-                del content[key]
+        result = []
+        memo[id(content)] = result
+        for value in content:
+            value = remove_empty_objects(value, memo)
+            if not (isinstance(value, list) and not value):
+                result.append(value)
+    else:
+        result = {}
+        memo[id(content)] = result
+        for key, value in content.items():
             # Security basic authorization should be empty naturally
-            elif key == 'security':
-                continue
-            else:
-                content[key] = remove_empty_objects(content[key])
-    return content
+            if key != 'security':
+                value = remove_empty_objects(value, memo)
+            if not (isinstance(value, (dict, list)) and not value):
+                result[key] = value
+    return result
 
 
-def remove_unused_components(content: Dict) -> Tuple[Dict,
-                                                     List[str], List[str]]:
+def remove_unused_components(content: Dict, state: Dict = None,
+                             files: Dict[str, str] = None) \
+    -> Tuple[Dict, List[str], List[str]]:
     """Remove unreferenced properties in content's components' properties,
     i.e., at the second level.
 
@@ -62,38 +80,44 @@ def remove_unused_components(content: Dict) -> Tuple[Dict,
     ---------
     content
         OpenAPI content to be cleaned up.
+    state
+        State of the previous run with reference graph, which is updated
+        by the current run.
+    files
+        Hashes of OpenAPI files, from which the content originates,
+        indexed by their paths.
 
     Returns
     -------
     Tuple with OpenAPI content without orphan objects in components object
     and lists of removed references and secury schemes.
 
+    Notes
+    -----
+    - Components not reachable by references from outside the components
+      object are removed, including the ones referenced just mutually.
+
     """
     removed_references = []
     key_section = 'components'
     # Provided content has components object
     if key_section in content and isinstance(content[key_section], dict):
-        # Iteratively cleanup components' properties
-        while True:
-            removed_count = len(removed_references)
-            for comps_prop in list(content[key_section].keys()):
-                if comps_prop == 'securitySchemes':
-                    continue
-                # Remove not referenced subproperties
-                target = content[key_section][comps_prop]
-                for key in list(target.keys()):
-                    reference = ref.concat([key_section, comps_prop, key])
-                    if not ref.find(content, reference):
-                        del target[key]
-                        removed_references.append(reference)
-                # Remove empty property (with all unreferenced subproperties)
-                if not target:
-                    del content[key_section][comps_prop]
-                    removed_references.append(ref.concat([key_section,
-                                                          comps_prop]))
-            # Stop iteration if nothing has been removed
-            if removed_count == len(removed_references):
-                break
+        reachable = graph.reachable_components(content, state, files)
+        for comps_prop in list(content[key_section].keys()):
+            target = content[key_section][comps_prop]
+            if comps_prop == 'securitySchemes' or not isinstance(target, dict):
+                continue
+            # Remove not referenced subproperties
+            for key in list(target.keys()):
+                reference = ref.concat([key_section, comps_prop, key])
+                if reference not in reachable:
+                    del target[key]
+                    removed_references.append(reference)
+            # Remove empty property (with all unreferenced subproperties)
+            if not target:
+                del content[key_section][comps_prop]
+                removed_references.append(ref.concat([key_section,
+                                                      comps_prop]))
     removed_references.sort()
     content, removed_schemes = remove_unused_securities(content)
     return content, removed_references, removed_schemes
@@ -116,6 +140,8 @@ def remove_unused_securities(content: Dict) -> Tuple[Dict, List[str]]:
     Notes
     -----
     - Only "components/securitySchemes" is cleaned up.
+    - Used security schemes are taken from the index of security requirements
+      at root and operation level built in one pass.
 
     """
     removed_schemes = []
@@ -125,9 +151,10 @@ def remove_unused_securities(content: Dict) -> Tuple[Dict, List[str]]:
     if key_components in content and key_schemes in content[key_components] \
         and isinstance(content[key_components][key_schemes], dict):
         target = content[key_components][key_schemes]
+        used_schemes = ref.index_security(content).schemes
         for scheme in list(target.keys()):
             # Remove not referenced schemes
-            if not ref.find_security(content, scheme):
+            if scheme not in used_schemes:
                 del target[scheme]
                 removed_schemes.append(ref.concat(
                     [key_components, key_schemes, scheme]))
@@ -140,6 +167,80 @@ def remove_unused_securities(content: Dict) -> Tuple[Dict, List[str]]:
     return content, removed_schemes
 
 
+def dedupe_components(content: Dict) -> Tuple[Dict, Dict[str, str]]:
+    """Merge structurally identical components in content's components'
+    properties.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content to be cleaned up.
+
+    Returns
+    -------
+    Tuple with OpenAPI content without duplicate components and mapping of
+    removed references to the retained ones.
+
+    Notes
+    -----
+    - Components are compared by their structural hashes computed bottom-up
+      in one pass over the components object.
+    - Components are compared with discriminator mapping targets rewritten
+      as well, as they are references.
+    - From each group of identical components within the same components'
+      property the first one is retained and all references to the others
+      are rewritten to it.
+    - Rewritten references can make other components identical, so that
+      merging repeats until no duplicates are found. Just the components
+      with rewritten references are hashed again in the next round.
+    - Security schemes are not merged, because they are not referenced.
+
+    """
+    merged_references = {}
+    key_section = 'components'
+    # Provided content has components object
+    if key_section not in content \
+        or not isinstance(content[key_section], dict):
+        return content, merged_references
+    memo = {}
+    hashes = {}
+    refs = {}
+    while True:
+        references = {}
+        for comps_prop, target in content[key_section].items():
+            if comps_prop == 'securitySchemes' or not isinstance(target, dict):
+                continue
+            retained = {}
+            for key in list(target.keys()):
+                node = ref.concat([key_section, comps_prop, key])
+                # Hash only new components or the ones changed by rewriting
+                if node not in hashes:
+                    hashes[node] = digest(target[key], memo)
+                    refs[node] = graph.collect_refs(target[key])
+                hashed = hashes[node]
+                if hashed in retained:
+                    references[node] = ref.concat(
+                        [key_section, comps_prop, retained[hashed]])
+                    del target[key]
+                    del hashes[node], refs[node]
+                else:
+                    retained[hashed] = key
+        # Stop iteration if nothing has been merged
+        if not references:
+            break
+        ref.replace(content, references)
+        # Invalidate hashes of components with rewritten references
+        memo = {}
+        for node in [node for node, targets in refs.items()
+                     if not targets.isdisjoint(references)]:
+            del hashes[node], refs[node]
+        # Redirect previously merged references to the finally retained ones
+        for reference, retained in merged_references.items():
+            merged_references[reference] = references.get(retained, retained)
+        merged_references.update(references)
+    return content, merged_references
+
+
 def reorder_components(content: Dict) -> Dict:
     """Sort components properties in required order.
 
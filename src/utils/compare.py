@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+"""Module for structural comparison of OpenAPI documents."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Third party modules
+
+# Internal modules
+import src.config as cfg
+from src.utils.digest import digest
+
+
+def compare(old: Dict, new: Dict) -> List[cfg.Change]:
+    """Compare paths, operations, and components of two OpenAPI documents.
+
+    Arguments
+    ---------
+    old
+        Old OpenAPI content, usually bundled one.
+    new
+        New OpenAPI content, usually bundled one.
+
+    Returns
+    -------
+    List of differences of operations, path items, and components in order
+    of their appearance in documents.
+
+    Notes
+    -----
+    - Both documents are hashed structurally at first in a single pass each.
+      Afterwards paths, operations, and components are aligned by their keys
+      and compared by hashes, so that unchanged sections and subtrees are
+      skipped without walking them.
+    - Operations of an added or removed path item are reported as added or
+      removed. A path item itself is reported as changed only if it exists
+      in both documents and its properties other than operations differ.
+
+    """
+    old_memo = {}
+    new_memo = {}
+    digest(old, old_memo)
+    digest(new, new_memo)
+
+    def same(old_value: Any, new_value: Any) -> bool:
+        return lookup(old_value, old_memo) == lookup(new_value, new_memo)
+
+    changes = []
+    old_paths = section(old, 'paths')
+    new_paths = section(new, 'paths')
+    if not same(old_paths, new_paths):
+        for path_key, old_item, new_item in align(old_paths, new_paths):
+            if old_item is not None and new_item is not None \
+                and same(old_item, new_item):
+                continue
+            old_ops, old_rest = split_path_item(old_item)
+            new_ops, new_rest = split_path_item(new_item)
+            for method_key, old_op, new_op in align(old_ops, new_ops):
+                name = f'{method_key.upper()} {path_key}'
+                change = status(old_op, new_op, same)
+                if change:
+                    changes.append(cfg.Change(change, 'operation', name,
+                                              old_op, new_op))
+            if old_item is not None and new_item is not None \
+                and not same(old_rest, new_rest):
+                changes.append(cfg.Change('changed', 'path', path_key,
+                                          old_item, new_item))
+    old_comps = section(old, 'components')
+    new_comps = section(new, 'components')
+    if not same(old_comps, new_comps):
+        for comps_prop, old_kind, new_kind in align(old_comps, new_comps):
+            old_kind = old_kind if isinstance(old_kind, dict) else {}
+            new_kind = new_kind if isinstance(new_kind, dict) else {}
+            if same(old_kind, new_kind):
+                continue
+            for name, old_comp, new_comp in align(old_kind, new_kind):
+                change = status(old_comp, new_comp, same)
+                if change:
+                    changes.append(cfg.Change(change, comps_prop, name,
+                                              old_comp, new_comp))
+    return changes
+
+
+def lookup(value: Any, memo: Dict[int, str]) -> str:
+    """Retrieve structural hash of a value from the memo or compute it."""
+    if isinstance(value, (dict, list)) and id(value) in memo:
+        return memo[id(value)]
+    return digest(value, memo)
+
+
+def section(content: Dict, key: str) -> Dict:
+    """Retrieve a dictionary section of the content or an empty one."""
+    value = content.get(key) if isinstance(content, dict) else None
+    return value if isinstance(value, dict) else {}
+
+
+def align(old: Dict, new: Dict) -> Iterator[Tuple[str, Any, Any]]:
+    """Align items of two dictionaries by their keys.
+
+    Arguments
+    ---------
+    old
+        Old dictionary.
+    new
+        New dictionary.
+
+    Yields
+    ------
+    Tuple with a key and old and new values, None for a missing one.
+
+    Notes
+    -----
+    - Keys of the old dictionary come first in their order followed by
+      the keys only in the new dictionary.
+
+    """
+    for key, value in old.items():
+        yield key, value, new.get(key)
+    for key, value in new.items():
+        if key not in old:
+            yield key, None, value
+
+
+def split_path_item(path_item: Any) -> Tuple[Dict, Dict]:
+    """Split path item to operations and the other properties.
+
+    Arguments
+    ---------
+    path_item
+        Path item object or None.
+
+    Returns
+    -------
+    Tuple with operations indexed by HTTP methods and the other properties.
+
+    """
+    operations = {}
+    rest = {}
+    if isinstance(path_item, dict):
+        for key, value in path_item.items():
+            if key.upper() in cfg.Parameter.HTTP_METHODS.value:
+                operations[key] = value
+            else:
+                rest[key] = value
+    return operations, rest
+
+
+def status(old: Any, new: Any, same) -> str:
+    """Determine kind of a change of aligned values.
+
+    Arguments
+    ---------
+    old
+        Old value or None.
+    new
+        New value or None.
+    same
+        Function comparing old and new values structurally.
+
+    Returns
+    -------
+    Kind of a change or empty string for unchanged values.
+
+    """
+    if old is None:
+        return 'added'
+    if new is None:
+        return 'removed'
+    return '' if same(old, new) else 'changed'
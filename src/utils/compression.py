@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Module for compressed input and output streams."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import os
+import gzip
+import lzma
+from typing import BinaryIO, Optional, Tuple
+
+# Third party modules
+
+# Internal modules
+from src.config import Compression
+
+
+def detect(file_path: str) -> Tuple[Optional[Compression], str]:
+    """Detect compression of a file by its extension.
+
+    Arguments
+    ---------
+    file_path
+        Path of a file.
+
+    Returns
+    -------
+    Tuple with enumeration member of the compression or None and the file
+    path without the compression extension.
+
+    Notes
+    -----
+    'spec.yaml.gz' => (Compression.GZIP, 'spec.yaml')
+
+    """
+    base_path, extension = os.path.splitext(file_path)
+    extension = extension.replace(os.extsep, '').lower()
+    for compression in Compression:
+        if extension == compression.value:
+            return compression, base_path
+    return None, file_path
+
+
+def open_stream(fileobj: BinaryIO, compression: Optional[Compression],
+                mode: str = 'rb') -> BinaryIO:
+    """Wrap a binary file object by a decompressing or compressing stream.
+
+    Arguments
+    ---------
+    fileobj
+        Binary file object opened for reading or writing.
+    compression
+        Enumeration member of a compression or None for no compression.
+    mode
+        Mode of the stream, either 'rb' or 'wb'.
+
+    Returns
+    -------
+    Binary stream, which decompresses or compresses data on the fly, or the
+    file object itself without compression.
+
+    Raises
+    ------
+    ValueError
+        The package for Zstandard compression is not installed.
+
+    Notes
+    -----
+    - Closing the stream flushes compressed data, but does not close
+      the file object, so that the standard output can be wrapped as well.
+
+    """
+    if compression is Compression.GZIP:
+        return gzip.GzipFile(fileobj=fileobj, mode=mode)
+    if compression is Compression.XZ:
+        return lzma.LZMAFile(fileobj, mode=mode)
+    if compression is Compression.ZSTD:
+        try:
+            import zstandard  # pylint: disable=import-outside-toplevel
+        except ImportError:
+            errmsg = f'Compression "{compression.value}" requires' \
+                ' the package "zstandard" to be installed!'
+            raise ValueError(errmsg) from None
+        if mode.startswith('w'):
+            return zstandard.ZstdCompressor().stream_writer(fileobj,
+                                                            closefd=False)
+        return zstandard.ZstdDecompressor().stream_reader(fileobj,
+                                                          closefd=False)
+    return fileobj
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+"""Module for the SQLite index of OpenAPI files."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import os
+import sqlite3
+from typing import Dict, List, NoReturn, Optional, Tuple
+
+# Third party modules
+
+# Internal modules
+
+# Version of the database structure
+SCHEMA_VERSION = 1
+
+# Tables of the index, nodes are JSON pointers of operations and components
+SCHEMA = '''
+CREATE TABLE specs (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL UNIQUE,
+    title TEXT,
+    version TEXT
+);
+CREATE TABLE files (
+    spec_id INTEGER NOT NULL REFERENCES specs(id) ON DELETE CASCADE,
+    file TEXT NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE operations (
+    spec_id INTEGER NOT NULL REFERENCES specs(id) ON DELETE CASCADE,
+    node TEXT NOT NULL,
+    method TEXT NOT NULL,
+    path TEXT NOT NULL,
+    operation_id TEXT,
+    security TEXT,
+    secured INTEGER NOT NULL
+);
+CREATE TABLE tags (
+    spec_id INTEGER NOT NULL REFERENCES specs(id) ON DELETE CASCADE,
+    node TEXT NOT NULL,
+    tag TEXT NOT NULL
+);
+CREATE TABLE components (
+    spec_id INTEGER NOT NULL REFERENCES specs(id) ON DELETE CASCADE,
+    node TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE refs (
+    spec_id INTEGER NOT NULL REFERENCES specs(id) ON DELETE CASCADE,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL
+);
+CREATE INDEX files_spec ON files(spec_id);
+CREATE INDEX operations_node ON operations(spec_id, node);
+CREATE INDEX tags_tag ON tags(tag);
+CREATE INDEX components_node ON components(spec_id, node);
+CREATE INDEX refs_target ON refs(target, spec_id);
+'''
+
+# Questions answered from the index with their parameters and output headers
+QUERIES = {
+    'uses': ('''
+        WITH RECURSIVE users(spec_id, node) AS (
+            SELECT spec_id, source FROM refs WHERE target = :node
+            UNION
+            SELECT refs.spec_id, refs.source FROM refs
+            JOIN users ON refs.spec_id = users.spec_id
+                AND refs.target = users.node
+        )
+        SELECT specs.file, operations.method, operations.path,
+            operations.operation_id
+        FROM users
+        JOIN operations ON operations.spec_id = users.spec_id
+            AND operations.node = users.node
+        JOIN specs ON specs.id = users.spec_id
+        ORDER BY specs.file, operations.path, operations.method
+        ''', ['File', 'Method', 'Path', 'OperationId']),
+    'unsecured': ('''
+        SELECT specs.file, operations.method, operations.path,
+            operations.operation_id, operations.security
+        FROM operations
+        JOIN specs ON specs.id = operations.spec_id
+        WHERE NOT operations.secured
+        ORDER BY specs.file, operations.path, operations.method
+        ''', ['File', 'Method', 'Path', 'OperationId', 'Security']),
+    'tag': ('''
+        SELECT specs.file, operations.method, operations.path,
+            operations.operation_id
+        FROM tags
+        JOIN operations ON operations.spec_id = tags.spec_id
+            AND operations.node = tags.node
+        JOIN specs ON specs.id = tags.spec_id
+        WHERE tags.tag = :tag
+        ORDER BY specs.file, operations.path, operations.method
+        ''', ['File', 'Method', 'Path', 'OperationId']),
+    'unused': ('''
+        SELECT specs.file, components.kind, components.name
+        FROM components
+        JOIN specs ON specs.id = components.spec_id
+        WHERE NOT EXISTS (
+            SELECT 1 FROM refs
+            WHERE refs.spec_id = components.spec_id
+                AND refs.target = components.node
+                AND refs.source != components.node
+        )
+        ORDER BY specs.file, components.kind, components.name
+        ''', ['File', 'Kind', 'Name']),
+}
+
+
+def connect(db_file: str, readonly: bool = False) -> sqlite3.Connection:
+    """Open the index database and create its tables, if needed.
+
+    Arguments
+    ---------
+    db_file
+        Path of a database file.
+    readonly
+        Flag about opening an existing database just for reading.
+
+    Returns
+    -------
+    Database connection.
+
+    Raises
+    ------
+    FileNotFoundError
+        Database file for reading does not exist.
+    ValueError
+        Database file has not expected structure.
+
+    Notes
+    -----
+    - A database with an other structure version is recreated, so that
+      all files are indexed again.
+
+    """
+    if readonly:
+        if not os.path.isfile(db_file):
+            errmsg = f'Index database "{db_file}" does not exist!'
+            raise FileNotFoundError(errmsg)
+        uri = 'file:' + os.path.abspath(db_file) + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True)
+    else:
+        conn = sqlite3.connect(db_file)
+    try:
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+    except sqlite3.DatabaseError as err:
+        conn.close()
+        errmsg = f'File "{db_file}" is not an index database: {err}'
+        raise ValueError(errmsg) from None
+    if version != SCHEMA_VERSION:
+        if readonly:
+            conn.close()
+            errmsg = f'Index database "{db_file}" has not expected version!'
+            raise ValueError(errmsg)
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")]
+        for table in tables:
+            conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        conn.executescript(SCHEMA)
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    conn.execute('PRAGMA foreign_keys = ON')
+    return conn
+
+
+def spec_files(conn: sqlite3.Connection,
+               openapi_file: str) -> Optional[Dict[str, str]]:
+    """Retrieve files with their hashes indexed for an OpenAPI file.
+
+    Arguments
+    ---------
+    conn
+        Database connection.
+    openapi_file
+        Absolute path of the root OpenAPI file.
+
+    Returns
+    -------
+    Hashes of the root file and its referenced files indexed by their paths
+    or None, if the file has not been indexed.
+
+    """
+    row = conn.execute('SELECT id FROM specs WHERE file = ?',
+                       (openapi_file,)).fetchone()
+    if row is None:
+        return None
+    return dict(conn.execute('SELECT file, hash FROM files WHERE spec_id = ?',
+                             row))
+
+
+def store_spec(conn: sqlite3.Connection, data: Dict) -> NoReturn:
+    """Replace the index of an OpenAPI file.
+
+    Arguments
+    ---------
+    conn
+        Database connection.
+    data
+        Indexed data of an OpenAPI file with the keys 'file', 'title',
+        'version', 'files', 'operations', 'tags', 'components', and 'refs'.
+        Rows of tables do not contain the identifier of the file.
+
+    """
+    remove_spec(conn, data['file'])
+    spec_id = conn.execute(
+        'INSERT INTO specs (file, title, version) VALUES (?, ?, ?)',
+        (data['file'], data['title'], data['version'])).lastrowid
+    statements = {
+        'files': 'INSERT INTO files VALUES (?, ?, ?)',
+        'operations': 'INSERT INTO operations VALUES (?, ?, ?, ?, ?, ?, ?)',
+        'tags': 'INSERT INTO tags VALUES (?, ?, ?)',
+        'components': 'INSERT INTO components VALUES (?, ?, ?, ?)',
+        'refs': 'INSERT INTO refs VALUES (?, ?, ?)',
+    }
+    for table, statement in statements.items():
+        conn.executemany(statement,
+                         ((spec_id,) + tuple(row) for row in data[table]))
+
+
+def remove_spec(conn: sqlite3.Connection, openapi_file: str) -> NoReturn:
+    """Remove the index of an OpenAPI file including its rows."""
+    conn.execute('DELETE FROM specs WHERE file = ?', (openapi_file,))
+
+
+def indexed_specs(conn: sqlite3.Connection) -> List[str]:
+    """List all indexed OpenAPI files."""
+    return [row[0] for row in conn.execute('SELECT file FROM specs')]
+
+
+def query(conn: sqlite3.Connection, sql: str,
+          params: Dict = None) -> Tuple[List[str], List[Tuple]]:
+    """Execute a query on the index.
+
+    Arguments
+    ---------
+    conn
+        Database connection.
+    sql
+        SQL statement.
+    params
+        Named parameters of the statement.
+
+    Returns
+    -------
+    Tuple with names of columns and result rows.
+
+    Raises
+    ------
+    ValueError
+        Invalid SQL statement.
+
+    """
+    try:
+        cursor = conn.execute(sql, params or {})
+        rows = cursor.fetchall()
+    except sqlite3.Error as err:
+        raise ValueError(f'Invalid query: {err}') from None
+    headers = [column[0] for column in cursor.description or []]
+    return headers, rows
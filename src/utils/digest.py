@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""Module for structural hashing of OpenAPI content."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import json
+from hashlib import blake2b
+from typing import Any, Dict
+
+# Third party modules
+
+# Internal modules
+
+
+def digest(content: Any, memo: Dict[int, str] = None) -> str:
+    """Compute canonical structural hash of the content.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content or its part to be hashed.
+    memo
+        Dictionary of already computed hashes of dictionaries and lists
+        indexed by their identity. It is filled with hashes of all subtrees.
+
+    Returns
+    -------
+    Hexadecimal hash string.
+
+    Notes
+    -----
+    - The hash is computed bottom-up from hashes of child values, i.e., in
+      Merkle tree style, so that each subtree is hashed just once and hashes
+      of all subtrees are available in the memo afterwards.
+    - Order of dictionary keys does not influence the hash, order of list
+      items does.
+    - The memo is valid only until the content is modified.
+
+    """
+    if memo is None:
+        memo = {}
+    if isinstance(content, dict):
+        if id(content) not in memo:
+            items = sorted(
+                ((key, digest(value, memo)) for key, value in content.items()),
+                key=lambda item: str(item[0]))
+            memo[id(content)] = _hash('d', json.dumps(items))
+        return memo[id(content)]
+    if isinstance(content, list):
+        if id(content) not in memo:
+            items = [digest(value, memo) for value in content]
+            memo[id(content)] = _hash('l', json.dumps(items))
+        return memo[id(content)]
+    return _hash('s', json.dumps(content, default=str))
+
+
+def fingerprint(content: Any) -> str:
+    """Compute fast hash of the content for change detection.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content or its part to be hashed.
+
+    Returns
+    -------
+    Hexadecimal hash string.
+
+    Notes
+    -----
+    - Unlike the structural hash, the fingerprint depends on order of
+      dictionary keys, but it is computed by a serializer at once.
+
+    """
+    return _hash('f', json.dumps(content, default=str))
+
+
+def _hash(kind: str, data: str) -> str:
+    """Hash serialized data of a node of given kind."""
+    return blake2b((kind + data).encode(), digest_size=16).hexdigest()
@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for processing files and folders."""
-__version__ = '0.1.1'
+__version__ = '0.5.0'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -10,14 +10,22 @@ __maintainer__ = __author__
 __email__ = 'libor.gabaj@gmail.com'
 
 # Standard library modules
+import io
 import os
 import json
+import lzma
+from hashlib import sha256
+from typing import Any, Optional, Tuple
+from urllib.parse import urljoin
 
 # Third party modules
 import yaml
 
 # Internal modules
 import src.config as cfg
+import src.utils.binary as binary
+import src.utils.compression as compress
+import src.utils.remote as remote
 
 
 def load_openapi_file(openapi_file: str) -> cfg.OpenAPI:
@@ -46,44 +54,31 @@ def load_openapi_file(openapi_file: str) -> cfg.OpenAPI:
     Notes
     -----
     - Validate on expected file extension and determine OpenAPI file format.
+    - Compressed files are recognized by the compression extension following
+      the format one and decompressed on the fly while parsing.
+    - Binary formats are read without decoding and deserialized by
+      the binary module.
     - Validate on expected OpenAPI specification and load file content.
+    - Content parsed by another file cache sharing parsed contents with
+      the current one is reused, if the file has not been modified.
+    - Files referenced by HTTP(S) URLs are fetched by the remote module and
+      their format is detected from the path of the URL.
 
     """
+    is_url = remote.is_url(openapi_file)
     record = cfg.OpenAPI(
-        oasinput=os.path.normpath(openapi_file),
-        oasfile=os.path.abspath(openapi_file),
+        oasinput=openapi_file if is_url else os.path.normpath(openapi_file),
+        oasfile=cfg.absolute(openapi_file),
         )
-    extension = \
-        os.path.splitext(record.oasfile)[1].replace(os.extsep, '').lower()
-    # Test on YAML file
-    if extension in cfg.Parameter.EXT_YAML.value:
-        record.oastype = cfg.Format.YAML
-    # Test on JSON file
-    elif extension in cfg.Parameter.EXT_JSON.value:
-        record.oastype = cfg.Format.JSON
-    # Extension validation failed
-    else:
-        extensions_list = ', '.join(
-            cfg.Parameter.EXT_YAML.value + cfg.Parameter.EXT_JSON.value)
-        errmsg = \
-            f'Extension of "{record.oasfile}" is not from "{extensions_list}"!'
-        raise ValueError(errmsg)
-    # Read content
-    try:
-        with open(record.oasfile) as input_file:
-            content = input_file.read()
-    except FileNotFoundError as err:
-        errmsg = f'Referenced OpenAPI file "{record.oasfile}" does not exist!'
-        raise type(err)(errmsg).with_traceback(err.__traceback__)
-    if not content:
-        errmsg = f'OpenAPI file "{record.oasfile}" is empty!'
-        raise EOFError(errmsg)
-    # Choose loading function for corresponding OpenAPI format
-    if record.oastype is cfg.Format.YAML:
-        fnc_load = yaml.safe_load
-    if record.oastype is cfg.Format.JSON:
-        fnc_load = json.loads
-    record.oas = fnc_load(content)
+    record.oastype, compression = detect_format(record.oasfile)
+    # Reuse content parsed by another file cache
+    parsed = cfg.CACHE.parsed
+    content = parsed.get(record.oasfile) if parsed is not None else None
+    if content is None:
+        content = read_content(record.oasfile, record.oastype, compression)
+        if parsed is not None:
+            parsed.put(record.oasfile, content)
+    record.oas = content
     if record.oas:
         if check_openapi3(record):
             record.oasversion = record.oas[cfg.Parameter.OAS_MARK3.value]
@@ -98,6 +93,106 @@ def load_openapi_file(openapi_file: str) -> cfg.OpenAPI:
     return record
 
 
+def detect_format(openapi_file: str) \
+        -> Tuple[cfg.Format, Optional[cfg.Compression]]:
+    """Detect format and compression of an OpenAPI file by its extensions.
+
+    Arguments
+    ---------
+    openapi_file
+        Absolute path or URL of an OpenAPI file.
+
+    Returns
+    -------
+    Tuple with enumeration members of the format and the compression
+    of the file or None.
+
+    Raises
+    ------
+    ValueError
+        Incorrect file extension detected.
+
+    """
+    compression, base_file = compress.detect(
+        remote.url_path(openapi_file) if remote.is_url(openapi_file)
+        else openapi_file)
+    extension = \
+        os.path.splitext(base_file)[1].replace(os.extsep, '').lower()
+    formats = {
+        cfg.Format.YAML: cfg.Parameter.EXT_YAML.value,
+        cfg.Format.JSON: cfg.Parameter.EXT_JSON.value,
+        cfg.Format.MSGPACK: cfg.Parameter.EXT_MSGPACK.value,
+        cfg.Format.CBOR: cfg.Parameter.EXT_CBOR.value,
+        cfg.Format.PICKLE: cfg.Parameter.EXT_PICKLE.value,
+        }
+    for oasformat, extensions in formats.items():
+        if extension in extensions:
+            return oasformat, compression
+    # Extension validation failed
+    extensions_list = ', '.join(
+        ext for extensions in formats.values() for ext in extensions)
+    errmsg = \
+        f'Extension of "{openapi_file}" is not from "{extensions_list}"!'
+    raise ValueError(errmsg)
+
+
+def read_content(openapi_file: str, oastype: cfg.Format,
+                 compression: Optional[cfg.Compression] = None) -> Any:
+    """Read and parse content of an OpenAPI file.
+
+    Arguments
+    ---------
+    openapi_file
+        Absolute path or URL of an OpenAPI file.
+    oastype
+        Enumeration member of the format of the file.
+    compression
+        Enumeration member of the compression of the file or None.
+
+    Returns
+    -------
+    Parsed content of the file.
+
+    Raises
+    ------
+    FileNotFoundError
+        Referenced OpenAPi file does not exist or cannot be fetched.
+    EOFError
+        OpenAPI file is empty.
+    SyntaxError
+        OpenAPI file cannot be decompressed.
+
+    """
+    if remote.is_url(openapi_file):
+        source = io.BytesIO(remote.fetch(openapi_file, cfg.CACHE.fetched))
+    else:
+        source = None
+    # Read content decompressed on the fly and parse it
+    try:
+        with source or open(openapi_file, 'rb') as input_file:
+            stream = compress.open_stream(input_file, compression)
+            if oastype.binary:
+                content = stream.read()
+                oas = binary.loads(content, oastype) if content else None
+            else:
+                text = io.TextIOWrapper(stream, encoding='utf-8')
+                if oastype is cfg.Format.YAML:
+                    content = oas = yaml.safe_load(text)
+                else:
+                    content = text.read()
+                    oas = json.loads(content) if content else None
+    except FileNotFoundError as err:
+        errmsg = f'Referenced OpenAPI file "{openapi_file}" does not exist!'
+        raise type(err)(errmsg).with_traceback(err.__traceback__)
+    except (OSError, lzma.LZMAError) as err:
+        errmsg = f'OpenAPI file "{openapi_file}" cannot be decompressed!'
+        raise SyntaxError(errmsg) from err
+    if not content:
+        errmsg = f'OpenAPI file "{openapi_file}" is empty!'
+        raise EOFError(errmsg)
+    return oas
+
+
 def check_openapi3(record: cfg.OpenAPI) -> bool:
     """Check if OpenAPI file i OpenAPI Specification 3.0.x.
 
@@ -161,10 +256,14 @@ def resolve_filepath(file_target, file_source):
     -----
     - If the target filepath is already absolute, it is returned without
         relation to the source file.
+    - Relative target of a source file referenced by URL is resolved to
+        a URL as well.
     """
     # Absolute target file path
-    if os.path.isabs(file_target):
+    if os.path.isabs(file_target) or remote.is_url(file_target):
         return file_target
+    if remote.is_url(file_source):
+        return urljoin(file_source, file_target)
     # Relative target file provided
     dir_source = os.path.dirname(os.path.abspath(file_source))
     file_target = os.path.join(dir_source, file_target)
@@ -184,9 +283,12 @@ def get_relpath(cur_file: str, ref_file: str) ->str:
 
     Returns
     -------
-        Relative path of the current file.
+        Relative path of the current file or its URL, if any of files is
+        referenced by URL.
 
     """
+    if remote.is_url(cur_file) or remote.is_url(ref_file):
+        return cur_file
     ref_dir = os.path.dirname(ref_file)
     cur_dir = os.path.dirname(cur_file)
     cur_base = os.path.basename(cur_file)
@@ -195,3 +297,30 @@ def get_relpath(cur_file: str, ref_file: str) ->str:
     rel_file = os.path.join(rel_path, cur_base)
     # rel_file = os.path.normpath(rel_file)
     return rel_file
+
+
+def hash_file(openapi_file: str) -> str:
+    """Compute hash of a file content.
+
+    Arguments
+    ---------
+    openapi_file
+        Path or URL of a file to be hashed.
+
+    Returns
+    -------
+    Hexadecimal hash string.
+
+    Raises
+    ------
+    FileNotFoundError
+        File referenced by URL cannot be fetched.
+
+    """
+    if remote.is_url(openapi_file):
+        return sha256(remote.fetch(openapi_file)).hexdigest()
+    hashed = sha256()
+    with open(openapi_file, 'rb') as input_file:
+        for chunk in iter(lambda: input_file.read(1 << 16), b''):
+            hashed.update(chunk)
+    return hashed.hexdigest()
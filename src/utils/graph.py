@@ -0,0 +1,417 @@
+# -*- coding: utf-8 -*-
+"""Module for reference graph and reachability of components."""
+__version__ = '0.2.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import json
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, NoReturn
+
+# Third party modules
+
+# Internal modules
+import src.config as cfg
+import src.utils.reference as ref
+import src.utils.filesystem as fs
+from src.utils.digest import fingerprint
+
+# Version of the state file structure
+STATE_VERSION = 1
+
+
+def component_node(reference: str) -> Optional[str]:
+    """Determine component node of an internal reference.
+
+    Arguments
+    ---------
+    reference
+        Reference value string.
+
+    Returns
+    -------
+    Reference to the component object, which the reference points to or into,
+    or None for external references and references outside components.
+
+    Notes
+    -----
+    '#/components/schemas/Pet/properties/name'
+    => '#/components/schemas/Pet'
+
+    """
+    if not reference.startswith(cfg.Parameter.REF_DELIM.value):
+        return None
+    _, fragments = ref.parse(reference)
+    if len(fragments) < 3 or fragments[0] != 'components':
+        return None
+    return ref.concat([ref.json_pointer(fragment)
+                       for fragment in fragments[:3]])
+
+
+def iter_nodes(content: Dict) -> Iterator[Tuple[str, bool, Any]]:
+    """Split content to nodes of the reference graph.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content.
+
+    Yields
+    ------
+    Tuple with reference to a node, flag about the node being a component,
+    and content of the node.
+
+    Notes
+    -----
+    - Each path item and each other root property except components is
+      a root node of the graph.
+    - Each component except security schemes is a node of the graph.
+
+    """
+    for key, value in content.items():
+        if key == 'components' and isinstance(value, dict):
+            for comps_prop, target in value.items():
+                if comps_prop == 'securitySchemes' \
+                    or not isinstance(target, dict):
+                    continue
+                for name, subtree in target.items():
+                    yield ref.concat([key, comps_prop, name]), True, subtree
+        elif key == 'paths' and isinstance(value, dict):
+            for name, subtree in value.items():
+                yield ref.concat([key, name]), False, subtree
+        else:
+            yield ref.concat([key]), False, value
+
+
+def collect_refs(content: Any, refs: Set[str] = None) -> Set[str]:
+    """Collect component nodes referenced in the content.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content or its part.
+    refs
+        Set of already collected component nodes to be extended.
+
+    Returns
+    -------
+    Set of referenced component nodes.
+
+    Notes
+    -----
+    - Targets of discriminator mappings are considered references too.
+
+    """
+    if refs is None:
+        refs = set()
+    if isinstance(content, list):
+        for item in content:
+            collect_refs(item, refs)
+    if isinstance(content, dict):
+        for key, value in content.items():
+            if key == '$ref' and isinstance(value, str):
+                node = component_node(value)
+                if node:
+                    refs.add(node)
+            elif key == 'discriminator' and isinstance(value, dict) \
+                and isinstance(value.get('mapping'), dict):
+                for target in value['mapping'].values():
+                    if isinstance(target, str):
+                        node = component_node(ref.mapping_target(target))
+                        if node:
+                            refs.add(node)
+            else:
+                collect_refs(value, refs)
+    return refs
+
+
+def reachable_components(content: Dict, state: Dict = None,
+                         files: Dict[str, str] = None) -> Set[str]:
+    """Determine components reachable from outside the components object.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content.
+    state
+        State of the previous run, which is updated by the current run.
+    files
+        Hashes of OpenAPI files, from which the content originates,
+        indexed by their paths.
+
+    Returns
+    -------
+    Set of references to reachable components.
+
+    Notes
+    -----
+    - If the files have not changed since the previous run, its reachable
+      components are reused without processing the content.
+    - Otherwise references are collected only from the nodes changed since
+      the previous run, while the ones of unchanged nodes are reused.
+      Detecting changed nodes still serializes the entire content once for
+      their fingerprints, which is faster than walking it, but remains
+      linear in the size of the content.
+    - Components referenced only from unreachable components, even mutually,
+      are unreachable.
+
+    """
+    if state and files and state.get('files') == files \
+        and 'reachable' in state:
+        return set(state['reachable'])
+    previous = state.get('nodes', {}) if state else {}
+    nodes = {}
+    roots = []
+    for node, component, subtree in iter_nodes(content):
+        hashed = fingerprint(subtree)
+        record = previous.get(node)
+        if record and record['hash'] == hashed:
+            refs = record['refs']
+        else:
+            refs = sorted(collect_refs(subtree))
+        nodes[node] = {'hash': hashed, 'refs': refs}
+        if not component:
+            roots.append(node)
+    # Walk the graph
+    reachable = set()
+    stack = [node for root in roots for node in nodes[root]['refs']]
+    while stack:
+        node = stack.pop()
+        if node in reachable or node not in nodes:
+            continue
+        reachable.add(node)
+        stack.extend(nodes[node]['refs'])
+    if state is not None:
+        state.clear()
+        state.update(version=STATE_VERSION, files=files or {}, nodes=nodes,
+                     reachable=sorted(reachable))
+    return reachable
+
+
+def load_state(state_file: str) -> Dict:
+    """Load state of a previous run.
+
+    Arguments
+    ---------
+    state_file
+        Path of a state file.
+
+    Returns
+    -------
+    State of the previous run or empty state, if the state file does not
+    exist or has not expected structure.
+
+    """
+    try:
+        with open(state_file) as input_file:
+            state = json.load(input_file)
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        return {}
+    return state
+
+
+def save_state(state_file: str, state: Dict) -> NoReturn:
+    """Save state of the current run.
+
+    Arguments
+    ---------
+    state_file
+        Path of a state file.
+    state
+        State of the current run.
+
+    """
+    with open(state_file, 'w') as output_file:
+        json.dump(state, output_file, separators=(',', ':'))
+
+
+
+def index_references(record: cfg.OpenAPI) \
+        -> Tuple[List[Tuple[str, str, str]], Dict[str, str]]:
+    """Index all references of an OpenAPI file and its referenced files.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record, which references should be indexed.
+
+    Returns
+    -------
+    Tuple with list of references and files, which could not be loaded,
+    with error messages. Each reference is a tuple with its absolute
+    location, value, and absolute target.
+
+    Notes
+    -----
+    - Each file is walked just once in its entirety, while referenced files
+      are loaded through the cache and queued for walking.
+    - Absolute locations and targets are JSON pointers prefixed with
+      absolute file paths.
+
+    """
+    references = []
+    failed = {}
+    queue = [record.oasfile]
+    queued = set(queue)
+    while queue:
+        source_file = queue.pop(0)
+        try:
+            source = cfg.CACHE.get_record_by_file(source_file) \
+                or ref.load_record(source_file)
+        except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+            failed[source_file] = str(err)
+            continue
+        stack = [(source.oas, source_file + '#')]
+        while stack:
+            node, location = stack.pop()
+            if isinstance(node, list):
+                stack.extend((item, f'{location}/{idx}')
+                             for idx, item in enumerate(node))
+                continue
+            if not isinstance(node, dict):
+                continue
+            value = node.get('$ref')
+            if isinstance(value, str):
+                target_file, fragments = ref.parse(value)
+                target_file = fs.resolve_filepath(target_file or source_file,
+                                                  source_file)
+                references.append((location, value,
+                                   ref.concat(fragments, target_file)))
+                if target_file not in queued:
+                    queued.add(target_file)
+                    queue.append(target_file)
+            stack.extend(
+                (item, f'{location}/{ref.escape_pointer(str(key))}')
+                for key, item in node.items() if key != '$ref')
+    return references, failed
+
+
+def resolve_references(references: List[Tuple[str, str, str]],
+                       failed: Dict[str, str]) -> Dict[str, Optional[str]]:
+    """Resolve targets of indexed references in batch.
+
+    Arguments
+    ---------
+    references
+        List of indexed references.
+    failed
+        Files, which could not be loaded, with error messages.
+
+    Returns
+    -------
+    Error messages of unresolvable targets or None for resolvable ones
+    indexed by targets.
+
+    Notes
+    -----
+    - Each target is resolved just once regardless of the number of
+      references to it.
+
+    """
+    results = {}
+    for _, _, target in references:
+        if target in results:
+            continue
+        target_file, fragments = ref.parse(target)
+        if target_file in failed:
+            results[target] = failed[target_file]
+            continue
+        content = cfg.CACHE.get_record_by_file(target_file).oas
+        for fragment in fragments:
+            if not isinstance(content, dict) \
+                or ref.json_pointer(fragment) not in content:
+                results[target] = 'Target does not exist'
+                break
+            content = content[ref.json_pointer(fragment)]
+        else:
+            results[target] = None
+    return results
+
+
+def circular_references(references: List[Tuple[str, str, str]]) -> Set[int]:
+    """Detect circular references.
+
+    Arguments
+    ---------
+    references
+        List of indexed references.
+
+    Returns
+    -------
+    Set of indices of references, which are parts of reference cycles.
+
+    Notes
+    -----
+    - Targets are nodes of the graph. Each target depends on the nearest
+      target containing it and on targets of references inside it.
+    - Cycles are found as strongly connected components of the graph by
+      the iterative Tarjan's algorithm in linear time.
+
+    """
+    targets = {target for _, _, target in references}
+
+    def enclosing(location: str) -> Optional[str]:
+        separ = cfg.Parameter.REF_SEPAR.value
+        while location.rfind(separ) > location.find('#'):
+            location = location.rsplit(separ, 1)[0]
+            if location in targets:
+                return location
+        return None
+
+    edges = {target: [] for target in targets}
+    for target in targets:
+        parent = enclosing(target)
+        if parent:
+            edges[parent].append(target)
+    sources = []
+    for location, _, target in references:
+        source = location if location in targets else enclosing(location)
+        sources.append(source)
+        if source:
+            edges[source].append(target)
+    # Strongly connected components
+    order = {}
+    lowlink = {}
+    component = {}
+    stack = []
+    on_stack = set()
+    for root in edges:
+        if root in order:
+            continue
+        work = [(root, iter(edges[root]))]
+        order[root] = lowlink[root] = len(order)
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            for child in children:
+                if child not in order:
+                    order[child] = lowlink[child] = len(order)
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(edges[child])))
+                    break
+                if child in on_stack:
+                    lowlink[node] = min(lowlink[node], order[child])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == order[node]:
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component[member] = node
+                        if member == node:
+                            break
+    return {idx for idx, ((_, _, target), source)
+            in enumerate(zip(references, sources))
+            if source and component[source] == component[target]}
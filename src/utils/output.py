@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for printing results to the standard console output."""
-__version__ = '0.3.0'
+__version__ = '0.9.2'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -10,8 +10,12 @@ __maintainer__ = __author__
 __email__ = 'libor.gabaj@gmail.com'
 
 # Standard library modules
+import csv
+import io
 import json
-from typing import List, Dict, NoReturn
+import os
+from typing import Any, BinaryIO, Callable, Iterable, Iterator, List, Dict, \
+    NoReturn, Optional, TextIO, Tuple, Union
 
 # Third party modules
 import yaml
@@ -19,45 +23,292 @@ import tabulate
 import click
 
 # Internal modules
-from src.config import Format
+from src.config import Compression, Format, TableFormat
+import src.utils.binary as binary
+import src.utils.compression as compress
 
 
-def print_table(data: List, headers: List,
-                showindex: bool = False) -> NoReturn:
+class Rows:
+    """Re-iterable data rows produced anew on each iteration.
+
+    Arguments
+    ---------
+    produce
+        Function returning a new iterable of data rows.
+
+    Notes
+    -----
+    - Rows composed on the fly from stored records can be iterated several
+      times without storing them, e.g., for fixed width format.
+
+    """
+
+    def __init__(self, produce: Callable[[], Iterable]):
+        self.produce = produce
+
+    def __iter__(self) -> Iterator:
+        return iter(self.produce())
+
+
+def print_table(data: Iterable, headers: List,
+                showindex: bool = False,
+                tablefmt: TableFormat = TableFormat.TABLE) -> NoReturn:
     """Print input list of data in tabular form with headers.
 
     Arguments
     ---------
     data
-        List of data to print
+        Iterable of data rows to print
     headers
         List of table header titles
     showindex
         Flag about generating automatic index
+    tablefmt
+        Enumeration member of a tabular output format
+
+    Notes
+    -----
+    - Streaming formats write each row as soon as it is produced, so that
+      rows are not stored at all.
+    - Fixed width format goes through rows twice, at first for computing
+      column widths and then for writing rows. Rows provided by
+      a re-iterable, e.g., a list or rows, are not stored, while rows
+      provided by a one-shot iterator are stored for it.
+
     """
-    click.echo(tabulate.tabulate(data, headers=headers, showindex=showindex))
+    if showindex:
+        rows = data
+        data = Rows(lambda: ([idx] + list(row)
+                             for idx, row in enumerate(rows)))
+        if isinstance(rows, Iterator):
+            data = list(data)
+        headers = [''] + list(headers)
+    if tablefmt is TableFormat.FIXED:
+        print_fixed(data, headers)
+    elif tablefmt is TableFormat.NDJSON:
+        for row in data:
+            click.echo(json.dumps(dict(zip(headers, row)),
+                                  ensure_ascii=False, default=str))
+    elif tablefmt in (TableFormat.TSV, TableFormat.CSV):
+        dialect = 'excel-tab' if tablefmt is TableFormat.TSV else 'excel'
+        writer = csv.writer(click.get_text_stream('stdout'), dialect=dialect,
+                            lineterminator='\n')
+        writer.writerow(headers)
+        for row in data:
+            writer.writerow(row)
+    else:
+        click.echo(tabulate.tabulate(data, headers=headers,
+                                     showindex=False))
 
 
-def dump_yaml(data: List) -> NoReturn:
-    """Print serialized YAML content."""
+def print_fixed(data: Iterable, headers: List) -> NoReturn:
+    """Print data rows in fixed width columns with headers.
+
+    Arguments
+    ---------
+    data
+        Iterable of data rows to print
+    headers
+        List of table header titles
+
+    Notes
+    -----
+    - Numeric columns are aligned to the right, other ones to the left.
+    - Re-iterable data is iterated twice, at first for computing column
+      widths and then for printing rows, so that rows are not stored. Rows
+      of a one-shot iterator have to be stored for the second pass.
+
+    """
+    if isinstance(data, Iterator):
+        data = list(data)
+    widths = [len(str(header)) for header in headers]
+    numeric = [True] * len(headers)
+    for row in data:
+        for col, value in enumerate(row):
+            widths[col] = max(widths[col], len(str(value)))
+            if not isinstance(value, (int, float)):
+                numeric[col] = False
+
+    def render(row: Iterable) -> str:
+        return '  '.join(
+            str(value).rjust(width) if num else str(value).ljust(width)
+            for value, width, num in zip(row, widths, numeric)).rstrip()
+
+    click.echo(render(headers))
+    click.echo('  '.join('-' * width for width in widths))
+    for row in data:
+        click.echo(render(row))
+
+
+class NoAliasDumper(yaml.Dumper):  # pylint: disable=too-many-ancestors
+    """Custom dumper for ommiting anchors and aliases."""
+    def ignore_aliases(self, data):
+        return True
+
+
+def share_subtrees(content: Any) -> Any:
+    """Compose content with structurally identical subtrees shared.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content with possibly repeated subtrees.
+
+    Returns
+    -------
+    Copy of the content, where all equal non-empty dictionaries and lists
+    are the same object.
+
+    Notes
+    -----
+    - Subtrees are identified by their keys and values in their order, where
+      nested subtrees are represented by a number of their unique content,
+      so that each subtree is hashed just once.
+    - Subtrees already shared by identity, e.g., at deep dereference,
+      are processed just once.
+
+    """
+    # Numbers of unique contents and shared subtrees with them
+    tokens: Dict[Tuple, int] = {}
+    shared: Dict[Tuple, Tuple[int, Any]] = {}
+    visited: Dict[int, Tuple[Any, Any]] = {}
+
+    def visit(node: Any) -> Tuple[Any, Any]:
+        if not isinstance(node, (dict, list)):
+            return (type(node), node), node
+        if id(node) in visited:
+            return visited[id(node)]
+        if isinstance(node, dict):
+            children = [((type(name), name), visit(value))
+                        for name, value in node.items()]
+        else:
+            children = [(None, visit(value)) for value in node]
+        key = (type(node),
+               tuple((name, token) for name, (token, _) in children))
+        if key in shared:
+            result = shared[key]
+        else:
+            if isinstance(node, dict):
+                copy = {name[1]: value for name, (_, value) in children}
+            else:
+                copy = [value for _, (_, value) in children]
+            result = (tokens.setdefault(key, len(tokens)), copy)
+            # Empty subtrees are not worth of aliases, but they have a token
+            if children:
+                shared[key] = result
+        visited[id(node)] = result
+        return result
+
+    return visit(content)[1]
+
+
+def _yaml_dump(data: Any, stream: TextIO = None,
+               aliases: bool = False) -> Optional[str]:
+    """Serialize content to YAML with or without anchors and aliases."""
+    if aliases:
+        data = share_subtrees(data)
+    return yaml.dump(data, stream, default_flow_style=False, sort_keys=False,
+                     Dumper=yaml.Dumper if aliases else NoAliasDumper,
+                     allow_unicode=True)
+
 
-    class NoAliasDumper(yaml.Dumper):  # pylint: disable=too-many-ancestors
-        """Custom dumper for ommiting anchors and aliases."""
-        def ignore_aliases(self, data):
-            return True
+def serialize_yaml(data: List, aliases: bool = False) -> str:
+    """Serialize content to YAML, repeated subtrees aliased if required."""
+    return _yaml_dump(data, aliases=aliases)
 
-    result = yaml.dump(data, default_flow_style=False, sort_keys=False,
-                       Dumper=NoAliasDumper, allow_unicode=True)
-    click.echo(result)
 
+def serialize_json(data: List, minify: bool = False) -> str:
+    """Serialize content to JSON, compact without whitespace if minified."""
+    if minify:
+        return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+    return json.dumps(data, indent=2, ensure_ascii=False)
 
-def dump_json(data: List) -> NoReturn:
+
+def dump_yaml(data: List, aliases: bool = False) -> NoReturn:
+    """Print serialized YAML content."""
+    click.echo(serialize_yaml(data, aliases))
+
+
+def dump_json(data: List, minify: bool = False) -> NoReturn:
     """Print serialized JSON content."""
-    result = json.dumps(data, indent=2, ensure_ascii=False)
-    click.echo(result)
+    click.echo(serialize_json(data, minify))
+
+
+def serialize(content: Dict, outformat: Format, minify: bool = False,
+              aliases: bool = False) -> Union[str, bytes]:
+    """Convert content to required format.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content, which should be converted.
+    outformat
+        Enumeration member of an requested OpenAPI content format.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+    aliases
+        Flag about writing repeated subtrees of YAML output just once with
+        anchors and aliases.
+
+    Returns
+    -------
+    Serialized OpenAPI content, bytes for binary formats.
+
+    """
+    if outformat.binary:
+        return binary.dumps(content, outformat)
+    if outformat is Format.JSON:
+        return serialize_json(content, minify) + '\n'
+    return serialize_yaml(content, aliases)
+
+
+def write_stream(content: Dict, outformat: Format, stream: BinaryIO,
+                 minify: bool = False, aliases: bool = False) -> NoReturn:
+    """Serialize content directly into a binary stream.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content, which should be serialized.
+    outformat
+        Enumeration member of an requested OpenAPI content format.
+    stream
+        Binary stream, usually a compressing one.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+    aliases
+        Flag about writing repeated subtrees of YAML output just once with
+        anchors and aliases.
 
+    Notes
+    -----
+    - Text formats are encoded and written in chunks as the serializer
+      produces them, so that the entire serialized text is not kept
+      in memory before compression.
+    - The stream is not closed, just flushed.
 
-def output_content(content: Dict, outformat: Format) -> NoReturn:
+    """
+    if outformat.binary:
+        stream.write(binary.dumps(content, outformat))
+        stream.flush()
+        return
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='\n')
+    if outformat is Format.JSON:
+        if minify:
+            json.dump(content, text, separators=(',', ':'),
+                      ensure_ascii=False)
+        else:
+            json.dump(content, text, indent=2, ensure_ascii=False)
+        text.write('\n')
+    else:
+        _yaml_dump(content, text, aliases)
+    text.flush()
+    text.detach()
+
+
+def output_content(content: Dict, outformat: Format,
+                   compression: Optional[Compression] = None,
+                   minify: bool = False, aliases: bool = False) -> NoReturn:
     """Convert content to required format and print it to system console.
 
     Arguments
@@ -67,12 +318,80 @@ def output_content(content: Dict, outformat: Format) -> NoReturn:
     outformat
         Enumeration member of an requested OpenAPI content format for output
         to the system console.
+    compression
+        Enumeration member of a compression of the output or None.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+    aliases
+        Flag about writing repeated subtrees of YAML output just once with
+        anchors and aliases.
+
+    Notes
+    -----
+    - Binary formats are written to the binary standard output as they are.
+    - Compressed output is written to the binary standard output
+      compressed on the fly.
 
     """
-    if outformat is Format.YAML:
-        dump_yaml(content)
+    if compression:
+        stdout = click.get_binary_stream('stdout')
+        stream = compress.open_stream(stdout, compression, 'wb')
+        write_stream(content, outformat, stream, minify, aliases)
+        stream.close()
+        stdout.flush()
+    elif outformat is Format.YAML:
+        dump_yaml(content, aliases)
     elif outformat is Format.JSON:
-        dump_json(content)
+        dump_json(content, minify)
+    else:
+        click.get_binary_stream('stdout').write(
+            binary.dumps(content, outformat))
+
+
+def write_content(content: Dict, outformat: Format, output_file: str,
+                  minify: bool = False, aliases: bool = False) -> NoReturn:
+    """Convert content to required format and write it to a file.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content, which should be converted and written.
+    outformat
+        Enumeration member of an requested OpenAPI content format.
+    output_file
+        Path of an output file. Its folder is created, if it does not exist.
+        The file is compressed, if it has a compression extension.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+    aliases
+        Flag about writing repeated subtrees of YAML output just once with
+        anchors and aliases.
+
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(output_file)), exist_ok=True)
+    compression, _ = compress.detect(output_file)
+    with open(output_file, 'wb') as file:
+        stream = compress.open_stream(file, compression, 'wb')
+        write_stream(content, outformat, stream, minify, aliases)
+        if stream is not file:
+            stream.close()
+
+
+def output_unresolved(unresolved: Dict[str, str]) -> NoReturn:
+    """Print warning about unresolvable references to the error output.
+
+    Arguments
+    ---------
+    unresolved
+        Unresolvable reference targets with files containing them.
+
+    """
+    if not unresolved:
+        return
+    errmsg = 'Unresolvable references kept in output:\n' + '\n'.join(
+        f'{target} in "{source_file}"'
+        for target, source_file in sorted(unresolved.items()))
+    click.echo(click.style(errmsg, fg='yellow'), err=True)
 
 
 def output_preamble(title: str, subtitle: str, color: bool = False) -> NoReturn:
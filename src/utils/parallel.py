@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""Module for processing independent parts of OpenAPI content in parallel."""
+__version__ = '0.1.1'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, NoReturn
+
+# Third party modules
+
+# Internal modules
+import src.config as cfg
+
+
+def map_jobs(function: Callable, items: Iterable, jobs: int = 1) -> List:
+    """Apply function to all items in worker processes.
+
+    Arguments
+    ---------
+    function
+        Module level function to be applied to each item.
+    items
+        Items to be processed independently.
+    jobs
+        Number of worker processes. If it is not greater than 1, the items
+        are processed sequentially in the current process.
+
+    Returns
+    -------
+    List of function results in the order of items.
+
+    Notes
+    -----
+    - Worker processes get the file cache of the current process with
+      already parsed OpenAPI files, which they use as read-only one, so that
+      files are not parsed again in each worker.
+    - Items and results have to be picklable.
+
+    """
+    items = list(items)
+    if jobs is None or jobs <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    chunksize = max(1, len(items) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker,
+                             initargs=(cfg.CACHE,)) as executor:
+        return list(executor.map(function, items, chunksize=chunksize))
+
+
+def init_worker(cache: cfg.FileCache) -> NoReturn:
+    """Set file cache of a worker process."""
+    cfg.set_cache(cache)
+
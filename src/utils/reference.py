@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 """Module for resolving references."""
-__version__ = '0.2.0'
+__version__ = '0.6.0'
 __status__ = 'Beta'
 __author__ = 'Libor Gabaj'
 __copyright__ = 'Copyright 2020, ' + __author__
@@ -10,13 +10,17 @@ __maintainer__ = __author__
 __email__ = 'libor.gabaj@gmail.com'
 
 # Standard library modules
-from typing import Tuple, List, Dict, Optional, NoReturn
+import os
+from time import perf_counter
+from typing import Any, Tuple, List, Dict, Optional, NoReturn
 
 # Third party modules
 
 # Internal modules
 import src.config as cfg
 import src.utils.filesystem as fs
+import src.utils.remote as remote
+from src.utils.parallel import map_jobs
 
 
 def dereference(content: Dict, source_file: str) -> Dict:
@@ -37,8 +41,8 @@ def dereference(content: Dict, source_file: str) -> Dict:
 
     Notes
     -----
-    - The function empties invalid references as marking them for deletion
-      at post-processing.
+    - Unresolvable references are kept as they are and registered in the
+      cache with the files containing them, so that they can be reported.
 
     """
     if isinstance(content, list):
@@ -54,17 +58,23 @@ def dereference(content: Dict, source_file: str) -> Dict:
                 # External reference
                 if target_file:
                     target_file = fs.resolve_filepath(target_file, source_file)
+                    stats = cfg.CACHE.ref_stats
+                    if stats:
+                        start = stats.start()
                     # Load target file from cache or file system
                     record_target = cfg.CACHE.get_record_by_file(target_file)
                     if not record_target:
-                        record_target = fs.load_openapi_file(target_file)
-                        cfg.CACHE.reg_record(record_target)
+                        record_target = load_record(target_file)
                     # Retrieve target (referenced) content
                     ref_content = get_ref_content(
                         record_target, target_fragments)
+                    if stats:
+                        stats.stop(concat(target_fragments, target_file),
+                                   start)
                     if ref_content is None:
-                        if cfg.CACHE.dereference_deep:
-                            del content[ref_key]
+                        cfg.CACHE.unresolved.setdefault(
+                            concat(target_fragments, target_file),
+                            source_file)
                         continue
                     elif cfg.CACHE.dereference_deep:
                         content = ref_content
@@ -87,6 +97,188 @@ def dereference(content: Dict, source_file: str) -> Dict:
     return content
 
 
+def dereference_paths(content: Dict, source_file: str,
+                      jobs: int = 1) -> Dict:
+    """Resolve references in provided content dictionary with path items
+    processed in parallel.
+
+    Arguments
+    ---------
+    content
+        OpenAPI document to be cleaned up.
+    source_file
+        OpenAPI file with dereferenced content and used for resolving relative
+        file paths.
+    jobs
+        Number of worker processes for dereferencing path items.
+
+    Returns
+    -------
+    Dereference OpenAPI content in the same form as by the function
+    `dereference`.
+
+    Notes
+    -----
+    - Path items are dereferenced in worker processes independently, while
+      contents imported by them are merged to the root document afterwards
+      in the order of path items, so that the result is deterministic.
+    - The rest of the document is dereferenced in the current process.
+    - Path items come back from worker processes as separate copies, so that
+      targets referenced from several path items are not shared in memory
+      across them, like they are at sequential dereferencing.
+
+    """
+    paths_key = 'paths'
+    if jobs is None or jobs <= 1 \
+        or not isinstance(content.get(paths_key), dict):
+        return dereference(content, source_file)
+    path_items = content[paths_key]
+    results = map_jobs(_dereference_path_item,
+                       [(value, source_file) for value in path_items.values()],
+                       jobs)
+    for path_key, (path_value, imports, unresolved) \
+            in zip(list(path_items), results):
+        cfg.CACHE.unresolved.update(unresolved)
+        if isinstance(path_value, dict) and not path_value:
+            del path_items[path_key]
+        else:
+            path_items[path_key] = path_value
+        for reference, ref_content in imports:
+            import_ref_content(ref_content, reference)
+    # Dereference the rest of document preserving order of its properties
+    order = list(content)
+    content[paths_key] = {}
+    content = dereference(content, source_file)
+    if path_items:
+        content[paths_key] = path_items
+    for key in order + [key for key in content if key not in order]:
+        if key in content:
+            content[key] = content.pop(key)
+    return content
+
+
+def _dereference_path_item(item: Tuple[Dict, str]) \
+        -> Tuple[Dict, List, Dict[str, str]]:
+    """Dereference path item, usually in a worker process.
+
+    Arguments
+    ---------
+    item
+        Tuple with path item and OpenAPI file containing it.
+
+    Returns
+    -------
+    Tuple with dereferenced path item, list of contents imported by it
+    to the root document, and unresolvable references registered in the
+    cache.
+
+    """
+    path_value, source_file = item
+    imports, cfg.CACHE.imports = cfg.CACHE.imports, []
+    try:
+        path_value = dereference(path_value, source_file)
+    finally:
+        imports, cfg.CACHE.imports = cfg.CACHE.imports, imports
+    return path_value, imports, cfg.CACHE.unresolved
+
+
+def load_record(openapi_file: str) -> cfg.OpenAPI:
+    """Load OpenAPI file and register it to the cache.
+
+    Arguments
+    ---------
+    openapi_file
+        Absolute path of an OpenAPI file to be loaded.
+
+    Returns
+    -------
+    Registered OpenAPI file record.
+
+    Notes
+    -----
+    - If the reference resolution is instrumented, the parsing time of the
+      file is registered as well.
+    - Files referenced by URLs from the loaded file are fetched concurrently
+      in advance, so that dereferencing does not wait for them one by one.
+
+    """
+    start = perf_counter()
+    record = fs.load_openapi_file(openapi_file)
+    if cfg.CACHE.ref_stats:
+        cfg.CACHE.ref_stats.reg_file(record.oasfile, perf_counter() - start)
+    cfg.CACHE.reg_record(record)
+    urls = [url for url in referenced_files(record.oas, record.oasfile)
+            if remote.is_url(url) and not cfg.CACHE.get_record_by_file(url)]
+    if urls:
+        remote.prefetch(urls, cfg.CACHE.fetched)
+    return record
+
+
+def referenced_files(content: Any, source_file: str) -> List[str]:
+    """List files referenced from a content.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content to be searched for references.
+    source_file
+        OpenAPI file of the content used for resolving relative file paths.
+
+    Returns
+    -------
+    Absolute paths or URLs of referenced files.
+
+    """
+    files = {}
+    stack = [content]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            value = node.get('$ref')
+            if isinstance(value, str):
+                target_file = value.split('#', 1)[0]
+                if target_file:
+                    files.setdefault(
+                        fs.resolve_filepath(target_file, source_file))
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return list(files)
+
+
+def bundle_file(openapi_file: str) -> Tuple[cfg.OpenAPI, Dict]:
+    """Load OpenAPI file and bundle it in its own file cache.
+
+    Arguments
+    ---------
+    openapi_file
+        Path of an OpenAPI file to be bundled.
+
+    Returns
+    -------
+    Tuple with OpenAPI file record and its bundled content.
+
+    Notes
+    -----
+    - The file cache of the context is replaced just for the bundling, so that
+      contents imported from referenced files land in the bundled document
+      and several files can be bundled independently of each other.
+      Unresolvable references are registered in the original cache.
+
+    """
+    cache = cfg.CACHE
+    bundling = cfg.FileCache(dereference_import=True, parsed=cache.parsed)
+    try:
+        with cfg.use_cache(bundling):
+            record = load_record(cfg.absolute(openapi_file))
+            if not remote.is_url(openapi_file):
+                record.oasinput = os.path.normpath(openapi_file)
+            content = dereference(record.oas, record.oasfile)
+    finally:
+        cache.unresolved.update(bundling.unresolved)
+    return record, content
+
+
 def parse(ref_value: str) -> Tuple[str, List[str]]:
     """Extract referenced file and list of target reference fragments.
 
@@ -141,66 +333,155 @@ def json_pointer(jsonpointer: str) -> str:
     return jsonpointer.replace("~0", "~").replace("~1", "/")
 
 
-def find(content: Dict, reference: str, extern: bool = False) -> bool:
-    """Check if reference is used in the provided content.
+def escape_pointer(fragment: str) -> str:
+    """Escape characters of a reference fragment for JSON pointer."""
+    return str(fragment).replace("~", "~0").replace("/", "~1")
+
+
+def replace(content: Dict, references: Dict[str, str]) -> Dict:
+    """Replace references in the provided content.
 
     Arguments
     ---------
     content
-        OpenAPI document to be cleaned up.
-    reference
-        Internal reference to be searched.
-    extern
-        Flag about searching in external references too.
+        OpenAPI content with references to be replaced.
+    references
+        Mapping of original references to new ones.
 
     Returns
     -------
-    Flag determining presence of the reference in the content.
+    OpenAPI content with replaced references.
+
+    Notes
+    -----
+    - References into original targets, e.g., to their properties, are
+      replaced by references into new targets as well.
+    - Targets of discriminator mappings are replaced too, either as
+      references or as schema names, as they are provided.
 
     """
     if isinstance(content, list):
         for item in content:
-            if find(item, reference, extern):
-                return True
+            replace(item, references)
     if isinstance(content, dict):
         for key, value in content.items():
-            if key == '$ref':
-                if value.endswith(reference) if extern \
-                    else value == reference:
-                    return True
-            if find(value, reference, extern):
-                return True
-    return False
+            if key == '$ref' and isinstance(value, str):
+                content[key] = replace_reference(value, references)
+            elif key == 'discriminator' and isinstance(value, dict) \
+                and isinstance(value.get('mapping'), dict):
+                mapping = value['mapping']
+                for mapping_key, target in mapping.items():
+                    if not isinstance(target, str):
+                        continue
+                    reference = replace_reference(mapping_target(target),
+                                                  references)
+                    if cfg.Parameter.REF_DELIM.value not in target:
+                        reference = parse(reference)[1][-1]
+                    mapping[mapping_key] = reference
+            else:
+                replace(value, references)
+    return content
+
+
+def replace_reference(reference: str, references: Dict[str, str]) -> str:
+    """Replace reference or its target prefix by a new one.
+
+    Arguments
+    ---------
+    reference
+        Reference value string.
+    references
+        Mapping of original references to new ones.
+
+    Returns
+    -------
+    Replaced reference or the original one, if it is not mapped.
+
+    """
+    target = reference
+    while target and target not in references:
+        target = target.rpartition(cfg.Parameter.REF_SEPAR.value)[0]
+    if not target:
+        return reference
+    return references[target] + reference[len(target):]
+
+
+def mapping_target(value: str) -> str:
+    """Compose reference from a target of discriminator mapping.
+
+    Arguments
+    ---------
+    value
+        Target of a discriminator mapping, i.e., a schema name or reference.
+
+    Returns
+    -------
+    Reference value string.
 
+    Notes
+    -----
+    'Dog' => '#/components/schemas/Dog'
+
+    """
+    if cfg.Parameter.REF_DELIM.value in value:
+        return value
+    return concat(['components', 'schemas', value])
 
-def find_security(content: Dict, scheme: str) -> bool:
-    """Check if security scheme is used in the provided content.
+
+def index_security(content: Dict) -> cfg.SecurityIndex:
+    """Index security requirements in the provided content.
 
     Arguments
     ---------
     content
-        OpenAPI document to be cleaned up.
-    scheme
-        Security scheme to be searched.
+        OpenAPI document with paths, which are expected to be dereferenced.
 
     Returns
     -------
-    Flag determining presence of the security scheme in the content.
+    Index of security requirements at root and operation level, including
+    operations of callbacks.
+
+    Notes
+    -----
+    - The content is not walked entirely, but only root, path items,
+      operations, and callbacks are visited.
+    - Operations of callbacks in components are indexed as callback ones,
+      so that callbacks referenced by operations are covered as well.
 
     """
-    if isinstance(content, list):
-        for item in content:
-            if find_security(item, scheme):
-                return True
-    if isinstance(content, dict):
-        for key, value in content.items():
-            if key == 'security':
-                for security in value:
-                    if isinstance(security, dict) and scheme in security:
-                        return True
-            if find_security(value, scheme):
-                return True
-    return False
+    def requirements(target: Dict) -> Optional[List[Dict]]:
+        value = target.get('security')
+        return value if isinstance(value, list) else None
+
+    def operations(path_items: Dict):
+        for path_key, path_value in path_items.items():
+            if not isinstance(path_value, dict):
+                continue
+            for method_key, method_value in path_value.items():
+                if method_key.upper() in cfg.Parameter.HTTP_METHODS.value \
+                    and isinstance(method_value, dict):
+                    yield path_key, method_key, method_value
+
+    def index_callbacks(callbacks: Dict):
+        if not isinstance(callbacks, dict):
+            return
+        for callback in callbacks.values():
+            if not isinstance(callback, dict):
+                continue
+            for _, _, cb_operation in operations(callback):
+                index.callbacks += requirements(cb_operation) or []
+
+    index = cfg.SecurityIndex(root=requirements(content) or [])
+    components = content.get('components')
+    if isinstance(components, dict):
+        index_callbacks(components.get('callbacks'))
+    path_items = content.get('paths')
+    if not isinstance(path_items, dict):
+        return index
+    for path_key, method_key, operation in operations(path_items):
+        index.operations[(path_key, method_key)] = requirements(operation)
+        index_callbacks(operation.get('callbacks'))
+    return index
 
 
 def get_ref_content(record: cfg.OpenAPI, reference: List[Dict]) \
@@ -220,7 +501,16 @@ def get_ref_content(record: cfg.OpenAPI, reference: List[Dict]) \
     Target content of the reference or None. It is usually OpenAPI content,
     but might be a simple data type as well.
 
+    Notes
+    -----
+    - Each target is dereferenced just once. Repeated references to it get
+      the very same object, so that diamond shaped references share subtrees
+      instead of expanding them.
+
     """
+    key = concat(reference, record.oasfile)
+    if key in cfg.CACHE.resolved:
+        return cfg.CACHE.resolved[key]
     target = record.oas
     try:
         for fragment in reference:
@@ -228,9 +518,48 @@ def get_ref_content(record: cfg.OpenAPI, reference: List[Dict]) \
     except KeyError:
         return None
     target = dereference(target, record.oasfile)
+    cfg.CACHE.resolved[key] = target
     return target
 
 
+def count_nodes(content: Any) -> Tuple[int, int]:
+    """Count nodes of the content as it would be serialized.
+
+    Arguments
+    ---------
+    content
+        OpenAPI content, usually dereferenced with shared subtrees.
+
+    Returns
+    -------
+    Tuple with number of nodes after expansion of shared subtrees and
+    number of unique nodes in memory.
+
+    Notes
+    -----
+    - Every dictionary, list, and scalar value is a node.
+    - Shared subtrees are counted just once, so that the estimation is linear
+      in the size of the content in memory.
+
+    """
+    sizes = {}
+    unique = 0
+
+    def expand(node: Any) -> int:
+        nonlocal unique
+        if id(node) in sizes:
+            return sizes[id(node)]
+        unique += 1
+        if not isinstance(node, (dict, list)):
+            return 1
+        children = node.values() if isinstance(node, dict) else node
+        size = 1 + sum(expand(child) for child in children)
+        sizes[id(node)] = size
+        return size
+
+    return expand(content), unique
+
+
 def import_ref_content(content: Dict, reference: List[Dict]) -> NoReturn:
     """Import referenced content to the root OpenAPI document.
 
@@ -243,6 +572,8 @@ def import_ref_content(content: Dict, reference: List[Dict]) -> NoReturn:
         content.
 
     """
+    if cfg.CACHE.imports is not None:
+        cfg.CACHE.imports.append((reference, content))
     target = cfg.CACHE.get_record_first().oas
     for i, fragment in enumerate(reference):
         if i == len(reference) - 1:
@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""Module for fetching OpenAPI files referenced by HTTP(S) URLs."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import os
+import json
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import sha256
+from threading import Lock
+from typing import Dict, Iterable, List, NoReturn, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+# Third party modules
+
+# Internal modules
+from src.config import Parameter
+
+# HTTP statuses of redirections followed by the client
+REDIRECTS = (301, 302, 303, 307, 308)
+# Maximal number of followed redirections of a request
+MAX_REDIRECTS = 5
+
+
+def is_url(openapi_file: str) -> bool:
+    """Check if an OpenAPI file is referenced by HTTP(S) URL."""
+    return isinstance(openapi_file, str) \
+        and openapi_file.startswith(tuple(Parameter.URL_SCHEMES.value))
+
+
+def url_path(url: str) -> str:
+    """Extract path of a URL without query, e.g., for detecting format."""
+    return urlsplit(url).path
+
+
+class ConnectionPool:
+    """Pool of persistent HTTP connections reused across requests.
+
+    Arguments
+    ---------
+    size
+        Maximal number of idle connections kept per host.
+    timeout
+        Timeout of connecting and reading in seconds.
+
+    Notes
+    -----
+    - Connections are kept alive and reused by subsequent requests to
+      the same host, so that referenced files from a server do not pay for
+      a new connection and TLS handshake each.
+    - Access to idle connections is guarded by a lock, so that the pool can
+      be used by concurrent threads, each request using its own connection.
+
+    """
+
+    def __init__(self, size: int = Parameter.HTTP_WORKERS.value,
+                 timeout: float = Parameter.HTTP_TIMEOUT.value):
+        self.size = size
+        self.timeout = timeout
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] \
+            = {}
+        self._lock = Lock()
+
+    def acquire(self, scheme: str,
+                netloc: str) -> Tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection to a host or create a new one.
+
+        Returns
+        -------
+        Tuple with the connection and flag about its reusing.
+
+        """
+        with self._lock:
+            idle = self._idle.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc,
+                                               timeout=self.timeout), False
+        return http.client.HTTPConnection(netloc, timeout=self.timeout), False
+
+    def release(self, scheme: str, netloc: str,
+                conn: http.client.HTTPConnection) -> NoReturn:
+        """Return a connection to the pool or close it, if the pool is full."""
+        with self._lock:
+            idle = self._idle.setdefault((scheme, netloc), [])
+            if len(idle) < self.size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, url: str,
+                headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        """Send a GET request through a pooled connection.
+
+        Arguments
+        ---------
+        url
+            Requested URL.
+        headers
+            Request headers.
+
+        Returns
+        -------
+        Tuple with response status, headers with lowercase names, and body.
+
+        Raises
+        ------
+        OSError, http.client.HTTPException
+            Connection or protocol failure.
+
+        Notes
+        -----
+        - A request failed on a reused connection is repeated once on a new
+          one, since the server might have closed the idle connection.
+
+        """
+        parts = urlsplit(url)
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+        while True:
+            conn, reused = self.acquire(parts.scheme, parts.netloc)
+            try:
+                conn.request('GET', target, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                if reused:
+                    continue
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self.release(parts.scheme, parts.netloc, conn)
+            return response.status, \
+                {key.lower(): value for key, value in response.getheaders()}, \
+                body
+
+
+class ResponseCache:
+    """On-disk cache of fetched files with their validators.
+
+    Arguments
+    ---------
+    folder
+        Folder of cached files. It is created, if it does not exist.
+
+    Notes
+    -----
+    - Each URL is stored in a body file and a metadata file with its ETag
+      and Last-Modified validators, both named by hash of the URL.
+    - Files are written to temporary files and renamed afterwards, so that
+      concurrent processes never read a partially written file.
+    - Failures of writing are ignored, so that a read-only cache folder
+      just disables caching.
+
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+
+    def paths(self, url: str) -> Tuple[str, str]:
+        """Compose paths of the body and metadata files of a URL."""
+        name = os.path.join(self.folder,
+                            sha256(url.encode('utf-8')).hexdigest())
+        return name + '.body', name + '.json'
+
+    def load(self, url: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """Load cached metadata and body of a URL or None."""
+        body_file, meta_file = self.paths(url)
+        try:
+            with open(meta_file, encoding='utf-8') as file:
+                meta = json.load(file)
+            with open(body_file, 'rb') as file:
+                body = file.read()
+        except (OSError, ValueError):
+            return None
+        if not isinstance(meta, dict) or meta.get('url') != url:
+            return None
+        return meta, body
+
+    def store(self, url: str, meta: Dict[str, str], body: bytes) -> NoReturn:
+        """Store metadata and body of a URL."""
+        body_file, meta_file = self.paths(url)
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            for file_path, data in ((body_file, body),
+                                    (meta_file, json.dumps(
+                                        dict(meta, url=url)).encode('utf-8'))):
+                temp_file = f'{file_path}.{os.getpid()}.tmp'
+                with open(temp_file, 'wb') as file:
+                    file.write(data)
+                os.replace(temp_file, file_path)
+        except OSError:
+            pass
+
+
+def cache_folder() -> str:
+    """Determine folder of the on-disk cache from the environment."""
+    return os.environ.get(Parameter.HTTP_CACHE_ENV.value) \
+        or os.path.join(os.path.expanduser('~'), '.cache', 'oac', 'http')
+
+
+# Pool of connections shared by all file caches of the process
+POOL = ConnectionPool()
+
+
+def fetch(url: str, fetched: Dict[str, bytes] = None) -> bytes:
+    """Fetch content of an OpenAPI file referenced by URL.
+
+    Arguments
+    ---------
+    url
+        URL of an OpenAPI file.
+    fetched
+        Contents already fetched by prefetching, which are taken from there
+        instead of requesting them again.
+
+    Returns
+    -------
+    Content of the file.
+
+    Raises
+    ------
+    FileNotFoundError
+        The file cannot be fetched and it is not cached.
+
+    Notes
+    -----
+    - A cached file is revalidated by a conditional request with
+      If-None-Match and If-Modified-Since headers, so that its content is
+      transferred just if it has changed.
+    - If the server is not reachable, the cached content is used as it is.
+
+    """
+    if fetched and url in fetched:
+        return fetched.pop(url)
+    cache = ResponseCache(cache_folder())
+    cached = cache.load(url)
+    headers = {'Accept-Encoding': 'identity', 'User-Agent': 'oac'}
+    if cached:
+        meta, _ = cached
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last-modified'):
+            headers['If-Modified-Since'] = meta['last-modified']
+    target = url
+    try:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, response_headers, body = POOL.request(target, headers)
+            if status not in REDIRECTS or 'location' not in response_headers:
+                break
+            target = urljoin(target, response_headers['location'])
+    except (OSError, http.client.HTTPException) as err:
+        if cached:
+            return cached[1]
+        errmsg = f'Referenced OpenAPI file "{url}" cannot be fetched: {err}'
+        raise FileNotFoundError(errmsg) from None
+    if status == 304 and cached:
+        return cached[1]
+    if status != 200:
+        errmsg = \
+            f'Referenced OpenAPI file "{url}" cannot be fetched: HTTP {status}'
+        raise FileNotFoundError(errmsg)
+    cache.store(url, {key: response_headers[key]
+                      for key in ('etag', 'last-modified')
+                      if key in response_headers}, body)
+    return body
+
+
+def prefetch(urls: Iterable[str], fetched: Dict[str, bytes]) -> NoReturn:
+    """Fetch contents of several URLs concurrently.
+
+    Arguments
+    ---------
+    urls
+        URLs of OpenAPI files, which are going to be loaded.
+    fetched
+        Contents of fetched URLs to be extended.
+
+    Notes
+    -----
+    - Failures are ignored here, they are reported when the file is
+      actually loaded.
+
+    """
+    urls = [url for url in dict.fromkeys(urls) if url not in fetched]
+    if not urls:
+        return
+
+    def fetch_url(url: str) -> Optional[bytes]:
+        try:
+            return fetch(url)
+        except FileNotFoundError:
+            return None
+
+    workers = min(len(urls), Parameter.HTTP_WORKERS.value)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for url, body in zip(urls, executor.map(fetch_url, urls)):
+            if body is not None:
+                fetched[url] = body
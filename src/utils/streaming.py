@@ -0,0 +1,463 @@
+# -*- coding: utf-8 -*-
+"""Module for converting OpenAPI content between YAML and JSON as streams."""
+__version__ = '0.1.0'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import re
+from enum import Enum
+from json import JSONDecodeError
+from json.decoder import scanstring
+from json.encoder import encode_basestring
+from typing import Any, Iterator, NoReturn, TextIO, Tuple
+
+# Third party modules
+import yaml
+from yaml.composer import ComposerError
+
+# Internal modules
+from src.config import Format
+from src.utils.output import NoAliasDumper
+
+# Number of characters read from an input stream at once
+CHUNK_SIZE = 1 << 16
+# Tags of collections written to YAML
+MAP_TAG = 'tag:yaml.org,2002:map'
+SEQ_TAG = 'tag:yaml.org,2002:seq'
+# Tag resolved for YAML merge keys
+MERGE_TAG = 'tag:yaml.org,2002:merge'
+
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+NUMBER = re.compile(r'(-?(?:0|[1-9]\d*))(\.\d+)?([eE][-+]?\d+)?')
+LITERALS = {'true': True, 'false': False, 'null': None,
+            'NaN': float('nan'), 'Infinity': float('inf'),
+            '-Infinity': float('-inf')}
+
+
+class Node(Enum):
+    """Enumeration of structural events of a streamed content.
+
+    Notes
+    -----
+    - Scalar values are streamed as they are between these events, while
+      keys and values of a mapping alternate.
+
+    """
+    MAP = 'map'
+    SEQ = 'seq'
+    END = 'end'
+
+
+def read_events(stream: TextIO, informat: Format) -> Iterator[Any]:
+    """Stream events of YAML or JSON content."""
+    if informat is Format.YAML:
+        return yaml_events(stream)
+    return json_events(stream)
+
+
+def write_events(events: Iterator[Any], stream: TextIO,
+                 outformat: Format, minify: bool = False) -> NoReturn:
+    """Write events of a content as YAML or JSON."""
+    if outformat is Format.YAML:
+        write_yaml(events, stream)
+    else:
+        write_json(events, stream, minify)
+
+
+def json_tokens(stream: TextIO) -> Iterator[Tuple[str, Any, int]]:
+    """Split JSON text of a stream to tokens.
+
+    Arguments
+    ---------
+    stream
+        Text stream with JSON content.
+
+    Returns
+    -------
+    Iterator of tokens with their kind, value, and offset in the text.
+    Kind is a delimiter character, 'string', or 'value' for numbers and
+    literals.
+
+    Raises
+    ------
+    ValueError
+        Invalid token.
+
+    Notes
+    -----
+    - The text is read in chunks and consumed chunks are discarded, so that
+      just a token crossing the end of a chunk is kept in memory.
+    - Strings and numbers are decoded in the same way as by the json module.
+
+    """
+    buffer = ''
+    pos = 0
+    base = 0
+    eof = False
+
+    def read() -> bool:
+        nonlocal buffer, pos, base, eof
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        base += pos
+        pos = 0
+        return True
+
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        # Keep the longest literal within the buffer
+        if len(buffer) - pos < 16 and not eof:
+            read()
+            continue
+        if pos >= len(buffer):
+            return
+        char = buffer[pos]
+        if char in '{}[]:,':
+            yield char, None, base + pos
+            pos += 1
+        elif char == '"':
+            while True:
+                try:
+                    value, end = scanstring(buffer, pos + 1, True)
+                    break
+                except JSONDecodeError as err:
+                    if eof or not read():
+                        problem = err.msg.replace(' starting at', '')
+                        errmsg = f'{problem} at offset {base + err.pos}' \
+                            f' of JSON content!'
+                        raise ValueError(errmsg) from None
+            yield 'string', value, base + pos
+            pos = end
+        else:
+            match = NUMBER.match(buffer, pos)
+            while match and match.end() == len(buffer) and not eof:
+                read()
+                match = NUMBER.match(buffer, pos)
+            if match:
+                integer, fraction, exponent = match.groups()
+                if fraction or exponent:
+                    value = float(integer + (fraction or '')
+                                  + (exponent or ''))
+                else:
+                    value = int(integer)
+                yield 'value', value, base + pos
+                pos = match.end()
+                continue
+            literal = next((literal for literal in LITERALS
+                            if buffer.startswith(literal, pos)), None)
+            if literal is None:
+                errmsg = \
+                    f'Expecting value at offset {base + pos} of JSON content!'
+                raise ValueError(errmsg)
+            yield 'value', LITERALS[literal], base + pos
+            pos += len(literal)
+
+
+def json_events(stream: TextIO) -> Iterator[Any]:
+    """Stream events of JSON content.
+
+    Arguments
+    ---------
+    stream
+        Text stream with JSON content.
+
+    Returns
+    -------
+    Iterator of structural events and scalar values.
+
+    Raises
+    ------
+    ValueError
+        JSON content is not valid.
+
+    """
+    stack = []
+    expected = 'value'
+    for kind, value, offset in json_tokens(stream):
+        if expected == 'end':
+            errmsg = f'Extra data at offset {offset} of JSON content!'
+            raise ValueError(errmsg)
+        closing = None
+        if expected == 'colon':
+            if kind != ':':
+                errmsg = f'Expecting ":" at offset {offset} of JSON content!'
+                raise ValueError(errmsg)
+            expected = 'value'
+            continue
+        if expected == 'separator':
+            if kind == ',':
+                expected = 'key' if stack[-1] == '{' else 'value'
+                continue
+            closing = '}' if stack[-1] == '{' else ']'
+            if kind != closing:
+                errmsg = f'Expecting "," or "{closing}" at offset {offset}' \
+                    f' of JSON content!'
+                raise ValueError(errmsg)
+        elif kind == '}' and expected == 'first key' \
+                or kind == ']' and expected == 'first value':
+            closing = kind
+        if closing:
+            stack.pop()
+            yield Node.END
+            expected = 'separator' if stack else 'end'
+        elif expected in ('key', 'first key'):
+            if kind != 'string':
+                errmsg = f'Expecting property name at offset {offset}' \
+                    f' of JSON content!'
+                raise ValueError(errmsg)
+            yield value
+            expected = 'colon'
+        elif kind in ('{', '['):
+            stack.append(kind)
+            yield Node.MAP if kind == '{' else Node.SEQ
+            expected = 'first key' if kind == '{' else 'first value'
+        elif kind in ('string', 'value'):
+            yield value
+            expected = 'separator' if stack else 'end'
+        else:
+            errmsg = f'Expecting value at offset {offset} of JSON content!'
+            raise ValueError(errmsg)
+    if expected != 'end' and (stack or expected != 'value'):
+        raise ValueError('Unexpected end of JSON content!')
+
+
+def yaml_events(stream: TextIO) -> Iterator[Any]:
+    """Stream events of YAML content.
+
+    Arguments
+    ---------
+    stream
+        Text stream with a single YAML document.
+
+    Returns
+    -------
+    Iterator of structural events and scalar values.
+
+    Raises
+    ------
+    ValueError
+        YAML content contains merge keys or tagged collections.
+    yaml.YAMLError
+        YAML content is not valid.
+
+    Notes
+    -----
+    - Scalars are resolved and constructed in the same way as by the safe
+      loader of the yaml package.
+    - Events of anchored nodes are recorded and repeated at their aliases,
+      so that just anchored content is kept in memory.
+    - Merge keys cannot be streamed, since explicit keys of a mapping
+      following them would override the merged ones.
+
+    """
+    loader = yaml.SafeLoader(stream)
+    anchors = {}
+    # Recorded events of anchored collections with their depth
+    recording = []
+    depth = 0
+    documents = 0
+    try:
+        while loader.check_event():
+            event = loader.get_event()
+            if isinstance(event, yaml.DocumentStartEvent):
+                documents += 1
+                if documents > 1:
+                    raise ComposerError(
+                        'expected a single document in the stream', None,
+                        'but found another document', event.start_mark)
+                continue
+            if isinstance(event, yaml.AliasEvent):
+                if event.anchor not in anchors:
+                    raise ComposerError(
+                        None, None, f'found undefined alias {event.anchor!r}',
+                        event.start_mark)
+                items = anchors[event.anchor]
+            elif isinstance(event, yaml.ScalarEvent):
+                tag = event.tag
+                if tag is None or tag == '!':
+                    tag = loader.resolve(yaml.ScalarNode, event.value,
+                                         event.implicit)
+                if tag == MERGE_TAG:
+                    errmsg = 'Merge keys of YAML content cannot be streamed!'
+                    raise ValueError(errmsg)
+                node = yaml.ScalarNode(tag, event.value, event.start_mark,
+                                       event.end_mark, event.style)
+                constructor = loader.yaml_constructors.get(
+                    tag, loader.yaml_constructors[None])
+                items = [constructor(loader, node)]
+                if event.anchor:
+                    anchors[event.anchor] = items
+            elif isinstance(event, yaml.CollectionStartEvent):
+                if event.tag not in (None, '!', MAP_TAG, SEQ_TAG):
+                    errmsg = f'Tagged collections of YAML content cannot' \
+                        f' be streamed: {event.tag}!'
+                    raise ValueError(errmsg)
+                items = [Node.MAP if isinstance(event, yaml.MappingStartEvent)
+                         else Node.SEQ]
+                depth += 1
+                if event.anchor:
+                    recording.append((event.anchor, [], depth))
+            elif isinstance(event, yaml.CollectionEndEvent):
+                items = [Node.END]
+            else:
+                continue
+            for _, events, _ in recording:
+                events.extend(items)
+            yield from items
+            if isinstance(event, yaml.CollectionEndEvent):
+                if recording and recording[-1][2] == depth:
+                    anchor, events, _ = recording.pop()
+                    anchors[anchor] = events
+                depth -= 1
+    finally:
+        loader.dispose()
+
+
+def json_scalar(value: Any) -> str:
+    """Serialize scalar value to JSON in the same way as the json module."""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None:
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, int):
+        return int.__repr__(value)
+    if isinstance(value, float):
+        if value != value:
+            return 'NaN'
+        if value in (float('inf'), float('-inf')):
+            return 'Infinity' if value > 0 else '-Infinity'
+        return float.__repr__(value)
+    raise TypeError(
+        f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def json_key(value: Any) -> str:
+    """Serialize mapping key to JSON in the same way as the json module."""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if value is None or isinstance(value, (int, float)):
+        return encode_basestring(json_scalar(value))
+    raise TypeError(f'keys must be str, int, float, bool or None, '
+                    f'not {type(value).__name__}')
+
+
+def write_json(events: Iterator[Any], stream: TextIO,
+               minify: bool = False) -> NoReturn:
+    """Write events of a content to a stream as JSON.
+
+    Arguments
+    ---------
+    events
+        Iterator of structural events and scalar values.
+    stream
+        Output text stream.
+    minify
+        Flag about compact JSON output without indentation and whitespace.
+
+    Notes
+    -----
+    - The output is the same as the one of the json module with indentation
+      by 2 spaces or compact separators.
+
+    """
+    key_separator = ':' if minify else ': '
+    # Collections with flags about mapping and count of written items
+    stack = []
+    write = stream.write
+    for event in events:
+        if stack:
+            frame = stack[-1]
+            if event is Node.END:
+                stack.pop()
+                if frame[1] and not minify:
+                    write('\n' + '  ' * len(stack))
+                write('}' if frame[0] else ']')
+                if stack:
+                    stack[-1][1] += 1
+                continue
+            # Key or item position
+            if not frame[0] or frame[2]:
+                write(',' if frame[1] else '')
+                if not minify:
+                    write('\n' + '  ' * len(stack))
+            if frame[0]:
+                frame[2] = not frame[2]
+                if not frame[2]:
+                    write(json_key(event) + key_separator)
+                    continue
+        if event is Node.MAP:
+            write('{')
+            # Flag about expected key, inverted before each key and value
+            stack.append([True, 0, True])
+        elif event is Node.SEQ:
+            write('[')
+            stack.append([False, 0, False])
+        else:
+            write(json_scalar(event))
+            if stack:
+                stack[-1][1] += 1
+    write('\n')
+
+
+def write_yaml(events: Iterator[Any], stream: TextIO) -> NoReturn:
+    """Write events of a content to a stream as YAML.
+
+    Arguments
+    ---------
+    events
+        Iterator of structural events and scalar values.
+    stream
+        Output text stream.
+
+    Notes
+    -----
+    - Scalars are represented and events are emitted in the same way as by
+      the dumper used for YAML output of the output module, so that
+      the output is the same.
+
+    """
+    dumper = NoAliasDumper(stream, default_flow_style=False, sort_keys=False,
+                           allow_unicode=True)
+    ends = []
+    try:
+        dumper.open()
+        dumper.emit(yaml.DocumentStartEvent(
+            explicit=dumper.use_explicit_start, version=dumper.use_version,
+            tags=dumper.use_tags))
+        for event in events:
+            if event is Node.MAP:
+                dumper.emit(yaml.MappingStartEvent(None, MAP_TAG, True,
+                                                   flow_style=False))
+                ends.append(yaml.MappingEndEvent)
+            elif event is Node.SEQ:
+                dumper.emit(yaml.SequenceStartEvent(None, SEQ_TAG, True,
+                                                    flow_style=False))
+                ends.append(yaml.SequenceEndEvent)
+            elif event is Node.END:
+                dumper.emit(ends.pop()())
+            else:
+                node = dumper.represent_data(event)
+                implicit = (
+                    node.tag == dumper.resolve(yaml.ScalarNode, node.value,
+                                               (True, False)),
+                    node.tag == dumper.resolve(yaml.ScalarNode, node.value,
+                                               (False, True)))
+                dumper.emit(yaml.ScalarEvent(None, node.tag, implicit,
+                                             node.value, style=node.style))
+        dumper.emit(yaml.DocumentEndEvent(explicit=dumper.use_explicit_end))
+        dumper.close()
+    finally:
+        dumper.dispose()
@@ -0,0 +1,656 @@
+# -*- coding: utf-8 -*-
+"""Module for structural validation of OpenAPI 3.0 documents."""
+__version__ = '0.1.1'
+__status__ = 'Beta'
+__author__ = 'Libor Gabaj'
+__copyright__ = 'Copyright 2020, ' + __author__
+__credits__ = [__author__]
+__license__ = 'MIT'
+__maintainer__ = __author__
+__email__ = 'libor.gabaj@gmail.com'
+
+# Standard library modules
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+# Third party modules
+
+# Internal modules
+import src.config as cfg
+import src.utils.reference as ref
+import src.utils.filesystem as fs
+
+# Type of any value
+ANY = object
+NUMBER = (int, float)
+
+# Rules of OpenAPI objects with fixed fields and required ones. A field is
+# - a Python type or a tuple of them for a scalar value,
+# - a frozenset of allowed values,
+# - a name of an object type,
+# - a list with a name of an object type for a list of objects,
+# - a dictionary with a name of an object type for a map of objects,
+# - a tuple of a Python type and a name of an object type for either value.
+# Objects with a star field are maps of objects with patterned keys.
+RULES = {
+    'OpenAPI': {
+        'required': ['openapi', 'info', 'paths'],
+        'fields': {
+            'openapi': str,
+            'info': 'Info',
+            'servers': ['Server'],
+            'paths': 'Paths',
+            'components': 'Components',
+            'security': ['SecurityRequirement'],
+            'tags': ['Tag'],
+            'externalDocs': 'ExternalDocs',
+        },
+    },
+    'Info': {
+        'required': ['title', 'version'],
+        'fields': {
+            'title': str,
+            'description': str,
+            'termsOfService': str,
+            'contact': 'Contact',
+            'license': 'License',
+            'version': str,
+        },
+    },
+    'Contact': {
+        'fields': {'name': str, 'url': str, 'email': str},
+    },
+    'License': {
+        'required': ['name'],
+        'fields': {'name': str, 'url': str},
+    },
+    'Server': {
+        'required': ['url'],
+        'fields': {
+            'url': str,
+            'description': str,
+            'variables': {'*': 'ServerVariable'},
+        },
+    },
+    'ServerVariable': {
+        'required': ['default'],
+        'fields': {'enum': [str], 'default': str, 'description': str},
+    },
+    'Components': {
+        'fields': {
+            'schemas': {'*': 'Schema'},
+            'responses': {'*': 'Response'},
+            'parameters': {'*': 'Parameter'},
+            'examples': {'*': 'Example'},
+            'requestBodies': {'*': 'RequestBody'},
+            'headers': {'*': 'Header'},
+            'securitySchemes': {'*': 'SecurityScheme'},
+            'links': {'*': 'Link'},
+            'callbacks': {'*': 'Callback'},
+        },
+    },
+    'Paths': {
+        'fields': {'*': 'PathItem'},
+        'pattern': r'^/',
+    },
+    'PathItem': {
+        'fields': {
+            'summary': str,
+            'description': str,
+            'get': 'Operation',
+            'put': 'Operation',
+            'post': 'Operation',
+            'delete': 'Operation',
+            'options': 'Operation',
+            'head': 'Operation',
+            'patch': 'Operation',
+            'trace': 'Operation',
+            'servers': ['Server'],
+            'parameters': ['Parameter'],
+        },
+    },
+    'Operation': {
+        'required': ['responses'],
+        'fields': {
+            'tags': [str],
+            'summary': str,
+            'description': str,
+            'externalDocs': 'ExternalDocs',
+            'operationId': str,
+            'parameters': ['Parameter'],
+            'requestBody': 'RequestBody',
+            'responses': 'Responses',
+            'callbacks': {'*': 'Callback'},
+            'deprecated': bool,
+            'security': ['SecurityRequirement'],
+            'servers': ['Server'],
+        },
+    },
+    'ExternalDocs': {
+        'required': ['url'],
+        'fields': {'description': str, 'url': str},
+    },
+    'Parameter': {
+        'required': ['name', 'in'],
+        'fields': {
+            'name': str,
+            'in': frozenset(['query', 'header', 'path', 'cookie']),
+            'description': str,
+            'required': bool,
+            'deprecated': bool,
+            'allowEmptyValue': bool,
+            'style': str,
+            'explode': bool,
+            'allowReserved': bool,
+            'schema': 'Schema',
+            'example': ANY,
+            'examples': {'*': 'Example'},
+            'content': {'*': 'MediaType'},
+        },
+    },
+    'RequestBody': {
+        'required': ['content'],
+        'fields': {
+            'description': str,
+            'content': {'*': 'MediaType'},
+            'required': bool,
+        },
+    },
+    'MediaType': {
+        'fields': {
+            'schema': 'Schema',
+            'example': ANY,
+            'examples': {'*': 'Example'},
+            'encoding': {'*': 'Encoding'},
+        },
+    },
+    'Encoding': {
+        'fields': {
+            'contentType': str,
+            'headers': {'*': 'Header'},
+            'style': str,
+            'explode': bool,
+            'allowReserved': bool,
+        },
+    },
+    'Responses': {
+        'fields': {'*': 'Response'},
+        'pattern': r'^(default|[1-5]([0-9]{2}|XX))$',
+    },
+    'Response': {
+        'required': ['description'],
+        'fields': {
+            'description': str,
+            'headers': {'*': 'Header'},
+            'content': {'*': 'MediaType'},
+            'links': {'*': 'Link'},
+        },
+    },
+    'Callback': {
+        'fields': {'*': 'PathItem'},
+    },
+    'Example': {
+        'fields': {
+            'summary': str,
+            'description': str,
+            'value': ANY,
+            'externalValue': str,
+        },
+    },
+    'Link': {
+        'fields': {
+            'operationRef': str,
+            'operationId': str,
+            'parameters': {'*': ANY},
+            'requestBody': ANY,
+            'description': str,
+            'server': 'Server',
+        },
+    },
+    'Header': {
+        'fields': {
+            'description': str,
+            'required': bool,
+            'deprecated': bool,
+            'allowEmptyValue': bool,
+            'style': str,
+            'explode': bool,
+            'allowReserved': bool,
+            'schema': 'Schema',
+            'example': ANY,
+            'examples': {'*': 'Example'},
+            'content': {'*': 'MediaType'},
+        },
+    },
+    'Tag': {
+        'required': ['name'],
+        'fields': {
+            'name': str,
+            'description': str,
+            'externalDocs': 'ExternalDocs',
+        },
+    },
+    'Schema': {
+        'fields': {
+            'title': str,
+            'multipleOf': NUMBER,
+            'maximum': NUMBER,
+            'exclusiveMaximum': bool,
+            'minimum': NUMBER,
+            'exclusiveMinimum': bool,
+            'maxLength': int,
+            'minLength': int,
+            'pattern': str,
+            'maxItems': int,
+            'minItems': int,
+            'uniqueItems': bool,
+            'maxProperties': int,
+            'minProperties': int,
+            'required': [str],
+            'enum': [ANY],
+            'type': frozenset(['array', 'boolean', 'integer', 'number',
+                               'object', 'string']),
+            'allOf': ['Schema'],
+            'oneOf': ['Schema'],
+            'anyOf': ['Schema'],
+            'not': 'Schema',
+            'items': 'Schema',
+            'properties': {'*': 'Schema'},
+            'additionalProperties': (bool, 'Schema'),
+            'description': str,
+            'format': str,
+            'default': ANY,
+            'nullable': bool,
+            'discriminator': 'Discriminator',
+            'readOnly': bool,
+            'writeOnly': bool,
+            'xml': 'XML',
+            'externalDocs': 'ExternalDocs',
+            'example': ANY,
+            'deprecated': bool,
+        },
+    },
+    'Discriminator': {
+        'required': ['propertyName'],
+        'fields': {'propertyName': str, 'mapping': {'*': str}},
+    },
+    'XML': {
+        'fields': {
+            'name': str,
+            'namespace': str,
+            'prefix': str,
+            'attribute': bool,
+            'wrapped': bool,
+        },
+    },
+    'SecurityScheme': {
+        'required': ['type'],
+        'fields': {
+            'type': frozenset(['apiKey', 'http', 'oauth2', 'openIdConnect']),
+            'description': str,
+            'name': str,
+            'in': frozenset(['query', 'header', 'cookie']),
+            'scheme': str,
+            'bearerFormat': str,
+            'flows': 'OAuthFlows',
+            'openIdConnectUrl': str,
+        },
+    },
+    'OAuthFlows': {
+        'fields': {
+            'implicit': 'OAuthFlow',
+            'password': 'OAuthFlow',
+            'clientCredentials': 'OAuthFlow',
+            'authorizationCode': 'OAuthFlow',
+        },
+    },
+    'OAuthFlow': {
+        'required': ['scopes'],
+        'fields': {
+            'authorizationUrl': str,
+            'tokenUrl': str,
+            'refreshUrl': str,
+            'scopes': {'*': str},
+        },
+    },
+    'SecurityRequirement': {
+        'fields': {'*': [str]},
+    },
+}
+
+# Object types, which might be replaced by a reference object
+REFERABLE = frozenset(['PathItem', 'Parameter', 'RequestBody', 'Response',
+                       'Callback', 'Example', 'Link', 'Header', 'Schema',
+                       'SecurityScheme'])
+
+# Pattern of component names
+COMPONENT_NAME = re.compile(r'^[a-zA-Z0-9.\-_]+$')
+
+
+class Field(NamedTuple):
+    """Compiled rule of a field"""
+
+    # Kind of a field, i.e., scalar, choice, object, list, map, or union
+    kind: str
+    # Python types for scalars and unions, allowed values for choices
+    check: Any = None
+    # Object type for objects, unions, and items of lists and maps
+    target: Optional[str] = None
+
+
+class Rule(NamedTuple):
+    """Compiled rule of an object type"""
+
+    # Required fields
+    required: Tuple[str, ...]
+    # Fixed fields indexed by their names
+    fields: Dict[str, Field]
+    # Field for patterned keys of map objects
+    items: Optional[Field]
+    # Compiled pattern of keys of map objects
+    pattern: Optional[Any]
+
+
+def compile_field(spec: Any) -> Field:
+    """Compile a field specification from the rule table.
+
+    Arguments
+    ---------
+    spec
+        Field specification in the form described at the rule table.
+
+    Returns
+    -------
+    Compiled field rule.
+
+    """
+    if isinstance(spec, frozenset):
+        return Field('choice', spec)
+    if isinstance(spec, str):
+        return Field('object', target=spec)
+    if isinstance(spec, list):
+        return Field('list', target=compile_field(spec[0]))
+    if isinstance(spec, dict):
+        return Field('map', target=compile_field(spec['*']))
+    if isinstance(spec, tuple) and isinstance(spec[-1], str):
+        return Field('union', spec[0], spec[-1])
+    return Field('scalar', spec)
+
+
+def compile_rules(rules: Dict) -> Dict[str, Rule]:
+    """Compile the rule table of object types.
+
+    Arguments
+    ---------
+    rules
+        Rule table of object types.
+
+    Returns
+    -------
+    Compiled rules indexed by object types.
+
+    """
+    compiled = {}
+    for obj_type, rule in rules.items():
+        fields = {name: compile_field(spec)
+                  for name, spec in rule.get('fields', {}).items()
+                  if name != '*'}
+        items = rule.get('fields', {}).get('*')
+        pattern = rule.get('pattern')
+        compiled[obj_type] = Rule(
+            required=tuple(rule.get('required', [])),
+            fields=fields,
+            items=compile_field(items) if items is not None else None,
+            pattern=re.compile(pattern) if pattern else None,
+            )
+    return compiled
+
+
+# Rules compiled once at import
+COMPILED = compile_rules(RULES)
+
+
+def validate(record: cfg.OpenAPI) -> List[Tuple[str, str]]:
+    """Validate structure of an OpenAPI document and its references.
+
+    Arguments
+    ---------
+    record
+        OpenAPI file record to be validated.
+
+    Returns
+    -------
+    List of errors with their location and message.
+
+    Notes
+    -----
+    - The document is traversed just once with an explicit stack, while
+      each object is checked against the compiled rule of its type.
+    - Each reference is resolved through the file cache, so that referenced
+      files are loaded just once. Each object is validated just once, even if
+      it is reached directly and by references, repeatedly or circularly.
+      Resolved targets are validated against the type of the referencing
+      object, if they are reached by a reference at first.
+    - Specification extensions with the prefix "x-" are not validated.
+
+    """
+    errors = []
+    visited = set()
+    stack = [(record.oas, Field('object', target='OpenAPI'),
+              fs.get_relpath(record.oasfile, record.oasfile) + '#',
+              record.oasfile)]
+    while stack:
+        node, field, location, source_file = stack.pop()
+        if field.kind == 'scalar':
+            if field.check is not ANY and not is_type(node, field.check):
+                errors.append((location, f'Invalid type {type_name(node)}'))
+        elif field.kind == 'choice':
+            if not isinstance(node, str) or node not in field.check:
+                errors.append((location, f'Invalid value "{node}"'))
+        elif field.kind == 'list':
+            if not isinstance(node, list):
+                errors.append((location, 'List expected'))
+                continue
+            for idx, item in enumerate(node):
+                stack.append((item, field.target, f'{location}/{idx}',
+                              source_file))
+        elif field.kind == 'map':
+            if not isinstance(node, dict):
+                errors.append((location, 'Map expected'))
+                continue
+            for key, item in node.items():
+                stack.append((item, field.target,
+                              f'{location}/{ref.escape_pointer(str(key))}',
+                              source_file))
+        elif field.kind == 'union' and is_type(node, field.check):
+            continue
+        else:
+            obj_type = field.target
+            # Objects reached directly and by references are checked once
+            pointer = source_file + location[location.index('#'):]
+            if pointer in visited:
+                continue
+            visited.add(pointer)
+            if not isinstance(node, dict):
+                errors.append((location, f'{obj_type} object expected'))
+                continue
+            if '$ref' in node and obj_type in REFERABLE:
+                target = check_reference(node['$ref'], source_file,
+                                         errors, location)
+                if target and target not in visited:
+                    target_file, content = resolve_target(target)
+                    stack.append((content, Field('object', target=obj_type),
+                                  fs.get_relpath(target_file, record.oasfile)
+                                  + target[len(target_file):],
+                                  target_file))
+                continue
+            stack.extend(check_object(node, COMPILED[obj_type], location,
+                                      source_file, errors))
+    errors.sort()
+    return errors
+
+
+def check_object(node: Dict, rule: Rule, location: str, source_file: str,
+                 errors: List[Tuple[str, str]]) -> List[Tuple]:
+    """Check fields of an object against its rule.
+
+    Arguments
+    ---------
+    node
+        Object to be checked.
+    rule
+        Compiled rule of the object type.
+    location
+        Location of the object.
+    source_file
+        OpenAPI file with the object.
+    errors
+        List of errors to be extended.
+
+    Returns
+    -------
+    List of child values to be validated with their fields, locations and
+    source files.
+
+    """
+    children = []
+    for name in rule.required:
+        if name not in node:
+            errors.append((location, f'Missing required field "{name}"'))
+    for key, value in node.items():
+        key = str(key)
+        child_location = f'{location}/{ref.escape_pointer(key)}'
+        if key.startswith('x-'):
+            continue
+        field = rule.fields.get(key)
+        if field is None and rule.items is not None:
+            if rule.pattern and not rule.pattern.match(key):
+                errors.append((child_location, f'Invalid key "{key}"'))
+                continue
+            field = rule.items
+        if field is None:
+            errors.append((child_location, f'Unknown field "{key}"'))
+            continue
+        if field.kind == 'map' and location.endswith('/components'):
+            for name in value if isinstance(value, dict) else []:
+                if not COMPONENT_NAME.match(str(name)):
+                    errors.append((f'{child_location}/{name}',
+                                   f'Invalid component name "{name}"'))
+        children.append((value, field, child_location, source_file))
+    return children
+
+
+def check_reference(reference: Any, source_file: str,
+                    errors: List[Tuple[str, str]],
+                    location: str) -> Optional[str]:
+    """Check that a reference resolves through the file cache.
+
+    Arguments
+    ---------
+    reference
+        Reference value.
+    source_file
+        OpenAPI file with the reference.
+    errors
+        List of errors to be extended.
+    location
+        Location of the reference object.
+
+    Returns
+    -------
+    Absolute reference to the target or None for unresolvable one.
+
+    """
+    if not isinstance(reference, str):
+        errors.append((f'{location}/$ref', 'Invalid reference'))
+        return None
+    try:
+        target_file, fragments = parse_reference(reference)
+    except ValueError:
+        errors.append((f'{location}/$ref',
+                       f'Invalid reference "{reference}"'))
+        return None
+    target_file = fs.resolve_filepath(target_file or source_file,
+                                      source_file)
+    try:
+        record = cfg.CACHE.get_record_by_file(target_file) \
+            or ref.load_record(target_file)
+    except (ValueError, FileNotFoundError, EOFError, SyntaxError) as err:
+        errors.append((f'{location}/$ref', str(err)))
+        return None
+    target = record.oas
+    for fragment in fragments:
+        if not isinstance(target, dict) \
+            or ref.json_pointer(fragment) not in target:
+            errors.append((f'{location}/$ref',
+                           f'Unresolvable reference "{reference}"'))
+            return None
+        target = target[ref.json_pointer(fragment)]
+    if not fragments:
+        return target_file + '#'
+    return ref.concat(fragments, target_file)
+
+
+def parse_reference(reference: str) -> Tuple[str, List[str]]:
+    """Extract referenced file and target fragments of a reference.
+
+    Arguments
+    ---------
+    reference
+        Reference value.
+
+    Returns
+    -------
+    Tuple with referenced file (can be empty) and list of target fragments,
+    which is empty for a reference to the whole document.
+
+    Raises
+    ------
+    ValueError
+        Reference has not expected form.
+
+    Notes
+    -----
+    'schemas.yaml' => 'schemas.yaml', []
+    'schemas.yaml#/Pet' => 'schemas.yaml', ['Pet']
+
+    """
+    target_file, delimiter, fragment = reference.partition('#')
+    if not fragment:
+        return target_file, []
+    if not delimiter + fragment[:1] == cfg.Parameter.REF_DELIM.value:
+        raise ValueError(f'Invalid reference "{reference}"')
+    return ref.parse(reference)
+
+
+def resolve_target(target: str) -> Tuple[str, Any]:
+    """Retrieve content of an already checked reference target.
+
+    Arguments
+    ---------
+    target
+        Absolute reference to the target.
+
+    Returns
+    -------
+    Tuple with the target file and the target content.
+
+    """
+    target_file, fragments = parse_reference(target)
+    content = cfg.CACHE.get_record_by_file(target_file).oas
+    for fragment in fragments:
+        content = content[ref.json_pointer(fragment)]
+    return target_file, content
+
+
+def is_type(value: Any, types: Any) -> bool:
+    """Check type of a scalar value, booleans are not numbers."""
+    if isinstance(value, bool) and not (
+            types is bool or isinstance(types, tuple) and bool in types):
+        return False
+    return isinstance(value, types)
+
+
+def type_name(value: Any) -> str:
+    """Name of the type of a value."""
+    return type(value).__name__
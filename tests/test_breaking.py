@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Tests of the breaking command."""
+
+# Standard library modules
+import os
+import tempfile
+import unittest
+
+# Internal modules
+from src.commands.breaking import check_pair
+
+OLD = '''openapi: 3.0.3
+info: {title: t, version: '1'}
+paths:
+  /pets:
+    post:
+      requestBody:
+        $ref: '#/components/requestBodies/PetIn'
+      responses:
+        '200':
+          description: ok
+          content:
+            application/json:
+              schema: {$ref: '#/components/schemas/Pet'}
+components:
+  requestBodies:
+    PetIn:
+      content:
+        application/json:
+          schema: {$ref: '#/components/schemas/Input'}
+  schemas:
+    Input:
+      type: object
+      properties:
+        name: {type: string}
+        tag: {type: string}
+        kind: {type: string, enum: [a, b]}
+    Pet:
+      type: object
+      properties:
+        id: {type: integer}
+        name: {type: string}
+        owner: {$ref: '#/components/schemas/Owner'}
+    Owner:
+      type: object
+      properties:
+        nick: {type: string}
+    Unused:
+      type: object
+      properties:
+        x: {type: string}
+'''
+NEW = '''openapi: 3.0.3
+info: {title: t, version: '1'}
+paths:
+  /pets:
+    post:
+      requestBody:
+        $ref: '#/components/requestBodies/PetIn'
+      responses:
+        '200':
+          description: ok
+          content:
+            application/json:
+              schema: {$ref: '#/components/schemas/Pet'}
+components:
+  requestBodies:
+    PetIn:
+      content:
+        application/json:
+          schema: {$ref: '#/components/schemas/Input'}
+  schemas:
+    Input:
+      type: object
+      required: [name]
+      properties:
+        name: {type: string}
+        kind: {type: string, enum: [a]}
+    Pet:
+      type: object
+      required: [id]
+      properties:
+        id: {type: integer}
+        owner: {$ref: '#/components/schemas/Owner'}
+    Owner:
+      type: object
+      required: [nick]
+      properties:
+        other: {type: string}
+    Unused:
+      type: object
+      required: [x]
+      properties: {}
+'''
+
+
+class TestCheckPair(unittest.TestCase):
+    """Breaking changes of schemas by direction of their usage."""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        files = []
+        for name, text in (('old.yaml', OLD), ('new.yaml', NEW)):
+            files.append(os.path.join(self.folder.name, name))
+            with open(files[-1], 'w') as file:
+                file.write(text)
+        self.rows = check_pair(tuple(files))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def reasons(self, name):
+        return [row[2] for row in self.rows if row[1] == name]
+
+    def test_request_schema(self):
+        self.assertEqual(self.reasons('Input'),
+                         ['Required property "name" added',
+                          'kind: Enumeration narrowed'])
+
+    def test_response_schema(self):
+        self.assertEqual(self.reasons('Pet'), ['Property "name" removed'])
+
+    def test_transitive_response_schema(self):
+        self.assertEqual(self.reasons('Owner'), ['Property "nick" removed'])
+
+    def test_unused_schema_skipped(self):
+        self.assertEqual(self.reasons('Unused'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""Tests of the output module."""
+
+# Standard library modules
+import unittest
+from unittest import mock
+
+# Third party modules
+import yaml
+
+# Internal modules
+from src.utils.output import Rows, print_fixed, serialize_yaml, \
+    share_subtrees
+
+
+class TestShareSubtrees(unittest.TestCase):
+    """Sharing of structurally identical subtrees."""
+
+    def test_empty_dict_not_merged(self):
+        content = {'P': {'k': {}, 'm': {'q': 1}},
+                   'Q': {'k': {'q': 1}, 'm': {'q': 1}}}
+        shared = share_subtrees(content)
+        self.assertEqual(shared, content)
+        self.assertIsNot(shared['P'], shared['Q'])
+
+    def test_empty_list_not_merged(self):
+        content = {'P': {'k': [], 'm': [1]}, 'Q': {'k': [1], 'm': [1]}}
+        shared = share_subtrees(content)
+        self.assertEqual(shared, content)
+        self.assertIsNot(shared['P'], shared['Q'])
+
+    def test_identical_subtrees_shared(self):
+        content = {'A': {'k': {}, 'm': [1]}, 'B': {'k': {}, 'm': [1]}}
+        shared = share_subtrees(content)
+        self.assertIs(shared['A'], shared['B'])
+
+    def test_aliases_round_trip(self):
+        content = {'P': {'k': {}, 'm': {'q': 1}},
+                   'Q': {'k': {'q': 1}, 'm': {'q': 1}}}
+        text = serialize_yaml(content, aliases=True)
+        self.assertEqual(yaml.safe_load(text), content)
+
+
+class TestPrintFixed(unittest.TestCase):
+    """Printing rows in fixed width columns."""
+
+    def lines(self, data):
+        with mock.patch('click.echo') as echo:
+            print_fixed(data, ['No', 'Name'])
+        return [call.args[0] for call in echo.call_args_list]
+
+    def test_reiterable_rows_produced_twice(self):
+        records = [(1, 'a'), (22, 'bbb')]
+        produced = []
+        rows = Rows(lambda: produced.append(1) or iter(records))
+        self.assertEqual(self.lines(rows),
+                         ['No  Name', '--  ----', ' 1  a', '22  bbb'])
+        self.assertEqual(len(produced), 2)
+
+    def test_iterator_rows(self):
+        records = [(1, 'a'), (22, 'bbb')]
+        self.assertEqual(self.lines(iter(records)),
+                         ['No  Name', '--  ----', ' 1  a', '22  bbb'])
+
+
+if __name__ == '__main__':
+    unittest.main()
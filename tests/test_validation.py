@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""Tests of the validation module."""
+
+# Standard library modules
+import os
+import tempfile
+import unittest
+
+# Internal modules
+from src.session import Session
+
+MAIN = '''openapi: 3.0.3
+info: {title: t, version: '1'}
+paths:
+  /a:
+    get:
+      responses:
+        '200':
+          description: ok
+          content:
+            application/json:
+              schema:
+                $ref: '#/components/schemas/A'
+  /b:
+    get:
+      responses:
+        '200':
+          description: ok
+          content:
+            application/json:
+              schema:
+                $ref: 'other.yaml#/x#/y'
+  /c:
+    $ref: 'paths.yaml'
+components:
+  schemas:
+    A:
+      type: obj
+'''
+PATHS = '''openapi: 3.0.3
+get:
+  responses:
+    '200':
+      description: ok
+'''
+
+
+class TestValidate(unittest.TestCase):
+    """Validation of references and components."""
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        for name, text in (('main.yaml', MAIN), ('paths.yaml', PATHS)):
+            with open(os.path.join(self.folder.name, name), 'w') as file:
+                file.write(text)
+        self.errors = Session().validate(
+            os.path.join(self.folder.name, 'main.yaml'))
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_component_reported_once(self):
+        self.assertEqual(
+            [error for error in self.errors if error[0].endswith('A/type')],
+            [('./main.yaml#/components/schemas/A/type',
+              'Invalid value "obj"')])
+
+    def test_invalid_reference_reported(self):
+        self.assertIn(('./main.yaml#/paths/~1b/get/responses/200/content/'
+                       'application~1json/schema/$ref',
+                       'Invalid reference "other.yaml#/x#/y"'), self.errors)
+
+    def test_whole_document_reference(self):
+        self.assertEqual(
+            [error for error in self.errors if '~1c' in error[0]
+             or error[0].startswith('./paths.yaml')],
+            [('./paths.yaml#/openapi', 'Unknown field "openapi"')])
+
+
+if __name__ == '__main__':
+    unittest.main()